@@ -1,7 +1,8 @@
 # Import packages and modules | External
+import os
+import math
 import time
 import warnings
-import numpy as np
 import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
@@ -10,14 +11,43 @@ from streamlit_extras.switch_page_button import switch_page
 
 # Import packages and modules | Internal
 from validata_package import config as cfg
-from validata_package.validation_ops import readDataFrameFromCSV, readDataFrameFromExcel, getDataFrameHash, compareDataFrames, readFile, writeFile, getCurrentDateTimeAsString, getCurrentDayDateTimeAsString
-
-# Function to update cell with mismatch values
-def updateMismatchCells(value):
-    if(str(value) == "nan" or str(value) == "Source" or str(value) == "Target"):
-        return value
-    else:
-        return f":red{value}"
+from validata_package.validation_ops import alignCompactColumnTypes, getExcelSheetNames, getCurrentDateTimeAsString
+from validata_package.engine_ops import duplicate_key_policies, readDataFileInMemoryBudget, readDataFilePreview, isStreamingComparison, isPartitionedComparison, isProfileComparison, readDataFileColumns, getUnknownColumnsError, getComparisonError, compareDataFiles, compareDataFilesInPartitions, compareFileProfiles, compareDataSets, getReportValues, getReportSummary, writeComparisonReport, compareWithBaselineSnapshot
+from validata_package.cache_ops import getFileDigest, getCacheKey, getCachedValue, putCachedValue, getOrComputeCachedValue
+from validata_package.normalization_ops import getNormalizationOptions
+from validata_package.memory_ops import estimateFileComparisonMemory, getComparisonBudget, getMemoryBudgetError, estimateComparisonMemory, estimateStreamingComparisonMemory, estimatePartitionedComparisonMemory, getLowMemoryComparisonOptions, getAvailableMemory, reserveMemory
+from validata_package.trace_ops import startTrace, stopTrace, getCurrentTrace, getTraceDataFrame, getTraceJson
+from validata_package.job_ops import submitJob, getJob, cancelJob, getJobProgress, removeJob
+from validata_package.store_ops import getStoredResult, putStoredResult, getStoredResultPath, stored_report_file_name
+from validata_package.catalog_ops import getArtifacts, getArtifactsCount
+from validata_package.snapshot_ops import getBaselineSnapshotId, hasBaselineSnapshot, saveBaselineSnapshot, readBaselineSnapshotMetadata, readBaselineSnapshotPreview, getSnapshotComparisonError
+
+# Hints shown with the comparison errors of each comparison mode
+comparison_error_hints = {
+    "streaming": "Hint: Uncheck the sorted files option to compare unsorted files.",
+    "partitioned": None,
+    "profile": None,
+    "in_memory": "Hint: Match the records sharing a key by their order with the duplicate keys option."
+}
+
+# Function to read the data of an uploaded file with the reader function, shows the read error and returns None when the file cannot be read
+def readUploadedData(read_function, *args) -> pd.DataFrame:
+    try:
+        return read_function(*args)
+    except Exception as error:
+        st.write(error)
+        return None
+
+# Function returns the SHA-256 digest of the uploaded file, computed once per upload and kept in the session state, so that the reruns of the page do not hash the file again
+def getUploadedFileDigest(uploaded_file, data_origin: str) -> str:
+    upload_id, state_key = [uploaded_file.file_id, uploaded_file.size], f"{data_origin}_file_digest"
+    if(st.session_state.get(state_key, {}).get('upload_id') != upload_id):
+        st.session_state[state_key] = {'upload_id': upload_id, 'file_digest': getFileDigest(uploaded_file)}
+    return st.session_state[state_key]['file_digest']
+
+# Function returns the user name of the signed in user, the anonymous user name without authentication
+def getCurrentUserName() -> str:
+    return st.user.get("email") or cfg.anonymous_user_name
 
 # Information tab function
 def showInformationTabContent() -> None:
@@ -41,29 +71,216 @@ Thank you for choosing our Data Validation Tool. Let's ensure your data is accur
 Happy validating! 🚀
 """)
     
+# Function to compare the data and write the comparison report in a background job, returns the report file path and the comparison message; the report is read from the file when it is downloaded
+def runValidationJob(source_data_file, target_data_file, source_data: pd.DataFrame, target_data: pd.DataFrame, comparison_cache_key: str, memory_estimate: int, is_streaming_mode: bool, is_partitioned_mode: bool, is_profile_mode: bool, key_cols_list: list, drop_cols_list: list, compare_cols_list: list, normalization_options: dict, duplicate_key_policy: str, is_row_hash_mode: bool, workers_count: int, report_format: str, baseline_snapshot_id: str, load_trace: list, artifact_metadata: dict) -> dict:
+    # Return the stored report of the same inputs and options, the reports are stored per user to list them in the user's history
+    result_key = getCacheKey("result", comparison_cache_key, source_data_file.name, target_data_file.name, report_format, artifact_metadata['owner'])
+    stored_result = getStoredResult(result_key) if cfg.use_result_store else None
+    if(stored_result is not None):
+        stored_report_fpath, report_summary = stored_result
+        return {'message': report_summary['message'], 'report_fpath': stored_report_fpath, 'total_errors': report_summary['total_errors'], 'is_stored_result': True}
+
+    # Record start time
+    comparision_start_time = time.time()
+
+    # Fetch the comparison result of the same inputs and options from the cache
+    comparison_result = getCachedValue(comparison_cache_key)
+    if(comparison_result is None):
+        # Wait in queue for the memory budget, the job can be cancelled while waiting
+        with reserveMemory(memory_estimate):
+            # Validate data
+            if(is_profile_mode):
+                comparison_result = compareFileProfiles(source_data_file, target_data_file, cfg.stream_chunk_size, drop_cols_list, compare_cols_list, normalization_options)
+            elif(is_streaming_mode):
+                comparison_result = compareDataFiles(source_data_file, target_data_file, key_cols_list, cfg.stream_chunk_size, drop_cols_list, compare_cols_list, normalization_options, duplicate_key_policy)
+            elif(is_partitioned_mode):
+                comparison_result = compareDataFilesInPartitions(source_data_file, target_data_file, key_cols_list, cfg.stream_chunk_size, drop_cols_list, compare_cols_list, normalization_options, duplicate_key_policy, is_row_hash_mode)
+            elif(baseline_snapshot_id is not None and hasBaselineSnapshot(baseline_snapshot_id)):
+                comparison_result = compareWithBaselineSnapshot(baseline_snapshot_id, target_data, key_cols_list, is_row_hash_mode, workers_count, normalization_options, duplicate_key_policy)
+            else:
+                comparison_result = compareDataSets(source_data, target_data, key_cols_list, is_row_hash_mode, workers_count, cfg.merkle_block_size, normalization_options, duplicate_key_policy)
+                if(baseline_snapshot_id is not None):
+                    saveBaselineSnapshot(baseline_snapshot_id, source_data, key_cols_list, normalization_options, {'source_file': source_data_file.name, 'source_digest': artifact_metadata['source_digest']})
+
+        # Cache the comparison result
+        putCachedValue(comparison_cache_key, comparison_result)
+
+    # Record end time
+    comparision_end_time = time.time()
+
+    # Create report file, the stage timings of the loading are recorded by the page before the job
+    report_values = getReportValues(comparison_result, source_data_file.name, target_data_file.name, [] if is_profile_mode else key_cols_list, comparision_end_time - comparision_start_time, report_format, load_trace + getCurrentTrace())
+    report_fpath = writeComparisonReport(report_values, report_format, cfg.artifacts_path)
+    job_result = {'message': comparison_result[-1], 'report_fpath': report_fpath, 'total_errors': report_values['total_errors'], 'is_stored_result': False, 'temp_fpaths': [report_fpath]}
+    if(cfg.use_result_store and putStoredResult(result_key, report_fpath, {**getReportSummary(report_values), 'message': comparison_result[-1], **artifact_metadata})):
+        # The job result refers to the stored report, the report file not stored is kept until the job is evicted
+        os.remove(report_fpath)
+        job_result.update({'report_fpath': os.path.join(getStoredResultPath(result_key), stored_report_file_name), 'temp_fpaths': []})
+
+    # Return results
+    return job_result
+
+# Function to show the status and stage progress of a running validation job, refreshed until the job finishes
+@st.fragment(run_every=cfg.job_poll_interval_in_secs)
+def showValidationJobProgress(job_id: str) -> None:
+    job_progress = getJobProgress(job_id)
+    if(job_progress is None or job_progress['status'] not in ["queued", "running"]):
+        st.rerun()
+
+    # Show the progress of every stage
+    if(job_progress['status'] == "queued"):
+        st.info("The validation is queued, it starts when a worker is free.")
+    else:
+        st.write(f"Comparing data... ({job_progress['elapsed_time_in_secs']} secs)")
+        for stage_progress in job_progress['stages']:
+            st.progress(stage_progress['progress'], text=stage_progress['stage'])
+
+    # Show the running counts and first differences of the chunks or partitions compared so far
+    partial_result = job_progress['partial_result']
+    if(partial_result is not None and partial_result['compared_chunks'] > 0):
+        matched_column, mismatched_column, source_only_column, target_only_column = st.columns(4)
+        matched_column.metric(label="Matched Records", value=f"{partial_result['matched_records']:,}")
+        mismatched_column.metric(label="Mismatched Records", value=f"{partial_result['mismatched_records']:,}")
+        source_only_column.metric(label="Source Only Records", value=f"{partial_result['source_only_records']:,}")
+        target_only_column.metric(label="Target Only Records", value=f"{partial_result['target_only_records']:,}")
+        if(partial_result['difference_sample'] is not None):
+            st.write(f"First {len(partial_result['difference_sample'])} records with differences")
+            st.dataframe(data=partial_result['difference_sample'], use_container_width=True, hide_index=True)
+
+    # Stop the job at its next stage or chunk
+    if(st.button(label="⏹️ Cancel Validation", key=f"cancel_{job_id}")):
+        cancelJob(job_id)
+        st.info("Cancelling the validation...")
+
+# Function to show the progress of a validation job, then its comparison report or error and stage timings
+def showValidationJob(job_id: str, load_trace: list = [], error_hint: str = None) -> None:
+    job = getJob(job_id)
+    if(job['status'] in ["queued", "running"]):
+        showValidationJobProgress(job_id)
+        return
+
+    if(job['status'] == "done"):
+        # Show the row blocks and columns with differences
+        if(job['result']['message'] is not None):
+            st.info(job['result']['message'])
+        if(job['result']['is_stored_result']):
+            st.caption("The stored report of the same files and options is shown.")
+
+        # Show button to download the data comparision report, read from the report file when the button is shown
+        if(not os.path.exists(job['result']['report_fpath'])):
+            st.warning("The comparison report was evicted from the result store, please run the validation again.")
+            st.button(label="🔁 Run Again", key=f"run_again_{job_id}", on_click=lambda: (removeJob(job_id), st.query_params.pop("job", None)))
+            return
+        with open(job['result']['report_fpath'], 'rb') as report_file:
+            if(job['result']['total_errors'] > 0):
+                st.download_button(label="❌ :red[Comparision Failed] | ⬇️ Download Comparision Report", data=report_file, file_name=f"Validata_Comparision_Report_{getCurrentDateTimeAsString()}.html", use_container_width=True)
+            else:
+                st.download_button(label="✅ :green[Comparision Successful] | ⬇️ Download Comparision Report", data=report_file, file_name=f"Validata_Comparision_Report_{getCurrentDateTimeAsString()}.html", use_container_width=True)
+    else:
+        if(job['status'] == "cancelled"):
+            st.warning("The validation was cancelled.")
+        else:
+            st.error(job['error'])
+            if(job['error_type'] == "ValueError" and error_hint is not None):
+                st.info(error_hint)
+
+        # A failed or cancelled job is only submitted again on request
+        st.button(label="🔁 Run Again", key=f"run_again_{job_id}", on_click=lambda: st.query_params.pop("job", None))
+        return
+
+    # Show the stage timings of this run
+    trace = load_trace + job['trace']
+    with st.expander(label="⏱️ Stage Timings"):
+        st.dataframe(data=getTraceDataFrame(trace), use_container_width=True, hide_index=True)
+        st.download_button(label="⬇️ Download Stage Timings (JSON)", data=getTraceJson(trace), file_name=f"Validata_Stage_Timings_{getCurrentDateTimeAsString()}.json", mime="application/json")
+
 # Validator tab function
 def showValidatorTabContent() -> None:
     with st.container(border=True):
         # List of columns to be dropped
         columns_to_be_dropped_str = st.text_input(label="Columns to Drop :green[(optional)]", placeholder="dcol1[,dcol2,....]")
 
+        # List of columns to be compared
+        columns_to_be_compared_str = st.text_input(label="Columns to Compare :green[(optional)]", placeholder="ccol1[,ccol2,....]")
+
         # List of key columns
         key_columns_str = st.text_input(label="Key Columns :green[(optional)]", placeholder="kcol1[,kcol2,....]")
 
+        # Streaming mode for "csv" files sorted by the key columns
+        is_key_sorted = st.checkbox(label="Files are sorted by key columns :green[(optional)]", help="Compare the files in chunks like a merge join, so that files larger than memory can be validated.")
+
+        # Out-of-core comparison of unsorted files larger than memory
+        is_out_of_core = st.checkbox(label="Out-of-core mode :green[(optional)]", value=cfg.use_out_of_core_comparison, help="Partition csv and parquet files by key (or row hash) into temporary files on disk and compare one partition at a time, so that unsorted files larger than memory can be validated.")
+
+        # Column statistics comparison, without matching the records
+        is_profile_only = st.checkbox(label="Compare column statistics only :green[(optional)]", value=cfg.use_column_profile, help="Profile every column of csv and parquet files in one pass (counts, nulls, approximate distinct count, min/max, sum and quantiles) and show the statistics that differ, without matching the records.")
+
+        # Row hash comparison for the no key column process
+        is_row_hash_mode = st.checkbox(label="Compare rows by hash :green[(optional)]", value=cfg.use_row_hash_comparison, help="Without key columns, match the rows by their 64-bit hash values instead of merging on every column.")
+
+        # Count of worker processes for the key columns comparison
+        workers_count = st.number_input(label="Parallel Workers :green[(optional)]", min_value=1, max_value=os.cpu_count(), value=min(cfg.parallel_workers_count, os.cpu_count()), step=1, help="Partition the data by the hash of the key columns and compare the partitions in parallel.")
+
+        # Report format, the virtual report embeds the data as columnar json for large data sets
+        report_format = st.selectbox(label="Report Format", options=["Standard", "Virtual", "Virtual (compressed)"], index=0, help="Virtual reports open instantly with millions of rows and work offline.")
+
+        # Convert the "xlsx" files once into "parquet" files reused by the later runs
+        is_excel_to_parquet = st.checkbox(label="Convert Excel files to Parquet :green[(optional)]", value=cfg.convert_excel_to_parquet, help="Read each workbook sheet once and reuse its cached Parquet copy in later validations.")
+
+        # Compact column types to reduce the memory of large files
+        is_compact_mode = st.checkbox(label="Compact loading mode :green[(optional)]", value=cfg.use_compact_types, help="Load low-cardinality text as categorical, other text as Arrow strings and downcast the numeric columns.")
+
+        # Baseline snapshot of the source data, reused by the later validations of the same source file
+        is_baseline_mode = st.checkbox(label="Source is a baseline :green[(optional)]", value=cfg.use_baseline_snapshot, help="Save the source data once as a snapshot with the row hash of every key, later validations of the same source file only read and hash the target file.")
+
+        # Handling of the records sharing a key, a many-to-many key merge can run out of memory
+        duplicate_key_policy = duplicate_key_policies[st.selectbox(label="Duplicate Keys", options=list(duplicate_key_policies), index=list(duplicate_key_policies.values()).index(cfg.duplicate_key_policy), help="How the records sharing the same key column values are matched.")]
+
+        # Normalization of the values before the comparison
+        with st.expander(label="Normalization :green[(optional)]"):
+            is_trim = st.checkbox(label="Trim leading and trailing spaces", value=cfg.normalize_trim)
+            is_case_fold = st.checkbox(label="Ignore letter case", value=cfg.normalize_case_fold)
+            is_blank_to_null = st.checkbox(label="Treat blank text as empty", value=cfg.normalize_blank_to_null)
+            is_canonical_dates = st.checkbox(label="Compare dates in any format", value=cfg.normalize_dates, help="Text columns holding dates are compared in the canonical YYYY-MM-DD form.")
+            is_dates_dayfirst = st.checkbox(label="Dates are day first", value=cfg.normalize_dates_dayfirst, help="Read ambiguous dates like 01/02/2024 as 1 February 2024.")
+            round_decimals = st.number_input(label="Round decimals to", min_value=0, max_value=15, value=cfg.normalize_round_decimals, step=1, placeholder="No rounding", help="Round the decimal columns before comparing them.")
+
+        # Peak memory of the stage timings
+        is_trace_memory = st.checkbox(label="Trace peak memory :green[(optional)]", value=cfg.trace_memory, help="Record the peak memory of every stage in the stage timings, which slows down the comparison.")
+
         # Create columns section for source and target
         source_container, target_container = st.columns(2)
 
         # Source container
         with source_container:
-            source_data_file = st.file_uploader(label="Choose Source Data File", type=["csv", "xlsx"], accept_multiple_files=False, key="source_data_file")
+            source_data_file = st.file_uploader(label="Choose Source Data File", type=["csv", "xlsx", "parquet"], accept_multiple_files=False, key="source_data_file")
 
         # Target container
         with target_container:
-            target_data_file = st.file_uploader(label="Choose Source Data File", type=["csv", "xlsx"], accept_multiple_files=False, key="target_data_file")
+            target_data_file = st.file_uploader(label="Choose Source Data File", type=["csv", "xlsx", "parquet"], accept_multiple_files=False, key="target_data_file")
+
+    # Record the stage timings of this run
+    startTrace(is_trace_memory)
 
     # Process inputs
     drop_cols_list = [] if columns_to_be_dropped_str=="" else columns_to_be_dropped_str.split(",")
     key_cols_list = [] if key_columns_str=="" else key_columns_str.split(",")
+    compare_cols_list = [] if columns_to_be_compared_str=="" else columns_to_be_compared_str.split(",")
+    if(compare_cols_list != []): # Key columns are always read
+        compare_cols_list = compare_cols_list + [column for column in key_cols_list if column not in compare_cols_list]
+    normalization_options = getNormalizationOptions(is_trim, is_case_fold, is_blank_to_null, None if round_decimals is None else int(round_decimals), is_canonical_dates, is_dates_dayfirst)
+    is_profile_mode = source_data_file is not None and target_data_file is not None and isProfileComparison(source_data_file, target_data_file, is_profile_only)
+    is_streaming_mode = source_data_file is not None and target_data_file is not None and not is_profile_mode and isStreamingComparison(source_data_file, target_data_file, key_cols_list, is_key_sorted)
+    is_partitioned_mode = source_data_file is not None and target_data_file is not None and not is_streaming_mode and isPartitionedComparison(source_data_file, target_data_file, is_out_of_core)
+    baseline_snapshot_id, is_baseline_snapshot = None, False
+
+    # Files whose comparison does not fit in the memory budget even in the low memory mode are not read, the estimate from the file sizes does not apply to the compact types or to a baseline snapshot
+    if(source_data_file is not None and target_data_file is not None and not (is_streaming_mode or is_partitioned_mode or is_profile_mode or is_compact_mode or is_baseline_mode)):
+        file_memory_estimate = estimateFileComparisonMemory(source_data_file, target_data_file, key_cols_list, *getLowMemoryComparisonOptions(key_cols_list, is_row_hash_mode, workers_count))
+        if(file_memory_estimate > getComparisonBudget()):
+            st.error(getMemoryBudgetError(file_memory_estimate, getComparisonBudget()))
+            stopTrace()
+            return
 
     # Display source information
     if(source_data_file is not None):
@@ -71,14 +288,26 @@ def showValidatorTabContent() -> None:
             with source_container:
                 st.divider()
                 st.write(f"Source[{source_data_file.name}] - Sample records")
-                if(source_data_file.name.endswith(".csv")):
-                    source_data = readDataFrameFromCSV(source_data_file)
-                elif(source_data_file.name.endswith(".xlsx")):
-                    source_data = readDataFrameFromExcel(source_data_file)
-                
-                # Check for drop columns
-                source_data = source_data.drop(drop_cols_list, axis=1)
-                st.dataframe(data=source_data.head(5), use_container_width=True, hide_index=True)
+                source_file_digest = getUploadedFileDigest(source_data_file, "source")
+                source_sheet_name = None
+                if(is_streaming_mode or is_partitioned_mode or is_profile_mode):
+                    source_data = readUploadedData(readDataFilePreview, source_data_file, 5, compare_cols_list, drop_cols_list)
+                else:
+                    if(source_data_file.name.endswith(".xlsx")):
+                        source_sheet_names = getOrComputeCachedValue(getCacheKey("excel_sheet_names", source_file_digest), getExcelSheetNames, source_data_file)
+                        source_data_file.seek(0)
+                        source_sheet_name = st.selectbox(label="Source Sheet", options=source_sheet_names, index=0, key="source_sheet_name")
+
+                    # The source data of a saved baseline snapshot is not read, only its first records are shown
+                    baseline_snapshot_id = getBaselineSnapshotId(source_file_digest, source_sheet_name, compare_cols_list, drop_cols_list, key_cols_list, normalization_options, is_compact_mode) if is_baseline_mode else None
+                    is_baseline_snapshot = baseline_snapshot_id is not None and hasBaselineSnapshot(baseline_snapshot_id)
+                    if(is_baseline_snapshot):
+                        source_data = readBaselineSnapshotPreview(baseline_snapshot_id, 5)
+                    else:
+                        source_data = readUploadedData(getOrComputeCachedValue, getCacheKey("read", source_file_digest, source_sheet_name, cfg.excel_engine, is_excel_to_parquet, compare_cols_list, drop_cols_list, is_compact_mode), readDataFileInMemoryBudget, source_data_file, source_sheet_name, compare_cols_list, drop_cols_list, cfg.excel_engine, is_excel_to_parquet, is_compact_mode, source_file_digest)
+
+                if(source_data is not None):
+                    st.dataframe(data=source_data.head(5), use_container_width=True, hide_index=True)
         
     # Display target information
     if(target_data_file is not None):
@@ -86,265 +315,115 @@ def showValidatorTabContent() -> None:
             with target_container:
                 st.divider()
                 st.write(f"Target[{target_data_file.name}] - Sample records")
-                if(target_data_file.name.endswith(".csv")):
-                    target_data = readDataFrameFromCSV(target_data_file)
-                elif(target_data_file.name.endswith(".xlsx")):
-                    target_data = readDataFrameFromExcel(target_data_file)
+                target_file_digest = getUploadedFileDigest(target_data_file, "target")
+                target_sheet_name = None
+                if(is_streaming_mode or is_partitioned_mode or is_profile_mode):
+                    target_data = readUploadedData(readDataFilePreview, target_data_file, 5, compare_cols_list, drop_cols_list)
+                else:
+                    if(target_data_file.name.endswith(".xlsx")):
+                        target_sheet_names = getOrComputeCachedValue(getCacheKey("excel_sheet_names", target_file_digest), getExcelSheetNames, target_data_file)
+                        target_data_file.seek(0)
+                        target_sheet_name = st.selectbox(label="Target Sheet", options=target_sheet_names, index=0, key="target_sheet_name")
+                    target_data = readUploadedData(getOrComputeCachedValue, getCacheKey("read", target_file_digest, target_sheet_name, cfg.excel_engine, is_excel_to_parquet, compare_cols_list, drop_cols_list, is_compact_mode), readDataFileInMemoryBudget, target_data_file, target_sheet_name, compare_cols_list, drop_cols_list, cfg.excel_engine, is_excel_to_parquet, is_compact_mode, target_file_digest)
 
-                # Check for drop columns
-                target_data = target_data.drop(drop_cols_list, axis=1)
-                st.dataframe(data=target_data.head(5), use_container_width=True, hide_index=True)
+                if(target_data is not None):
+                    st.dataframe(data=target_data.head(5), use_container_width=True, hide_index=True)
 
-    # Analyze data
+    # Compact column types of both sides must match to be merged and compared
+    if(is_compact_mode and not is_streaming_mode and not is_partitioned_mode and not is_baseline_snapshot and source_data_file is not None and target_data_file is not None and source_data is not None and target_data is not None):
+        source_data, target_data = alignCompactColumnTypes(source_data, target_data)
+
+    # Analyze data, the job of the page link is shown again without the files after a reconnect
     if(source_data_file is None or target_data_file is None):
-        pass
-    elif(source_data.shape != target_data.shape and key_cols_list==[]):
-        st.error("The dimensionality of the source and target data are not matching, please check and try again.")
-        st.info("Hint: By giving key column(s) input, this error can be avoided.")
-    elif(len(source_data.columns) != len(target_data.columns)):
-        st.error("The count of columns from the source and target data are not matching, please check and try again.")
-    elif((source_data.dtypes != target_data.dtypes).any()):
-        st.error("The data type of columns from the source and target data are not matching, please check and try again.")
+        stopTrace()
+        if(st.query_params.get("job") is not None and getJob(st.query_params.get("job")) is not None):
+            showValidationJob(st.query_params.get("job"))
+        return
+    if(source_data is None or target_data is None):
+        stopTrace()
+        return
+    # The readers ignore the columns to be dropped or compared that are in neither file, so they are checked against the columns of both files
+    if(drop_cols_list != [] or compare_cols_list != []):
+        source_columns = getOrComputeCachedValue(getCacheKey("columns", source_file_digest, source_sheet_name, cfg.excel_engine), readDataFileColumns, source_data_file, source_sheet_name or 0, cfg.excel_engine)
+        target_columns = getOrComputeCachedValue(getCacheKey("columns", target_file_digest, target_sheet_name, cfg.excel_engine), readDataFileColumns, target_data_file, target_sheet_name or 0, cfg.excel_engine)
+        unknown_columns_error, unknown_columns_hint = getUnknownColumnsError(source_columns + target_columns, drop_cols_list, compare_cols_list)
     else:
-        with st.spinner(text="Comparing data..."):
-            # Record start time
-            comparision_start_time = time.time()
-
-            # Fetch hash result
-            hash_result = getDataFrameHash(source_data) == getDataFrameHash(target_data)
-
-            # Validate data
-            if(key_cols_list==[]):
-                validation_result_df = compareDataFrames(source_data, target_data, list(source_data.columns))
-            else:
-                validation_result_df = compareDataFrames(source_data, target_data, key_cols_list)
-
-            # Analyze result data
-            if(key_cols_list == []): # No key column process
-                # Seggregate the valdiation result dataframe
-                # matching_records_source_df = validation_result_df[validation_result_df['_merge'] == 'both']
-                # matching_records_target_df = validation_result_df[validation_result_df['_merge'] == 'both']
-                source_non_matched_records_df = validation_result_df[validation_result_df['_merge'] == 'left_only']
-                target_non_matched_records_df = validation_result_df[validation_result_df['_merge'] == 'right_only']
-
-                # Drop indicator column from data sets
-                # matching_records_source_df = matching_records_source_df.drop(columns=['_merge'])
-                # matching_records_target_df = matching_records_target_df.drop(columns=['_merge'])
-                source_non_matched_records_df = source_non_matched_records_df.drop(columns=['_merge'])
-                target_non_matched_records_df = target_non_matched_records_df.drop(columns=['_merge'])
-
-                # Sort data records to start comparision
-                source_non_matched_records_df = source_non_matched_records_df.sort_values(by=source_non_matched_records_df.columns.tolist()).reset_index(drop=True)
-                target_non_matched_records_df = target_non_matched_records_df.sort_values(by=target_non_matched_records_df.columns.tolist()).reset_index(drop=True)
-
-                # Adding an index column with values "Source" and "Target" at the first position
-                # matching_records_source_df.insert(0, 'Data Origin', 'Source')
-                # matching_records_target_df.insert(0, 'Data Origin', 'Target')
-                # matching_records_source_df = matching_records_source_df.reset_index()
-                # matching_records_source_df = matching_records_source_df.rename(columns={"index":"Index"})
-                # matching_records_source_df['Index'] = matching_records_source_df.index + 1
-                # matching_records_target_df = matching_records_target_df.reset_index()
-                # matching_records_target_df = matching_records_target_df.rename(columns={"index":"Index"})
-                # matching_records_target_df['Index'] = matching_records_target_df.index + 1
-                source_non_matched_records_df.insert(0, 'Data Origin', 'Source')
-                target_non_matched_records_df.insert(0, 'Data Origin', 'Target')
-                source_non_matched_records_df = source_non_matched_records_df.reset_index()
-                source_non_matched_records_df = source_non_matched_records_df.rename(columns={"index":"Index"})
-                # source_non_matched_records_df['Index'] = source_non_matched_records_df.index + len(matching_records_source_df) + 1
-                source_non_matched_records_df['Index'] = source_non_matched_records_df.index + 1
-                target_non_matched_records_df = target_non_matched_records_df.reset_index()
-                target_non_matched_records_df = target_non_matched_records_df.rename(columns={"index":"Index"})
-                # target_non_matched_records_df['Index'] = target_non_matched_records_df.index + len(matching_records_target_df) + 1
-                target_non_matched_records_df['Index'] = target_non_matched_records_df.index + 1
-
-                # Compare key matched records : Mismatches only
-                difference_count = len(source_non_matched_records_df.drop(columns=['Data Origin', 'Index']).compare(target_non_matched_records_df.drop(columns=['Data Origin', 'Index']), align_axis=0, keep_shape=False, keep_equal=False))
-                
-                # Compare key matched records : Mismatched Values
-                only_mismatch_records_df = source_non_matched_records_df.compare(target_non_matched_records_df, align_axis=0, keep_shape=True, keep_equal=False).rename(index={'self': "Source", 'other': "Target"}, level=-1)
-
-                # Compare key matched records : All values
-                equal_and_mismatch_records_df = source_non_matched_records_df.compare(target_non_matched_records_df, align_axis=0, keep_shape=True, keep_equal=True).rename(index={'self': "Source", 'other': "Target"}, level=-1)
-
-                # Apply the function to each cell in the dataframe
-                only_mismatch_records_df = only_mismatch_records_df.applymap(updateMismatchCells)
-                differences_df = only_mismatch_records_df.fillna(equal_and_mismatch_records_df)
-
-                # Record end time
-                comparision_end_time = time.time()
-
-                # Add mismatches confirmation column to report data
-                # differences_df.insert(len(list(differences_df.columns)), 'Has Mismatch?', 'Yes')
-                # matching_records_source_df.insert(len(list(matching_records_source_df.columns)), 'Has Mismatch?', 'No')
-                # matching_records_target_df.insert(len(list(matching_records_target_df.columns)), 'Has Mismatch?', 'No')
-
-                # Fetch data statistics
-                total_source_records = len(source_data)
-                total_target_records = len(target_data)
-                total_errors = difference_count
-                total_differences = difference_count
-                total_records_only_in_source = 0
-                total_records_only_in_target = 0
-                total_time_taken_in_secs = comparision_end_time - comparision_start_time
-
-                # Create report file
-                final_differences_df = differences_df
-                # final_differences_df = pd.concat([differences_df, matching_records_source_df, matching_records_target_df])
-                differences_html = final_differences_df.to_html(index=False, classes=['table', 'table-striped', 'table-hover'])
-
-                html_page = readFile(cfg.artifacts_path + cfg.raw_report_file_name)
-                html_page = html_page.replace('#current_date_and_time#', getCurrentDayDateTimeAsString())
-                html_page = html_page.replace('#source_file_name#', source_data_file.name)
-                html_page = html_page.replace('#target_file_name#', target_data_file.name)
-                html_page = html_page.replace('#total_source_records#', str(total_source_records))
-                html_page = html_page.replace('#total_target_records#', str(total_target_records))
-                html_page = html_page.replace('#total_errors#', str(total_errors))
-                html_page = html_page.replace('#total_differences#', str(total_differences))
-                html_page = html_page.replace('#total_records_only_in_source#', str(total_records_only_in_source))
-                html_page = html_page.replace('#total_records_only_in_target#', str(total_records_only_in_target))
-                html_page = html_page.replace('#differences_df#', differences_html)
-                html_page = html_page.replace('#source_only_records_df#', "<p>No data found</p>")
-                html_page = html_page.replace('#target_only_records_df#', "<p>No data found</p>")
-                html_page = html_page.replace('#total_time_taken_in_mins#', str(round(total_time_taken_in_secs/60, 4)))
-                if(total_errors > 0):
-                    html_page = html_page.replace('#status_class#', "status-component-failed")
-                    html_page = html_page.replace('#status#', "Comparision Failed")
-                else:
-                    html_page = html_page.replace('#status_class#', "status-component-success")
-                    html_page = html_page.replace('#status#', "Comparision Successful")
-                html_page = html_page.replace('<td>:red', '<td style="background-color: #FF0000; color: white;">')
-                # writeFile(html_page, "test.html")
-            else: # Has key column process
-                # Seggregate the valdiation result dataframe
-                key_matched_source_records_df = validation_result_df[validation_result_df['_merge'] == 'both']
-                key_matched_target_records_df = validation_result_df[validation_result_df['_merge'] == 'both']
-                source_only_records_df = validation_result_df[validation_result_df['_merge'] == 'left_only']
-                target_only_records_df = validation_result_df[validation_result_df['_merge'] == 'right_only']
-
-                # Drop indicator and dulpicate columns from data sets
-                key_matched_source_records_df = key_matched_source_records_df.drop(columns=['_merge'])
-                key_matched_target_records_df = key_matched_target_records_df.drop(columns=['_merge'])
-                source_only_records_df = source_only_records_df.drop(columns=['_merge'])
-                target_only_records_df = target_only_records_df.drop(columns=['_merge'])
-
-                for column in list(key_matched_source_records_df.columns):
-                    if(column in key_cols_list):
-                        continue
-                    elif(column.endswith("_source")):
-                        new_column_name = str(column)[:-7]
-                        key_matched_source_records_df.rename(columns = {column:new_column_name}, inplace = True)
-                    elif(column.endswith("_target")):
-                        key_matched_source_records_df = key_matched_source_records_df.drop(columns=[column])
-
-                for column in list(key_matched_target_records_df.columns):
-                    if(column in key_cols_list):
-                        continue
-                    elif(column.endswith("_source")):
-                        key_matched_target_records_df = key_matched_target_records_df.drop(columns=[column])
-                    elif(column.endswith("_target")):
-                        new_column_name = str(column)[:-7]
-                        key_matched_target_records_df.rename(columns = {column:new_column_name}, inplace = True)
-                
-                for column in list(source_only_records_df.columns):
-                    if(column in key_cols_list):
-                        continue
-                    elif(column.endswith("_source")):
-                        new_column_name = str(column)[:-7]
-                        source_only_records_df.rename(columns = {column:new_column_name}, inplace = True)
-                    elif(column.endswith("_target")):
-                        source_only_records_df = source_only_records_df.drop(columns=[column])
-
-                for column in list(target_only_records_df.columns):
-                    if(column in key_cols_list):
-                        continue
-                    elif(column.endswith("_source")):
-                        target_only_records_df = target_only_records_df.drop(columns=[column])
-                    elif(column.endswith("_target")):
-                        new_column_name = str(column)[:-7]
-                        target_only_records_df.rename(columns = {column:new_column_name}, inplace = True)
-                
-                # Replace empty/entirely space cells with NaN
-                key_matched_source_records_df = key_matched_source_records_df.replace(r'^\s*$', np.nan, regex=True)
-                key_matched_target_records_df = key_matched_target_records_df.replace(r'^\s*$', np.nan, regex=True)
-
-                # Sort data records to start comparision
-                key_matched_source_records_df = key_matched_source_records_df.sort_values(by=key_matched_source_records_df.columns.tolist()).reset_index(drop=True)
-                key_matched_target_records_df = key_matched_target_records_df.sort_values(by=key_matched_target_records_df.columns.tolist()).reset_index(drop=True)
-
-                # Adding an index column with values "Source" and "Target" at the first position
-                key_matched_source_records_df.insert(0, 'Data Origin', 'Source')
-                key_matched_target_records_df.insert(0, 'Data Origin', 'Target')
-                key_matched_source_records_df = key_matched_source_records_df.reset_index()
-                key_matched_source_records_df = key_matched_source_records_df.rename(columns={"index":"Index"})
-                key_matched_source_records_df['Index'] = key_matched_source_records_df.index + 1
-                key_matched_target_records_df = key_matched_target_records_df.reset_index()
-                key_matched_target_records_df = key_matched_target_records_df.rename(columns={"index":"Index"})
-                key_matched_target_records_df['Index'] = key_matched_target_records_df.index + 1
-                
-                # Compare key matched records : Mismatches only
-                difference_count = len(key_matched_source_records_df.drop(columns=['Data Origin', 'Index']).compare(key_matched_target_records_df.drop(columns=['Data Origin', 'Index']), align_axis=0, keep_shape=False, keep_equal=False))
-                
-                # Compare key matched records : Mismatched Values
-                only_mismatch_records_df = key_matched_source_records_df.compare(key_matched_target_records_df, align_axis=0, keep_shape=True, keep_equal=False).rename(index={'self': "Source", 'other': "Target"}, level=-1)
-                only_mismatch_records_df['Data Origin'] = np.nan
-                only_mismatch_records_df = only_mismatch_records_df.dropna(axis = 0, how = 'all')
-
-                # Compare key matched records : All values
-                equal_and_mismatch_records_df = key_matched_source_records_df.compare(key_matched_target_records_df, align_axis=0, keep_shape=True, keep_equal=True).rename(index={'self': "Source", 'other': "Target"}, level=-1)
-
-                # Apply the function to each cell in the dataframe
-                only_mismatch_records_df = only_mismatch_records_df.applymap(updateMismatchCells)
-                differences_df = only_mismatch_records_df.fillna(equal_and_mismatch_records_df)
-
-                # Add mismatches confirmation column to report data
-                # differences_df.insert(len(list(differences_df.columns)), 'Has Mismatch?', 'Yes')
-
-                # Record end time
-                comparision_end_time = time.time()
-
-                # Fetch data statistics
-                total_source_records = len(source_data)
-                total_target_records = len(target_data)
-                total_errors = difference_count + len(source_only_records_df) + len(target_only_records_df)
-                total_differences = difference_count
-                total_records_only_in_source = len(source_only_records_df)
-                total_records_only_in_target = len(target_only_records_df)
-                total_time_taken_in_secs = comparision_end_time - comparision_start_time
-
-                # Create report file
-                differences_html = differences_df.to_html(index=False, classes=['table', 'table-striped', 'table-hover'])
-                source_only_html = source_only_records_df.to_html(index=False, classes=['table', 'table-striped', 'table-hover'])
-                target_only_html = target_only_records_df.to_html(index=False, classes=['table', 'table-striped', 'table-hover'])
-
-                html_page = readFile(cfg.artifacts_path + cfg.raw_report_file_name)
-                html_page = html_page.replace('#current_date_and_time#', getCurrentDayDateTimeAsString())
-                html_page = html_page.replace('#source_file_name#', source_data_file.name)
-                html_page = html_page.replace('#target_file_name#', target_data_file.name)
-                html_page = html_page.replace('#total_source_records#', str(total_source_records))
-                html_page = html_page.replace('#total_target_records#', str(total_target_records))
-                html_page = html_page.replace('#total_errors#', str(total_errors))
-                html_page = html_page.replace('#total_differences#', str(total_differences))
-                html_page = html_page.replace('#total_records_only_in_source#', str(total_records_only_in_source))
-                html_page = html_page.replace('#total_records_only_in_target#', str(total_records_only_in_target))
-                html_page = html_page.replace('#differences_df#', differences_html)
-                html_page = html_page.replace('#source_only_records_df#', source_only_html)
-                html_page = html_page.replace('#target_only_records_df#', target_only_html)
-                html_page = html_page.replace('#total_time_taken_in_mins#', str(round(total_time_taken_in_secs/60, 4)))
-                if(total_errors > 0):
-                    html_page = html_page.replace('#status_class#', "status-component-failed")
-                    html_page = html_page.replace('#status#', "Comparision Failed")
-                else:
-                    html_page = html_page.replace('#status_class#', "status-component-success")
-                    html_page = html_page.replace('#status#', "Comparision Successful")
-                html_page = html_page.replace('<td>:red', '<td style="background-color: #FF0000; color: white;">')
-                # writeFile(html_page, "test.html")
-            # components.html(html_page, width=1080, height=720)
-            # Show button to download the data comparision report
-            if(total_errors > 0):
-                st.download_button(label="❌ :red[Comparision Failed] | ⬇️ Download Comparision Report", data=html_page, file_name=f"Validata_Comparision_Report_{getCurrentDateTimeAsString()}.html", use_container_width=True)
-            else:
-                st.download_button(label="✅ :green[Comparision Successful] | ⬇️ Download Comparision Report", data=html_page, file_name=f"Validata_Comparision_Report_{getCurrentDateTimeAsString()}.html", use_container_width=True)
-
+        unknown_columns_error, unknown_columns_hint = None, None
+    if(unknown_columns_error is not None):
+        comparison_error, comparison_hint = unknown_columns_error, unknown_columns_hint
+    elif(is_profile_mode): # The columns of one file only are reported as differences
+        comparison_error, comparison_hint = None, None
+    elif(is_baseline_snapshot):
+        comparison_error, comparison_hint = getSnapshotComparisonError(readBaselineSnapshotMetadata(baseline_snapshot_id), target_data, key_cols_list, is_compact_mode)
+    else:
+        comparison_error, comparison_hint = getComparisonError(source_data, target_data, key_cols_list, is_streaming_mode or is_partitioned_mode)
+    if(comparison_error is not None):
+        st.error(comparison_error)
+        if(comparison_hint is not None):
+            st.info(comparison_hint)
+        stopTrace()
+        return
+
+    # Estimate the peak memory of the comparison, routed to the low memory mode when it does not fit in the memory budget left by the other sessions
+    if(is_streaming_mode or is_profile_mode):
+        memory_estimate = estimateStreamingComparisonMemory(source_data_file, target_data_file, source_data, target_data, cfg.stream_chunk_size)
+    elif(is_partitioned_mode):
+        memory_estimate = estimatePartitionedComparisonMemory(source_data_file, target_data_file, key_cols_list, is_row_hash_mode)
+    else:
+        # The rows of a baseline snapshot are read only where they differ, so the estimate is of the target data on both sides
+        memory_source_data = target_data if is_baseline_snapshot else source_data
+        memory_estimate = estimateComparisonMemory(memory_source_data, target_data, key_cols_list, is_row_hash_mode, workers_count)
+        if(memory_estimate > getAvailableMemory()):
+            low_memory_row_hash_mode, low_memory_workers_count = getLowMemoryComparisonOptions(key_cols_list, is_row_hash_mode, workers_count)
+            low_memory_estimate = estimateComparisonMemory(memory_source_data, target_data, key_cols_list, low_memory_row_hash_mode, low_memory_workers_count)
+            if(low_memory_estimate < memory_estimate):
+                is_row_hash_mode, workers_count, memory_estimate = low_memory_row_hash_mode, low_memory_workers_count, low_memory_estimate
+                st.info("The server is busy, the comparison runs in the low memory mode.")
+
+    # Submit the comparison as a background job, the job of the same inputs and options is reused until it fails or is cancelled
+    comparison_cache_key = getCacheKey("compare", source_file_digest, source_sheet_name, target_file_digest, target_sheet_name, compare_cols_list, drop_cols_list, key_cols_list, is_streaming_mode, is_partitioned_mode, is_profile_mode, is_row_hash_mode, is_compact_mode, normalization_options, duplicate_key_policy, workers_count, cfg.merkle_block_size, baseline_snapshot_id)
+    job_key = getCacheKey("job", comparison_cache_key, source_data_file.name, target_data_file.name, report_format, is_trace_memory, getCurrentUserName())
+    load_trace = stopTrace()
+    job_id = st.query_params.get("job")
+    job = getJob(job_id) if job_id is not None else None
+    if(job is None or job['job_key'] != job_key):
+        if(memory_estimate > getAvailableMemory()):
+            st.info(f"Waiting for {memory_estimate // (1024 * 1024)} MB of the server memory budget, the comparison starts when the running comparisons finish.")
+        artifact_metadata = {'owner': getCurrentUserName(), 'source_file': source_data_file.name, 'target_file': target_data_file.name, 'source_digest': source_file_digest, 'target_digest': target_file_digest, 'report_format': report_format}
+        job_id = submitJob(runValidationJob, source_data_file, target_data_file, source_data, target_data, comparison_cache_key, memory_estimate, is_streaming_mode, is_partitioned_mode, is_profile_mode, key_cols_list, drop_cols_list, compare_cols_list, normalization_options, duplicate_key_policy, is_row_hash_mode, workers_count, report_format, baseline_snapshot_id, load_trace, artifact_metadata, job_key=job_key, trace_memory=is_trace_memory)
+        st.query_params["job"] = job_id
+
+    # Show the progress, report or error of the job
+    showValidationJob(job_id, load_trace, comparison_error_hints["profile" if is_profile_mode else ("streaming" if is_streaming_mode else ("partitioned" if is_partitioned_mode else "in_memory"))])
+
+# History tab function
+def showHistoryTabContent() -> None:
+    user_name = getCurrentUserName()
+    with st.container(border=True):
+        # Filters of the stored reports
+        status_column, search_column = st.columns(2)
+        status = {"All": None, "Failed": "failed", "Passed": "passed"}[status_column.selectbox(label="Status", options=["All", "Failed", "Passed"], index=0, key="history_status")]
+        search_text = search_column.text_input(label="File Name :green[(optional)]", placeholder="customers", key="history_search")
+
+        # Pages of the stored reports, newest first
+        artifacts_count = getArtifactsCount(user_name, status, search_text)
+        if(artifacts_count == 0):
+            st.info("No stored reports found.")
+            return
+        pages_count = math.ceil(artifacts_count / cfg.catalog_page_size)
+        page = st.number_input(label=f"Page (of {pages_count})", min_value=1, max_value=pages_count, value=1, step=1, key="history_page") - 1
+        artifacts = getArtifacts(user_name, status, search_text, page)
+        artifacts_df = pd.DataFrame(artifacts)
+        artifacts_df['created_at'] = pd.to_datetime(artifacts_df['created_at'], unit='s').dt.strftime("%Y-%m-%d %H:%M:%S")
+        artifacts_df['size_in_bytes'] = (artifacts_df['size_in_bytes'] / 1024).round(1)
+        st.dataframe(data=artifacts_df[['created_at', 'owner', 'source_file', 'target_file', 'status', 'total_errors', 'report_format', 'size_in_bytes']].rename(columns={'created_at': "Created At", 'owner': "Owner", 'source_file': "Source File", 'target_file': "Target File", 'status': "Status", 'total_errors': "Errors", 'report_format': "Report Format", 'size_in_bytes': "Size (KB)"}), use_container_width=True, hide_index=True)
+
+        # Show button to download a stored report, evicted reports are removed from the history
+        artifact_position = st.selectbox(label="Report", options=range(len(artifacts)), format_func=lambda position: f"{artifacts_df['created_at'][position]} | {artifacts[position]['source_file']} vs {artifacts[position]['target_file']}", key="history_report")
+        report_fpath = os.path.join(cfg.result_store_path, artifacts[artifact_position]['report_path'])
+        if(os.path.exists(report_fpath)):
+            with open(report_fpath, 'rb') as report_file:
+                st.download_button(label="⬇️ Download Report", data=report_file, file_name=f"Validata_Comparision_Report_{artifacts_df['created_at'][artifact_position].replace(' ', '_').replace(':', '')}.html", use_container_width=True)
 
 # Streamlit page content function
 def showPageContent() -> None:
@@ -356,7 +435,7 @@ def showPageContent() -> None:
     )
 
     # Show tabs
-    files_validator_page_tabs = st.tabs(["ℹ️ Information", "🔍 Validator"])
+    files_validator_page_tabs = st.tabs(["ℹ️ Information", "🔍 Validator", "🗂️ History"])
 
     # Information tab
     with files_validator_page_tabs[0]:
@@ -366,6 +445,10 @@ def showPageContent() -> None:
     with files_validator_page_tabs[1]:
         showValidatorTabContent()
 
+    # History tab
+    with files_validator_page_tabs[2]:
+        showHistoryTabContent()
+
 # Streamlit sidebar function
 def showSidebarContent() -> None:
     # Display sidebar title
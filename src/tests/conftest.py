@@ -0,0 +1,6 @@
+# Import packages and modules | External
+import os
+import sys
+
+# The tests import the package from the "src" directory, as the Streamlit pages do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
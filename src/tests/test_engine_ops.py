@@ -0,0 +1,55 @@
+# Import packages and modules | External
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.engine_ops import compareDataSets, compareWithBaselineSnapshot, compareDataFilesInPartitions, readDataFileColumns, getUnknownColumnsError
+from validata_package.snapshot_ops import saveBaselineSnapshot
+
+# Source data of the comparisons, four row blocks of two records
+source_df = pd.DataFrame({'id': range(8), 'name': list("abcdefgh"), 'score': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]})
+
+def test_differing_columns_of_aligned_keys():
+    target_df = source_df.assign(score=source_df['score'].where(source_df['id'] != 5, 0.0))
+    comparison_result = compareDataSets(source_df, target_df, ["id"], workers_count=1, block_size=2)
+    assert comparison_result[-1] == "1 of 4 row block(s) differ, in column(s): score"
+
+def test_no_differing_columns_of_shuffled_rows():
+    target_df = source_df.iloc[[1, 0, 2, 3, 4, 5, 7, 6]]
+    assert compareDataSets(source_df, target_df, ["id"], workers_count=1, block_size=2)[-1] is None
+    assert compareDataSets(source_df, target_df, [], workers_count=1, block_size=2)[-1] is None
+
+def test_baseline_snapshot_with_duplicate_keys_allowed(tmp_path):
+    snapshot_source_df = pd.DataFrame({'id': ["1", "1", "2"], 'v': [1, 2, 3]})
+    snapshot_target_df = pd.DataFrame({'id': ["1", "1", "2"], 'v': [1, 5, 3]})
+    assert saveBaselineSnapshot("snapshot", snapshot_source_df, ["id"], snapshot_path=str(tmp_path))
+    snapshot_result = compareWithBaselineSnapshot("snapshot", snapshot_target_df, ["id"], workers_count=1, duplicate_key_policy="allow", snapshot_path=str(tmp_path))
+    full_result = compareDataSets(snapshot_source_df, snapshot_target_df, ["id"], workers_count=1, duplicate_key_policy="allow")
+    assert snapshot_result[3] == full_result[3]
+    assert snapshot_result[0].equals(full_result[0])
+
+def test_duplicate_keys_allowed_give_the_same_result_in_any_block_size():
+    duplicate_source_df = pd.DataFrame({'id': ["1", "2", "1", "3"], 'v': [1, 2, 3, 4]})
+    duplicate_target_df = pd.DataFrame({'id': ["1", "2", "3", "1"], 'v': [1, 2, 4, 5]})
+    comparison_results = [compareDataSets(duplicate_source_df, duplicate_target_df, ["id"], workers_count=1, block_size=block_size, duplicate_key_policy="allow") for block_size in [2, 100]]
+    assert comparison_results[0][3] == comparison_results[1][3]
+    assert len(comparison_results[0][1]) == len(comparison_results[1][1])
+    assert comparison_results[0][0].equals(comparison_results[1][0])
+
+def test_partitions_written_in_several_files_keep_the_records_order(tmp_path, monkeypatch):
+    # Row groups of two records and no buffer budget write every partition into several files
+    monkeypatch.setattr(cfg, "partition_row_group_size", 2)
+    monkeypatch.setattr(cfg, "partition_memory_mb", 0)
+    monkeypatch.setattr(cfg, "partition_temp_path", str(tmp_path))
+    source_fpath, target_fpath = tmp_path / "source.csv", tmp_path / "target.csv"
+    source_fpath.write_text("id,v\n" + "".join(f"{number % 5},{number}\n" for number in range(20)))
+    target_fpath.write_text("id,v\n" + "".join(f"{number % 5},{number if number != 13 else -1}\n" for number in range(20)))
+    comparison_result = compareDataFilesInPartitions(str(source_fpath), str(target_fpath), ["id"], chunk_size=3, duplicate_key_policy="occurrence", partitions_count=2)
+    assert comparison_result[3] == compareDataSets(pd.read_csv(source_fpath), pd.read_csv(target_fpath), ["id"], workers_count=1, duplicate_key_policy="occurrence")[3] == 2
+
+def test_unknown_columns_to_drop_or_compare_are_reported(tmp_path):
+    source_fpath = tmp_path / "source.csv"
+    source_fpath.write_text("id,name,score\n1,a,1.0\n")
+    file_columns = readDataFileColumns(str(source_fpath)) + ["extra"]
+    assert getUnknownColumnsError(file_columns, ["score", "extra"], ["id", "name"]) == (None, None)
+    assert getUnknownColumnsError(file_columns, ["scroe"], ["id", " name"])[0] == "The column(s) scroe,  name are not found in the source or target data, please check and try again."
@@ -0,0 +1,32 @@
+# Import packages and modules | External
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package.normalization_ops import getNormalizationOptions, resolveDateColumns, normalizeDataFrame
+from validata_package.engine_ops import compareDataFiles, compareDataSets
+
+# Normalization options comparing the dates in any format
+date_normalization_options = getNormalizationOptions(canonicalize_dates=True)
+
+def test_blank_and_placeholder_values_do_not_prevent_dates():
+    dataframe = pd.DataFrame({'date': ["2024-01-31", " ", "n/a", "31/01/2024"], 'name': ["a", "b", "c", "d"]})
+    normalized_df = normalizeDataFrame(dataframe, date_normalization_options)
+    assert normalized_df['date'].tolist()[0] == normalized_df['date'].tolist()[3] == "2024-01-31"
+    assert pd.isna(normalized_df['date'][1]) and normalized_df['date'][2] == "n/a"
+    assert normalized_df['name'].tolist() == ["a", "b", "c", "d"]
+
+def test_date_columns_are_found_once_for_both_sides():
+    # Only the source sample holds dates, the target dates are canonicalized alike
+    source_df = pd.DataFrame({'id': [1, 2], 'date': ["2024/01/31", "2024/02/01"]})
+    target_df = pd.DataFrame({'id': [1, 2], 'date': ["2024-01-31", "unknown"]})
+    normalization_options = resolveDateColumns(date_normalization_options, [source_df, target_df])
+    assert normalization_options['date_columns'] == ["date"]
+    assert normalizeDataFrame(target_df.head(1), normalization_options)['date'].tolist() == ["2024-01-31"]
+    assert compareDataSets(source_df, target_df, ["id"], workers_count=1, normalization_options=date_normalization_options)[3] == 2
+
+def test_dates_are_canonicalized_alike_in_every_chunk(tmp_path):
+    source_fpath, target_fpath = tmp_path / "source.csv", tmp_path / "target.csv"
+    source_fpath.write_text("id,date\n1,2024-01-31\n2,n/a\n3,2024-02-01\n4,2024-02-02\n")
+    target_fpath.write_text("id,date\n1,31.01.2024\n2,n/a\n3,01.02.2024\n4,02.02.2024\n")
+    comparison_result = compareDataFiles(str(source_fpath), str(target_fpath), ["id"], chunk_size=2, normalization_options=getNormalizationOptions(canonicalize_dates=True, dates_dayfirst=True))
+    assert comparison_result[3] == 0
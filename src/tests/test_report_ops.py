@@ -0,0 +1,12 @@
+# Import packages and modules | External
+import json
+import numpy as np
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package.report_ops import iterateDataFrameJson
+
+def test_infinite_numbers_are_written_as_valid_json():
+    dataframe = pd.DataFrame({'number': [1.5, np.inf, -np.inf, np.nan], 'mixed': ["a", float("inf"), None, 2]})
+    report_table = json.loads("".join(iterateDataFrameJson(dataframe)))
+    assert report_table['values'] == [[1.5, "inf", "-inf", None], ["a", "inf", None, 2]]
@@ -0,0 +1,52 @@
+# Import packages and modules | External
+import pytest
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package.engine_ops import compareDataFiles, compareDataSets
+
+# Function to write the lines of a "csv" file, returns the file path
+def writeCSV(fpath, lines: list) -> str:
+    fpath.write_text("\n".join(lines) + "\n")
+    return str(fpath)
+
+# Function returns the record counts of a comparison result : differences, records only in source/target and total source/target records
+def getResultCounts(comparison_result: tuple) -> tuple:
+    differences_df, source_only_records_df, target_only_records_df, difference_count, total_source_records, total_target_records = comparison_result[:6]
+    return difference_count, len(source_only_records_df), len(target_only_records_df), total_source_records, total_target_records
+
+# Function to compare two key sorted "csv" files in chunks of two records, returns the record counts of the result
+def compareInChunks(source_fpath: str, target_fpath: str, key_columns: list) -> tuple:
+    return getResultCounts(compareDataFiles(source_fpath, target_fpath, key_columns, chunk_size=2))
+
+# Function to compare two "csv" files in memory with the key columns read as text, returns the record counts of the result
+def compareInMemory(source_fpath: str, target_fpath: str, key_columns: list) -> tuple:
+    key_types = {column: str for column in key_columns}
+    return getResultCounts(compareDataSets(pd.read_csv(source_fpath, dtype=key_types), pd.read_csv(target_fpath, dtype=key_types), key_columns, workers_count=1))
+
+def test_keys_sorted_as_text(tmp_path):
+    source_fpath = writeCSV(tmp_path / "source.csv", ["id,value", "1,a", "10,b", "2,c", "3,d"])
+    target_fpath = writeCSV(tmp_path / "target.csv", ["id,value", "1,a", "10,x", "2,c", "4,d"])
+    assert compareInChunks(source_fpath, target_fpath, ["id"]) == compareInMemory(source_fpath, target_fpath, ["id"]) == (2, 1, 1, 4, 4)
+
+def test_keys_sorted_as_numbers(tmp_path):
+    source_fpath = writeCSV(tmp_path / "source.csv", ["id,value", "1,a", "2,b", "10,c", "11,d"])
+    target_fpath = writeCSV(tmp_path / "target.csv", ["id,value", "1,a", "2,x", "10,c", "12,d"])
+    assert compareInChunks(source_fpath, target_fpath, ["id"]) == compareInMemory(source_fpath, target_fpath, ["id"]) == (2, 1, 1, 4, 4)
+
+def test_key_and_value_types_change_between_chunks(tmp_path):
+    # The first chunk infers integer keys and values, the second chunk text keys and values
+    source_fpath = writeCSV(tmp_path / "source.csv", ["id,value", "1,1", "2,2", "a,x", "b,y"])
+    target_fpath = writeCSV(tmp_path / "target.csv", ["id,value", "1,1", "2,5", "a,x", "b,y"])
+    assert compareInChunks(source_fpath, target_fpath, ["id"]) == compareInMemory(source_fpath, target_fpath, ["id"]) == (2, 0, 0, 4, 4)
+
+def test_empty_keys_are_sorted_last(tmp_path):
+    source_fpath = writeCSV(tmp_path / "source.csv", ["id,value", "1,a", "2,b", "3,c", ",d"])
+    target_fpath = writeCSV(tmp_path / "target.csv", ["id,value", "1,a", "3,c", ",x"])
+    assert compareInChunks(source_fpath, target_fpath, ["id"]) == compareInMemory(source_fpath, target_fpath, ["id"]) == (2, 1, 0, 4, 3)
+
+def test_unsorted_keys_are_rejected(tmp_path):
+    source_fpath = writeCSV(tmp_path / "source.csv", ["id,value", "2,a", "1,b", "3,c"])
+    target_fpath = writeCSV(tmp_path / "target.csv", ["id,value", "1,b", "2,a", "3,c"])
+    with pytest.raises(ValueError, match="source data is not sorted"):
+        compareInChunks(source_fpath, target_fpath, ["id"])
@@ -0,0 +1,49 @@
+# Import packages and modules | External
+import threading
+import contextvars
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package.trace_ops import startTrace, stopTrace, traceStage, startPartialResult
+from validata_package.parallel_ops import compareDataFramesByKeysInParallel
+
+# Function to record a stage in a trace of its own context, returns the recorded trace
+def runTracedStage(stage_started: threading.Event, stage_release: threading.Event) -> list:
+    startTrace(trace_memory=True)
+    with traceStage("stage"):
+        stage_started.set()
+        stage_release.wait(timeout=10)
+    return stopTrace()
+
+def test_only_one_trace_at_a_time_traces_memory():
+    first_started, first_release = threading.Event(), threading.Event()
+    first_traces = []
+    first_thread = threading.Thread(target=lambda: first_traces.append(contextvars.Context().run(runTracedStage, first_started, first_release)))
+    first_thread.start()
+    first_started.wait(timeout=10)
+
+    # The trace started while the first trace runs records no peak memory
+    second_release = threading.Event()
+    second_release.set()
+    second_trace = contextvars.Context().run(runTracedStage, threading.Event(), second_release)
+    first_release.set()
+    first_thread.join()
+    assert second_trace[0]['peak_memory_in_mb'] is None
+    assert first_traces[0][0]['peak_memory_in_mb'] is not None
+
+    # The memory is traced again once the first trace stopped
+    assert contextvars.Context().run(runTracedStage, threading.Event(), second_release)[0]['peak_memory_in_mb'] is not None
+
+# Function to compare in worker processes with a partial result of its own context, returns the partial result
+def runParallelComparison(source_df: pd.DataFrame, target_df: pd.DataFrame) -> dict:
+    partial_result = startPartialResult()
+    compareDataFramesByKeysInParallel(source_df, target_df, ["id"], workers_count=2)
+    return partial_result
+
+def test_partial_result_of_the_parallel_partitions():
+    source_df = pd.DataFrame({'id': range(10), 'v': range(10)})
+    target_df = pd.DataFrame({'id': range(1, 11), 'v': [0 if number == 4 else number for number in range(1, 11)]})
+    partial_result = contextvars.Context().run(runParallelComparison, source_df, target_df)
+    assert partial_result['compared_chunks'] == 2
+    assert (partial_result['matched_records'], partial_result['mismatched_records'], partial_result['source_only_records'], partial_result['target_only_records']) == (9, 1, 1, 1)
+    assert sorted(partial_result['difference_sample']['Result'].tolist()) == ["Mismatch", "Mismatch", "Source only", "Target only"]
@@ -0,0 +1,253 @@
+# Import packages and modules | External
+import os
+import sys
+import json
+import time
+import shutil
+import getpass
+import argparse
+import warnings
+import multiprocessing
+import multiprocessing.connection
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.validation_ops import readDataFrameFromCSV, getCurrentDayDateTimeAsString
+from validata_package.engine_ops import getDataFileName, readDataFilePreview, isStreamingComparison, isPartitionedComparison, isProfileComparison, compareFiles, getReportValues, getReportSummary, writeComparisonReport
+from validata_package.memory_ops import estimateStreamingComparisonMemory, estimatePartitionedComparisonMemory, estimateFileComparisonMemory
+from validata_package.normalization_ops import getNormalizationOptions
+from validata_package.trace_ops import startTrace, stopTrace, getCurrentTrace
+from validata_package.cache_ops import getFileDigest, getCacheKey
+from validata_package.store_ops import getStoredResult, putStoredResult
+
+# Function returns the column names list of a manifest value, given as a list or a comma separated string
+def getColumnsList(columns) -> list:
+    if(columns is None or columns == ""):
+        return []
+    return columns.split(",") if isinstance(columns, str) else list(columns)
+
+# Function to read the batch jobs from a "json" manifest, a list of jobs or an object with "defaults" and "jobs"
+def readBatchManifest(manifest_fpath: str) -> list:
+    with open(manifest_fpath, 'r', encoding='utf-8') as manifest_file:
+        manifest = json.load(manifest_file)
+    defaults = manifest.get("defaults", {}) if isinstance(manifest, dict) else {}
+    manifest_jobs = manifest.get("jobs", []) if isinstance(manifest, dict) else manifest
+
+    # Relative file paths are relative to the manifest file
+    manifest_directory = os.path.dirname(os.path.abspath(manifest_fpath))
+    jobs = []
+    for position, manifest_job in enumerate(manifest_jobs):
+        job = {**defaults, **manifest_job}
+        job['source'] = os.path.normpath(os.path.join(manifest_directory, job['source']))
+        job['target'] = os.path.normpath(os.path.join(manifest_directory, job['target']))
+        job['name'] = job.get("name", f"{position + 1:03d}_{os.path.splitext(getDataFileName(job['source']))[0]}_vs_{os.path.splitext(getDataFileName(job['target']))[0]}")
+        job['position'] = position
+        jobs.append(job)
+    return jobs
+
+# Function returns the size of the job's data files, to schedule the largest jobs first
+def getBatchJobSize(job: dict) -> int:
+    return sum(os.path.getsize(job[side]) if os.path.exists(job[side]) else 0 for side in ['source', 'target'])
+
+# Function returns the estimated peak memory in bytes of a batch job, to keep the running jobs within the memory budget
+def getBatchJobMemoryEstimate(job: dict) -> int:
+    key_columns = getColumnsList(job.get("key_columns"))
+    if(not all(os.path.exists(job[side]) for side in ['source', 'target'])):
+        return 0
+    if(isProfileComparison(job['source'], job['target'], job.get("profile_only", cfg.use_column_profile))):
+        return estimateStreamingComparisonMemory(job['source'], job['target'], readDataFilePreview(job['source'], cfg.memory_sample_rows), readDataFilePreview(job['target'], cfg.memory_sample_rows), cfg.stream_chunk_size)
+    if(isStreamingComparison(job['source'], job['target'], key_columns, job.get("is_key_sorted", False))):
+        return estimateStreamingComparisonMemory(job['source'], job['target'], readDataFrameFromCSV(job['source'], cfg.memory_sample_rows), readDataFrameFromCSV(job['target'], cfg.memory_sample_rows), cfg.stream_chunk_size)
+    if(isPartitionedComparison(job['source'], job['target'], job.get("out_of_core", cfg.use_out_of_core_comparison))):
+        return estimatePartitionedComparisonMemory(job['source'], job['target'], key_columns, job.get("is_row_hash_mode", cfg.use_row_hash_comparison))
+    return estimateFileComparisonMemory(job['source'], job['target'], key_columns, job.get("is_row_hash_mode", cfg.use_row_hash_comparison), job.get("workers_count", 1))
+
+# Function returns the artifact catalog metadata of a batch job, the owner defaults to the user running the batch
+def getBatchJobArtifactMetadata(job: dict) -> dict:
+    return {'owner': job.get("owner", getpass.getuser()), 'source_file': getDataFileName(job['source']), 'target_file': getDataFileName(job['target']), 'source_digest': getFileDigest(job['source']), 'target_digest': getFileDigest(job['target']), 'report_format': job.get("report_format", "Standard")}
+
+# Function returns the "compareFiles" options of a batch job, the options missing in the manifest take the configured values
+def getBatchJobComparisonOptions(job: dict) -> dict:
+    return {
+        'key_columns': getColumnsList(job.get("key_columns")),
+        'drop_columns': getColumnsList(job.get("drop_columns")),
+        'columns': getColumnsList(job.get("columns")),
+        'sheet_names': (job.get("source_sheet", 0), job.get("target_sheet", 0)),
+        'is_key_sorted': job.get("is_key_sorted", False),
+        'is_row_hash_mode': job.get("is_row_hash_mode", cfg.use_row_hash_comparison),
+        'workers_count': job.get("workers_count", 1),
+        'engine': job.get("excel_engine", cfg.excel_engine),
+        'excel_to_parquet': job.get("excel_to_parquet", cfg.convert_excel_to_parquet),
+        'compact_types': job.get("compact_types", cfg.use_compact_types),
+        'normalization_options': getNormalizationOptions(**job.get("normalization", {})),
+        'duplicate_key_policy': job.get("duplicate_key_policy", cfg.duplicate_key_policy),
+        'is_out_of_core': job.get("out_of_core", cfg.use_out_of_core_comparison),
+        'use_baseline_snapshot': job.get("baseline_snapshot", cfg.use_baseline_snapshot),
+        'is_profile_mode': job.get("profile_only", cfg.use_column_profile)
+    }
+
+# Function returns the result store key of a batch job, from the digests of its data files and every option changing its report
+def getBatchJobResultKey(job: dict, artifact_metadata: dict) -> str:
+    return getCacheKey("batch_result", artifact_metadata, getBatchJobComparisonOptions(job), cfg.merkle_block_size)
+
+# Function returns the summary of a batch job
+def getBatchJobSummary(job: dict, status: str, time_taken_in_secs: float = 0, report_summary: dict = None, report_fpath: str = None, message: str = None, trace: list = [], is_stored_result: bool = False) -> dict:
+    job_summary = {
+        'name': job['name'],
+        'source': job['source'],
+        'target': job['target'],
+        'status': status,
+        'time_taken_in_secs': round(time_taken_in_secs, 3),
+        'report_file': report_fpath,
+        'message': message,
+        'stages': trace,
+        'is_stored_result': is_stored_result
+    }
+    if(report_summary is not None):
+        job_summary.update(report_summary)
+    return job_summary
+
+# Function to run one batch job, writes its report into the output directory and returns the job summary
+def runBatchJob(job: dict, output_directory: str, artifacts_path: str = cfg.artifacts_path) -> dict:
+    start_time = time.time()
+    startTrace(job.get("trace_memory", cfg.trace_memory))
+    try:
+        for side in ['source', 'target']:
+            if(not os.path.exists(job[side])):
+                raise FileNotFoundError(f"The {side} file '{job[side]}' does not exist.")
+
+        # Copy the stored report of the same data files and options
+        report_fpath = os.path.join(output_directory, f"{job['name']}.html")
+        use_result_store = job.get("use_result_store", cfg.use_result_store)
+        if(use_result_store):
+            artifact_metadata = getBatchJobArtifactMetadata(job)
+            result_key = getBatchJobResultKey(job, artifact_metadata)
+            stored_result = getStoredResult(result_key)
+            if(stored_result is not None):
+                stored_report_fpath, report_summary = stored_result
+                shutil.copyfile(stored_report_fpath, report_fpath)
+                status = "failed" if report_summary['total_errors'] > 0 else "passed"
+                return getBatchJobSummary(job, status, time.time() - start_time, report_summary, report_fpath, report_summary['message'], stopTrace(), True)
+
+        comparison_options = getBatchJobComparisonOptions(job)
+        key_columns = comparison_options['key_columns']
+        report_format = job.get("report_format", "Standard")
+        comparison_result = compareFiles(job['source'], job['target'], **comparison_options)
+        is_profile_mode = isProfileComparison(job['source'], job['target'], comparison_options['is_profile_mode'])
+        report_values = getReportValues(comparison_result, getDataFileName(job['source']), getDataFileName(job['target']), [] if is_profile_mode else key_columns, time.time() - start_time, report_format, getCurrentTrace())
+
+        # Move the report into the output directory
+        shutil.move(writeComparisonReport(report_values, report_format, artifacts_path), report_fpath)
+        report_summary = getReportSummary(report_values)
+        if(use_result_store):
+            putStoredResult(result_key, report_fpath, {**report_summary, 'message': comparison_result[-1], **artifact_metadata})
+
+        status = "failed" if report_values['total_errors'] > 0 else "passed"
+        return getBatchJobSummary(job, status, time.time() - start_time, report_summary, report_fpath, comparison_result[-1], stopTrace())
+    except Exception as error:
+        return getBatchJobSummary(job, "error", time.time() - start_time, message=f"{type(error).__name__}: {error}", trace=stopTrace())
+
+# Function to run one batch job in a worker process, sending its summary back through the connection
+def runBatchJobInProcess(job: dict, output_directory: str, artifacts_path: str, connection) -> None:
+    warnings.filterwarnings("ignore")
+    connection.send(runBatchJob(job, output_directory, artifacts_path))
+    connection.close()
+
+# Function to run the batch jobs in a pool of worker processes, largest jobs first, stopping the jobs running over their timeout
+def runBatchJobs(jobs: list, output_directory: str, workers_count: int = cfg.batch_workers_count, timeout_in_secs: float = cfg.batch_job_timeout_in_secs, artifacts_path: str = cfg.artifacts_path, memory_budget_mb: int = cfg.memory_budget_mb) -> list:
+    os.makedirs(output_directory, exist_ok=True)
+    pending_jobs = sorted(jobs, key=getBatchJobSize, reverse=True)
+    memory_estimates = {}
+    running_jobs = {}
+    job_summaries = []
+
+    # A data file that cannot be read fails its own job, the other jobs still run
+    for job in list(pending_jobs):
+        try:
+            memory_estimates[job['position']] = getBatchJobMemoryEstimate(job)
+        except Exception as error:
+            memory_estimates[job['position']] = 0
+            pending_jobs.remove(job)
+            job_summaries.append({**getBatchJobSummary(job, "error", message=f"{type(error).__name__}: {error}"), 'position': job['position']})
+
+    while(pending_jobs or running_jobs):
+        # Start the largest next jobs fitting in the memory budget left by the running jobs, a job over the whole budget runs alone
+        while(pending_jobs and len(running_jobs) < workers_count):
+            reserved_memory_in_bytes = sum(memory_estimates[job['position']] for process, job, start_time in running_jobs.values())
+            fitting_jobs = [job for job in pending_jobs if running_jobs == {} or reserved_memory_in_bytes + memory_estimates[job['position']] <= memory_budget_mb * 1024 * 1024]
+            if(fitting_jobs == []):
+                break
+            job = fitting_jobs[0]
+            pending_jobs.remove(job)
+            receive_connection, send_connection = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=runBatchJobInProcess, args=(job, output_directory, artifacts_path, send_connection))
+            process.start()
+            send_connection.close()
+            running_jobs[receive_connection] = (process, job, time.time())
+
+        # Wait for a job to finish or for the earliest timeout
+        wait_timeout = min(start_time + job.get("timeout_in_secs", timeout_in_secs) - time.time() for process, job, start_time in running_jobs.values())
+        for connection in multiprocessing.connection.wait(list(running_jobs), timeout=max(wait_timeout, 0)):
+            process, job, start_time = running_jobs.pop(connection)
+            try:
+                job_summary = connection.recv()
+            except EOFError:
+                job_summary = getBatchJobSummary(job, "error", time.time() - start_time, message=f"The job process exited with code {process.exitcode}.")
+            process.join()
+            connection.close()
+            job_summaries.append({**job_summary, 'position': job['position']})
+
+        # Stop the jobs running over their timeout
+        for connection, (process, job, start_time) in list(running_jobs.items()):
+            job_timeout_in_secs = job.get("timeout_in_secs", timeout_in_secs)
+            if(time.time() - start_time >= job_timeout_in_secs):
+                process.terminate()
+                process.join()
+                connection.close()
+                del running_jobs[connection]
+                job_summaries.append({**getBatchJobSummary(job, "timeout", time.time() - start_time, message=f"The job did not finish within {job_timeout_in_secs} seconds."), 'position': job['position']})
+
+    # Return the job summaries in the manifest order
+    return [{**{key: value for key, value in job_summary.items() if key != 'position'}, 'memory_estimate_in_mb': round(memory_estimates[job_summary['position']] / 1024 / 1024, 2)} for job_summary in sorted(job_summaries, key=lambda job_summary: job_summary['position'])]
+
+# Function to write the batch summary into a "json" file, returns the batch summary
+def writeBatchSummary(job_summaries: list, summary_fpath: str, started_at: str) -> dict:
+    batch_summary = {
+        'started_at': started_at,
+        'finished_at': getCurrentDayDateTimeAsString(),
+        'total_jobs': len(job_summaries),
+        'passed_jobs': sum(job_summary['status'] == "passed" for job_summary in job_summaries),
+        'failed_jobs': sum(job_summary['status'] == "failed" for job_summary in job_summaries),
+        'error_jobs': sum(job_summary['status'] == "error" for job_summary in job_summaries),
+        'timeout_jobs': sum(job_summary['status'] == "timeout" for job_summary in job_summaries),
+        'jobs': job_summaries
+    }
+    with open(summary_fpath, 'w', encoding='utf-8') as summary_file:
+        json.dump(batch_summary, summary_file, indent=4)
+    return batch_summary
+
+# Main function
+def main(arguments: list = None) -> int:
+    argument_parser = argparse.ArgumentParser(prog="python -m validata_package.batch_ops", description="Validate many source/target file pairs of a manifest and write their reports and a json summary.")
+    argument_parser.add_argument("manifest", help="json manifest of the jobs : a list of jobs or an object with \"defaults\" and \"jobs\"")
+    argument_parser.add_argument("-o", "--output-directory", default="validata_reports", help="directory of the html reports and the json summary")
+    argument_parser.add_argument("-w", "--workers", type=int, default=cfg.batch_workers_count, help="count of jobs run at the same time")
+    argument_parser.add_argument("-t", "--timeout", type=float, default=cfg.batch_job_timeout_in_secs, help="default timeout of a job in seconds")
+    argument_parser.add_argument("--artifacts-path", default=cfg.artifacts_path, help="directory of the report templates")
+    argument_parser.add_argument("-m", "--memory-budget", type=int, default=cfg.memory_budget_mb, help="memory budget in MB of the jobs running at the same time")
+    parsed_arguments = argument_parser.parse_args(arguments)
+
+    # Ignore warnings
+    warnings.filterwarnings("ignore")
+
+    started_at = getCurrentDayDateTimeAsString()
+    job_summaries = runBatchJobs(readBatchManifest(parsed_arguments.manifest), parsed_arguments.output_directory, parsed_arguments.workers, parsed_arguments.timeout, parsed_arguments.artifacts_path, parsed_arguments.memory_budget)
+    batch_summary = writeBatchSummary(job_summaries, os.path.join(parsed_arguments.output_directory, cfg.batch_summary_file_name), started_at)
+    print(f"{batch_summary['passed_jobs']} passed, {batch_summary['failed_jobs']} failed, {batch_summary['error_jobs']} error(s), {batch_summary['timeout_jobs']} timeout(s) of {batch_summary['total_jobs']} job(s)")
+
+    # Exit code is zero only when every job passed
+    return 0 if batch_summary['passed_jobs'] == batch_summary['total_jobs'] else 1
+
+# Main handler
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+# Import packages and modules | External
+import os
+import sys
+import json
+import argparse
+import tempfile
+import warnings
+import numpy as np
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.validation_ops import readDataFrameFromCSV
+from validata_package.engine_ops import compareDataSets, getReportValues, writeComparisonReport
+from validata_package.trace_ops import startTrace, stopTrace, traceStage
+
+# Function returns the generated values of a column of the given data type
+def generateColumnValues(random_generator: np.random.Generator, dtype: str, rows_count: int) -> np.ndarray:
+    if(dtype == "int"):
+        return random_generator.integers(0, 1000000, rows_count)
+    elif(dtype == "float"):
+        return random_generator.random(rows_count).round(4)
+    elif(dtype == "string"):
+        return np.array([f"value_{number}" for number in range(100000)], dtype=object)[random_generator.integers(0, 100000, rows_count)]
+    elif(dtype == "category"):
+        return np.array(["North", "South", "East", "West", "Central"], dtype=object)[random_generator.integers(0, 5, rows_count)]
+    raise ValueError(f"Unknown benchmark column data type '{dtype}'.")
+
+# Function to generate a source and target dataframe pair with an "id" key column and the given rates of differences
+def generateDataFramePair(rows_count: int, columns_count: int = 10, dtypes: list = ["int", "float", "string", "category"], mismatch_rate: float = 0.01, duplicate_key_rate: float = 0.0, source_only_rate: float = 0.001, target_only_rate: float = 0.001, seed: int = 0) -> tuple:
+    random_generator = np.random.default_rng(seed)
+
+    # Source records, duplicate keys repeat the key of another row
+    key_values = np.arange(rows_count)
+    duplicate_positions = random_generator.random(rows_count) < duplicate_key_rate
+    key_values[duplicate_positions] = random_generator.integers(0, rows_count, int(duplicate_positions.sum()))
+    source_df = pd.DataFrame({'id': key_values})
+    for position in range(columns_count - 1):
+        source_df[f"column_{position + 1}"] = generateColumnValues(random_generator, dtypes[position % len(dtypes)], rows_count)
+
+    # Target records, a random column of the mismatched rows gets a new value
+    target_df = source_df.copy()
+    mismatch_positions = np.flatnonzero(random_generator.random(rows_count) < mismatch_rate)
+    mismatch_columns = random_generator.integers(1, columns_count, len(mismatch_positions)) if columns_count > 1 else np.array([], dtype=int)
+    for column_position in np.unique(mismatch_columns):
+        row_positions = mismatch_positions[mismatch_columns == column_position]
+        target_df.iloc[row_positions, column_position] = generateColumnValues(random_generator, dtypes[(column_position - 1) % len(dtypes)], len(row_positions))
+
+    # Records only in source are dropped from the target, records only in target get new keys
+    target_df = target_df[random_generator.random(rows_count) >= source_only_rate]
+    target_only_df = source_df.sample(n=int(rows_count * target_only_rate), random_state=seed).copy()
+    target_only_df['id'] = np.arange(rows_count, rows_count + len(target_only_df))
+    target_df = pd.concat([target_df, target_only_df], ignore_index=True)
+
+    return source_df, target_df
+
+# Function to write the report of a key column comparison, returns the size of the report file
+def renderBenchmarkReport(comparison_result: tuple, artifacts_path: str) -> int:
+    with traceStage("report values", len(comparison_result[0])):
+        report_values = getReportValues(comparison_result, "source.csv", "target.csv", ["id"], 0)
+    report_fpath = writeComparisonReport(report_values, "Standard", artifacts_path)
+    report_size = os.path.getsize(report_fpath)
+    os.remove(report_fpath)
+    return report_size
+
+# Function to run the validator pipeline on a "csv" file pair in a new trace, returns the trace with a span per stage : the comparison runs the engine with the configured comparison options and records its hash, merge and diff stages
+def traceBenchmarkPipeline(source_fpath: str, target_fpath: str, artifacts_path: str, duplicate_key_policy: str, trace_memory: bool = False) -> list:
+    startTrace(trace_memory)
+    try:
+        with traceStage("load") as span:
+            source_df, target_df = readDataFrameFromCSV(source_fpath), readDataFrameFromCSV(target_fpath)
+            span['rows'] = len(source_df) + len(target_df)
+        comparison_result = compareDataSets(source_df, target_df, ["id"], cfg.use_row_hash_comparison, cfg.parallel_workers_count, cfg.merkle_block_size, None, duplicate_key_policy)
+        renderBenchmarkReport(comparison_result, artifacts_path)
+    finally:
+        trace = stopTrace()
+    return trace
+
+# Function to run the benchmark of one scenario, returns the measurements of every stage
+def runBenchmarkScenario(rows_count: int, columns_count: int, dtypes: list, mismatch_rate: float, duplicate_key_rate: float, source_only_rate: float, target_only_rate: float, artifacts_path: str = cfg.artifacts_path, seed: int = 0, duplicate_key_policy: str = cfg.duplicate_key_policy, trace_memory: bool = False) -> dict:
+    source_df, target_df = generateDataFramePair(rows_count, columns_count, dtypes, mismatch_rate, duplicate_key_rate, source_only_rate, target_only_rate, seed)
+    with tempfile.TemporaryDirectory() as temp_directory:
+        source_fpath, target_fpath = os.path.join(temp_directory, "source.csv"), os.path.join(temp_directory, "target.csv")
+        source_df.to_csv(source_fpath, index=False)
+        target_df.to_csv(target_fpath, index=False)
+        del source_df, target_df
+
+        # Memory tracing slows down the Python-heavy stages, so the timed run traces no memory and the peak memory comes from a second untimed run
+        stage_measurements = {span['stage']: {'wall_time_in_secs': span['wall_time_in_secs'], 'cpu_time_in_secs': span['cpu_time_in_secs'], 'peak_memory_in_mb': None, 'rows': span['rows']} for span in traceBenchmarkPipeline(source_fpath, target_fpath, artifacts_path, duplicate_key_policy)}
+        if(trace_memory):
+            for span in traceBenchmarkPipeline(source_fpath, target_fpath, artifacts_path, duplicate_key_policy, trace_memory=True):
+                if(span['stage'] in stage_measurements):
+                    stage_measurements[span['stage']]['peak_memory_in_mb'] = span['peak_memory_in_mb']
+    return stage_measurements
+
+# Function returns the regressions of the benchmark results against the baseline results
+def getBenchmarkRegressions(benchmark_results: dict, baseline_results: dict, tolerance: float = cfg.benchmark_tolerance, min_time_in_secs: float = cfg.benchmark_min_time_in_secs) -> list:
+    regressions = []
+    for scenario, stage_measurements in benchmark_results.items():
+        for stage, measurement in stage_measurements.items():
+            baseline_measurement = baseline_results.get(scenario, {}).get(stage)
+            if(baseline_measurement is None):
+                continue
+            # Timings below the minimum time are too noisy to gate on
+            if(measurement['wall_time_in_secs'] > baseline_measurement['wall_time_in_secs'] * (1 + tolerance) and measurement['wall_time_in_secs'] >= min_time_in_secs):
+                regressions.append(f"{scenario} | {stage} : wall time {measurement['wall_time_in_secs']}s over the baseline {baseline_measurement['wall_time_in_secs']}s")
+            if(measurement['peak_memory_in_mb'] is None or baseline_measurement['peak_memory_in_mb'] is None):
+                continue
+            if(measurement['peak_memory_in_mb'] > baseline_measurement['peak_memory_in_mb'] * (1 + tolerance) and measurement['peak_memory_in_mb'] >= 1):
+                regressions.append(f"{scenario} | {stage} : peak memory {measurement['peak_memory_in_mb']}MB over the baseline {baseline_measurement['peak_memory_in_mb']}MB")
+    return regressions
+
+# Main function
+def main(arguments: list = None) -> int:
+    argument_parser = argparse.ArgumentParser(prog="python -m validata_package.benchmark_ops", description="Benchmark the validator pipeline on generated source/target pairs and gate on the stored baseline.")
+    argument_parser.add_argument("-r", "--rows", type=int, nargs="+", default=[10000, 100000], help="row counts of the scenarios, e.g. 10000 1000000 50000000")
+    argument_parser.add_argument("-c", "--columns", type=int, default=10, help="count of columns, including the \"id\" key column")
+    argument_parser.add_argument("--dtypes", default="int,float,string,category", help="data types of the value columns, repeated across the columns")
+    argument_parser.add_argument("--mismatch-rate", type=float, default=0.01, help="rate of target rows with a changed value")
+    argument_parser.add_argument("--duplicate-key-rate", type=float, default=0.0, help="rate of rows repeating the key of another row")
+    argument_parser.add_argument("--source-only-rate", type=float, default=0.001, help="rate of rows missing in the target")
+    argument_parser.add_argument("--target-only-rate", type=float, default=0.001, help="rate of rows added to the target")
+    argument_parser.add_argument("--duplicate-key-policy", default=cfg.duplicate_key_policy, choices=["occurrence", "deduplicate", "allow", "refuse"], help="handling of the records sharing a key")
+    argument_parser.add_argument("--trace-memory", action="store_true", help="measure the peak traced memory of every stage in a second untimed run")
+    argument_parser.add_argument("--seed", type=int, default=0, help="seed of the data generator")
+    argument_parser.add_argument("--artifacts-path", default=cfg.artifacts_path, help="directory of the report templates")
+    argument_parser.add_argument("-o", "--output", help="json file to write the benchmark results into")
+    argument_parser.add_argument("-b", "--baseline", help="json file of the baseline results to gate on")
+    argument_parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline instead of gating on it")
+    argument_parser.add_argument("--tolerance", type=float, default=cfg.benchmark_tolerance, help="allowed slow down or memory growth over the baseline, e.g. 0.25")
+    parsed_arguments = argument_parser.parse_args(arguments)
+
+    # Ignore warnings
+    warnings.filterwarnings("ignore")
+
+    dtypes = parsed_arguments.dtypes.split(",")
+    benchmark_results = {}
+    for rows_count in parsed_arguments.rows:
+        scenario = f"rows_{rows_count}_columns_{parsed_arguments.columns}_{'_'.join(dtypes)}_mismatch_{parsed_arguments.mismatch_rate}_duplicates_{parsed_arguments.duplicate_key_rate}_{parsed_arguments.duplicate_key_policy}"
+        benchmark_results[scenario] = runBenchmarkScenario(rows_count, parsed_arguments.columns, dtypes, parsed_arguments.mismatch_rate, parsed_arguments.duplicate_key_rate, parsed_arguments.source_only_rate, parsed_arguments.target_only_rate, parsed_arguments.artifacts_path, parsed_arguments.seed, parsed_arguments.duplicate_key_policy, parsed_arguments.trace_memory)
+        for stage, measurement in benchmark_results[scenario].items():
+            peak_memory = f"{measurement['peak_memory_in_mb']:>9.2f}MB" if measurement['peak_memory_in_mb'] is not None else f"{'-':>9}  "
+            print(f"{scenario} | {stage:<27} | {measurement['wall_time_in_secs']:>9.3f}s wall | {measurement['cpu_time_in_secs']:>9.3f}s cpu | {peak_memory} peak | {measurement['rows'] if measurement['rows'] is not None else '-'} rows")
+
+    if(parsed_arguments.output is not None):
+        with open(parsed_arguments.output, 'w', encoding='utf-8') as output_file:
+            json.dump(benchmark_results, output_file, indent=4)
+
+    if(parsed_arguments.baseline is None):
+        return 0
+    elif(parsed_arguments.save_baseline or not os.path.exists(parsed_arguments.baseline)):
+        # Scenarios of the earlier baseline runs are kept
+        baseline_results = {}
+        if(os.path.exists(parsed_arguments.baseline)):
+            with open(parsed_arguments.baseline, 'r', encoding='utf-8') as baseline_file:
+                baseline_results = json.load(baseline_file)
+        with open(parsed_arguments.baseline, 'w', encoding='utf-8') as baseline_file:
+            json.dump({**baseline_results, **benchmark_results}, baseline_file, indent=4)
+        print(f"Baseline saved into {parsed_arguments.baseline}")
+        return 0
+
+    with open(parsed_arguments.baseline, 'r', encoding='utf-8') as baseline_file:
+        regressions = getBenchmarkRegressions(benchmark_results, json.load(baseline_file), parsed_arguments.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions != [] else 0
+
+# Main handler
+if __name__ == '__main__':
+    sys.exit(main())
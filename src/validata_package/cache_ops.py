@@ -0,0 +1,83 @@
+# Import packages and modules | External
+import sys
+import json
+import hashlib
+import threading
+import pandas as pd
+from collections import OrderedDict
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+
+# Cache state, shared across the sessions of the server process
+cache_lock = threading.Lock()
+cache_entries = OrderedDict()
+cache_size_in_bytes = 0
+
+# Function returns the SHA-256 digest of the file contents (uploaded file, bytes or file path)
+def getFileDigest(file) -> str:
+    if(isinstance(file, (bytes, bytearray))):
+        return hashlib.sha256(file).hexdigest()
+    if(hasattr(file, "getvalue")):
+        return hashlib.sha256(file.getvalue()).hexdigest()
+    file_hash = hashlib.sha256()
+    with open(file, 'rb') as file_object:
+        for block in iter(lambda: file_object.read(1024 * 1024), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+# Function returns the cache key of the given digests and options
+def getCacheKey(*key_parts) -> str:
+    return hashlib.sha256(json.dumps(key_parts, sort_keys=True, default=str).encode()).hexdigest()
+
+# Function returns the approximate memory size of the cached value
+def getObjectSize(value) -> int:
+    if(isinstance(value, pd.DataFrame)):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if(isinstance(value, pd.Series)):
+        return int(value.memory_usage(index=True, deep=True))
+    if(isinstance(value, (tuple, list))):
+        return sys.getsizeof(value) + sum(getObjectSize(item) for item in value)
+    if(isinstance(value, dict)):
+        return sys.getsizeof(value) + sum(getObjectSize(item) for item in value.values())
+    return sys.getsizeof(value)
+
+# Function returns the cached value of the key, None when not cached
+def getCachedValue(cache_key: str):
+    with cache_lock:
+        if(cache_key not in cache_entries):
+            return None
+        cache_entries.move_to_end(cache_key)
+        return cache_entries[cache_key][0]
+
+# Function to add the value to the cache, evicting the least recently used values above the memory cap
+def putCachedValue(cache_key: str, value, max_size_in_mb: int = cfg.cache_max_memory_mb) -> bool:
+    global cache_size_in_bytes
+    value_size = getObjectSize(value)
+    max_size_in_bytes = max_size_in_mb * 1024 * 1024
+    if(value_size > max_size_in_bytes):
+        return False
+
+    with cache_lock:
+        if(cache_key in cache_entries):
+            cache_size_in_bytes -= cache_entries.pop(cache_key)[1]
+        while(cache_entries and cache_size_in_bytes + value_size > max_size_in_bytes):
+            cache_size_in_bytes -= cache_entries.popitem(last=False)[1][1]
+        cache_entries[cache_key] = (value, value_size)
+        cache_size_in_bytes += value_size
+    return True
+
+# Function returns the cached value of the key, computing and caching it on a miss
+def getOrComputeCachedValue(cache_key: str, compute_function, *args, **kwargs):
+    value = getCachedValue(cache_key)
+    if(value is None):
+        value = compute_function(*args, **kwargs)
+        putCachedValue(cache_key, value)
+    return value
+
+# Function to remove all the cached values
+def clearCache() -> None:
+    global cache_size_in_bytes
+    with cache_lock:
+        cache_entries.clear()
+        cache_size_in_bytes = 0
@@ -0,0 +1,121 @@
+# Import packages and modules | External
+import os
+import time
+import sqlite3
+import threading
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+
+# Columns of the artifact catalog, one row per stored report
+artifact_columns = ['result_key', 'owner', 'created_at', 'last_used_at', 'source_file', 'target_file', 'source_digest', 'target_digest', 'report_format', 'status', 'total_errors', 'size_in_bytes', 'report_path']
+
+# Catalog state, the tables are created once per catalog file in the server process
+catalog_lock = threading.Lock()
+created_catalogs = set()
+
+# Function returns the file path of the artifact catalog of the result store
+def getCatalogFilePath(store_path: str = cfg.result_store_path) -> str:
+    return os.path.join(store_path, cfg.artifact_catalog_file_name)
+
+# Function returns a connection to the artifact catalog of the result store, creating its table and indexes on first use
+def getCatalogConnection(store_path: str = cfg.result_store_path) -> sqlite3.Connection:
+    catalog_fpath = getCatalogFilePath(store_path)
+    os.makedirs(store_path, exist_ok=True)
+    connection = sqlite3.connect(catalog_fpath, timeout=30)
+    connection.row_factory = sqlite3.Row
+    with catalog_lock:
+        if(catalog_fpath not in created_catalogs):
+            # The write-ahead log lets the page sessions and batch processes read while one of them writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""CREATE TABLE IF NOT EXISTS artifacts (
+                result_key TEXT PRIMARY KEY, owner TEXT NOT NULL, created_at REAL NOT NULL, last_used_at REAL NOT NULL,
+                source_file TEXT, target_file TEXT, source_digest TEXT, target_digest TEXT, report_format TEXT,
+                status TEXT, total_errors INTEGER, size_in_bytes INTEGER NOT NULL, report_path TEXT NOT NULL)""")
+            connection.execute("CREATE INDEX IF NOT EXISTS artifacts_by_owner ON artifacts (owner, created_at DESC)")
+            connection.execute("CREATE INDEX IF NOT EXISTS artifacts_by_created_at ON artifacts (created_at DESC)")
+            connection.execute("CREATE INDEX IF NOT EXISTS artifacts_by_last_used_at ON artifacts (last_used_at)")
+            connection.commit()
+            created_catalogs.add(catalog_fpath)
+    return connection
+
+# Function returns the catalog row of a stored report, from its result key, report file and summary
+def getArtifactRecord(result_key: str, report_path: str, size_in_bytes: int, summary: dict, created_at: float = None) -> dict:
+    created_at = time.time() if created_at is None else created_at
+    return {
+        'result_key': result_key,
+        'owner': summary.get('owner') or cfg.anonymous_user_name,
+        'created_at': created_at,
+        'last_used_at': created_at,
+        'source_file': summary.get('source_file'),
+        'target_file': summary.get('target_file'),
+        'source_digest': summary.get('source_digest'),
+        'target_digest': summary.get('target_digest'),
+        'report_format': summary.get('report_format'),
+        'status': "failed" if summary.get('total_errors', 0) > 0 else "passed",
+        'total_errors': summary.get('total_errors'),
+        'size_in_bytes': size_in_bytes,
+        'report_path': report_path
+    }
+
+# Function to add or replace the catalog rows of stored reports
+def addArtifacts(artifact_records: list, store_path: str = cfg.result_store_path) -> None:
+    with getCatalogConnection(store_path) as connection:
+        connection.executemany(f"INSERT OR REPLACE INTO artifacts ({', '.join(artifact_columns)}) VALUES ({', '.join(['?'] * len(artifact_columns))})", [[artifact_record[column] for column in artifact_columns] for artifact_record in artifact_records])
+    connection.close()
+
+# Function to mark a stored report as recently used
+def touchArtifact(result_key: str, store_path: str = cfg.result_store_path) -> None:
+    with getCatalogConnection(store_path) as connection:
+        connection.execute("UPDATE artifacts SET last_used_at = ? WHERE result_key = ?", (time.time(), result_key))
+    connection.close()
+
+# Function to remove the catalog row of an evicted report
+def removeArtifact(result_key: str, store_path: str = cfg.result_store_path) -> None:
+    with getCatalogConnection(store_path) as connection:
+        connection.execute("DELETE FROM artifacts WHERE result_key = ?", (result_key,))
+    connection.close()
+
+# Function returns the filter clause and parameters of the catalog queries, the administrators see the reports of every owner
+def getArtifactsFilter(owner: str = None, status: str = None, search_text: str = None) -> tuple:
+    conditions, parameters = [], []
+    if(owner is not None and owner not in cfg.catalog_admin_users):
+        conditions.append("owner = ?")
+        parameters.append(owner)
+    if(status is not None):
+        conditions.append("status = ?")
+        parameters.append(status)
+    if(search_text):
+        conditions.append("(source_file LIKE ? OR target_file LIKE ?)")
+        parameters.extend([f"%{search_text}%"] * 2)
+    return (" WHERE " + " AND ".join(conditions)) if conditions != [] else "", parameters
+
+# Function returns a page of the stored reports, newest first, filtered by owner, status and file name
+def getArtifacts(owner: str = None, status: str = None, search_text: str = None, page: int = 0, page_size: int = cfg.catalog_page_size, store_path: str = cfg.result_store_path) -> list:
+    filter_clause, parameters = getArtifactsFilter(owner, status, search_text)
+    connection = getCatalogConnection(store_path)
+    artifact_rows = connection.execute(f"SELECT * FROM artifacts{filter_clause} ORDER BY created_at DESC LIMIT ? OFFSET ?", parameters + [page_size, page * page_size]).fetchall()
+    connection.close()
+    return [dict(artifact_row) for artifact_row in artifact_rows]
+
+# Function returns the count of the stored reports, filtered as in "getArtifacts"
+def getArtifactsCount(owner: str = None, status: str = None, search_text: str = None, store_path: str = cfg.result_store_path) -> int:
+    filter_clause, parameters = getArtifactsFilter(owner, status, search_text)
+    connection = getCatalogConnection(store_path)
+    artifacts_count = connection.execute(f"SELECT COUNT(*) FROM artifacts{filter_clause}", parameters).fetchone()[0]
+    connection.close()
+    return artifacts_count
+
+# Function returns the total size in bytes of the stored reports
+def getArtifactsSize(store_path: str = cfg.result_store_path) -> int:
+    connection = getCatalogConnection(store_path)
+    artifacts_size = connection.execute("SELECT COALESCE(SUM(size_in_bytes), 0) FROM artifacts").fetchone()[0]
+    connection.close()
+    return artifacts_size
+
+# Function returns the result key, size and report path of the stored reports, least recently used first
+def getLeastRecentlyUsedArtifacts(limit: int, store_path: str = cfg.result_store_path) -> list:
+    connection = getCatalogConnection(store_path)
+    artifact_rows = connection.execute("SELECT result_key, size_in_bytes, report_path FROM artifacts ORDER BY last_used_at LIMIT ?", (limit,)).fetchall()
+    connection.close()
+    return [tuple(artifact_row) for artifact_row in artifact_rows]
@@ -0,0 +1,111 @@
+# Import packages and modules | External
+import numpy as np
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package.validation_ops import compareDataFrames
+from validata_package.trace_ops import traceStage
+
+# Function to highlight the mismatch values of a column, leaves the empty and "Source"/"Target" cells as is
+def highlightMismatchCells(cells: pd.Series) -> pd.Series:
+    is_empty = cells.isna() & ~(cells.values == None) if(cells.dtype == object) else cells.isna()
+    is_highlighted = ~is_empty & ~cells.isin(["nan", "Source", "Target"])
+    if(not is_highlighted.any()):
+        return cells.infer_objects()
+    return cells.astype(object).where(~is_highlighted, ":red" + cells[is_highlighted].astype(str))
+
+# Function to add the "Data Origin" and "Index" columns at the first positions
+def addOriginAndIndexColumns(dataframe: pd.DataFrame, data_origin: str) -> pd.DataFrame:
+    dataframe.insert(0, 'Data Origin', data_origin)
+    dataframe = dataframe.reset_index()
+    dataframe = dataframe.rename(columns={"index":"Index"})
+    dataframe['Index'] = dataframe.index + 1
+    return dataframe
+
+# Function to compare the aligned source and target records, returns the differences and count of rows with differences
+def compareAlignedRecords(source_records_df: pd.DataFrame, target_records_df: pd.DataFrame, drop_equal_rows: bool = False) -> tuple:
+    # Compute the mismatch mask once
+    with traceStage("compare", 2 * len(source_records_df)):
+        is_equal_df = ((source_records_df == target_records_df) | (source_records_df.isna() & target_records_df.isna())).fillna(False).astype(bool)
+
+    # Count of source & target rows with mismatches
+    difference_count = 2 * int((~is_equal_df.drop(columns=['Data Origin', 'Index'])).any(axis=1).sum())
+
+    # Interleave the source and target rows : All values
+    records_count = len(source_records_df)
+    interleaved_positions = np.arange(2 * records_count).reshape(2, records_count).T.ravel()
+    interleaved_index = pd.MultiIndex.from_arrays([np.repeat(source_records_df.index.values, 2), np.tile(["Source", "Target"], records_count)])
+    equal_and_mismatch_records_df = pd.concat([source_records_df, target_records_df]).iloc[interleaved_positions].set_axis(interleaved_index)
+    is_equal_df = pd.concat([is_equal_df, is_equal_df]).iloc[interleaved_positions].set_axis(interleaved_index)
+
+    # Mismatched values
+    only_mismatch_records_df = equal_and_mismatch_records_df.where(~is_equal_df)
+    if(drop_equal_rows):
+        only_mismatch_records_df['Data Origin'] = np.nan
+        only_mismatch_records_df = only_mismatch_records_df.dropna(axis = 0, how = 'all')
+
+    # Highlight the mismatched values and fill the equal values
+    with traceStage("highlight", len(only_mismatch_records_df)):
+        only_mismatch_records_df = only_mismatch_records_df.apply(highlightMismatchCells)
+        differences_df = only_mismatch_records_df.fillna(equal_and_mismatch_records_df)
+
+    # Restore the integer column types widened to float by the masking, e.g. the compact integer types
+    differences_df = differences_df.astype({column: dtype for column, dtype in equal_and_mismatch_records_df.dtypes.items() if pd.api.types.is_integer_dtype(dtype) and pd.api.types.is_float_dtype(differences_df[column].dtype)})
+
+    return differences_df, difference_count
+
+# Function to analyze the merge result of the no key column process, returns the differences and count of rows with differences
+def analyzeValidationResultWithoutKeys(validation_result_df: pd.DataFrame) -> tuple:
+    # Seggregate the valdiation result dataframe
+    source_non_matched_records_df = validation_result_df[validation_result_df['_merge'] == 'left_only']
+    target_non_matched_records_df = validation_result_df[validation_result_df['_merge'] == 'right_only']
+
+    # Drop indicator column from data sets
+    source_non_matched_records_df = source_non_matched_records_df.drop(columns=['_merge'])
+    target_non_matched_records_df = target_non_matched_records_df.drop(columns=['_merge'])
+
+    # Sort data records to start comparision
+    with traceStage("sort", len(source_non_matched_records_df) + len(target_non_matched_records_df)):
+        source_non_matched_records_df = source_non_matched_records_df.sort_values(by=source_non_matched_records_df.columns.tolist()).reset_index(drop=True)
+        target_non_matched_records_df = target_non_matched_records_df.sort_values(by=target_non_matched_records_df.columns.tolist()).reset_index(drop=True)
+
+    # Adding an index column with values "Source" and "Target" at the first position
+    source_non_matched_records_df = addOriginAndIndexColumns(source_non_matched_records_df, 'Source')
+    target_non_matched_records_df = addOriginAndIndexColumns(target_non_matched_records_df, 'Target')
+
+    # Compare non matched records
+    return compareAlignedRecords(source_non_matched_records_df, target_non_matched_records_df)
+
+# Function to keep the source or target side of the merged value columns under their original names
+def selectMergedColumns(dataframe: pd.DataFrame, key_columns: list, suffix: str) -> pd.DataFrame:
+    selected_columns = [column for column in dataframe.columns if column in key_columns or column.endswith(suffix) or not (column.endswith("_source") or column.endswith("_target"))]
+    return dataframe[selected_columns].rename(columns={column: str(column)[:-7] for column in selected_columns if column not in key_columns and column.endswith(suffix)})
+
+# Function to analyze the merge result of the key column process, returns the differences, records only in source/target, count of rows with differences and count of key matched rows
+def analyzeValidationResultWithKeys(validation_result_df: pd.DataFrame, key_columns: list) -> tuple:
+    # Seggregate the valdiation result dataframe
+    key_matched_records_df = validation_result_df[validation_result_df['_merge'] == 'both']
+    source_only_records_df = validation_result_df[validation_result_df['_merge'] == 'left_only']
+    target_only_records_df = validation_result_df[validation_result_df['_merge'] == 'right_only']
+
+    # Drop indicator and dulpicate columns from data sets, every merged row pairs the source and target records of a key
+    key_matched_records_df = key_matched_records_df.drop(columns=['_merge']).reset_index(drop=True)
+    key_matched_source_records_df = selectMergedColumns(key_matched_records_df, key_columns, "_source")
+    key_matched_target_records_df = selectMergedColumns(key_matched_records_df, key_columns, "_target")[key_matched_source_records_df.columns]
+    source_only_records_df = selectMergedColumns(source_only_records_df.drop(columns=['_merge']), key_columns, "_source")
+    target_only_records_df = selectMergedColumns(target_only_records_df.drop(columns=['_merge']), key_columns, "_target")
+
+    # Adding an index column with values "Source" and "Target" at the first position
+    key_matched_source_records_df = addOriginAndIndexColumns(key_matched_source_records_df, 'Source')
+    key_matched_target_records_df = addOriginAndIndexColumns(key_matched_target_records_df, 'Target')
+
+    # Compare key matched records
+    differences_df, difference_count = compareAlignedRecords(key_matched_source_records_df, key_matched_target_records_df, drop_equal_rows=True)
+
+    return differences_df, source_only_records_df, target_only_records_df, difference_count, len(key_matched_source_records_df)
+
+# Function to compare two dataframes by key columns
+def compareDataFramesByKeys(dataframe1: pd.DataFrame, dataframe2: pd.DataFrame, key_columns: list) -> tuple:
+    with traceStage("merge", len(dataframe1) + len(dataframe2)):
+        validation_result_df = compareDataFrames(dataframe1, dataframe2, key_columns)
+    return analyzeValidationResultWithKeys(validation_result_df, key_columns)
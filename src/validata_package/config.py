@@ -1,8 +1,100 @@
+# Import packages and modules | External
+import os
+import tempfile
+
 # Application properties
 app_version = "v1.0.0"
 maintainance_message = ""
 #"General maintainance - from 2023-08-14 20:00 IST. to 2023-08-15 20:00 IST. Application will not be available during the given time window."
 
 # Report properties
-artifacts_path = "C:/Users/yvsra/OneDrive/Desktop/GitHub Repos/test_Data_Validation_Tool/src/artifacts/"
-raw_report_file_name = "src_html_report.html"
\ No newline at end of file
+artifacts_path = os.environ.get("VALIDATA_ARTIFACTS_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts"))
+raw_report_file_name = "src_html_report.html"
+virtual_report_file_name = "src_virtual_report.html"
+report_chunk_rows = 10000
+
+# Comparison properties
+stream_chunk_size = 100000
+parallel_workers_count = 1
+parallel_start_method = "spawn"
+use_row_hash_comparison = True
+merkle_block_size = 10000
+
+# Cache properties
+cache_max_memory_mb = 2048
+
+# File reader properties
+excel_engine = "auto" # -> "auto" or "calamine" or "openpyxl"
+convert_excel_to_parquet = False
+parquet_cache_path = os.path.join(tempfile.gettempdir(), "validata_parquet_cache")
+use_compact_types = False
+compact_categorical_ratio = 0.1
+
+# Batch runner properties
+batch_workers_count = 4
+batch_job_timeout_in_secs = 3600
+batch_summary_file_name = "summary.json"
+
+# Benchmark properties
+benchmark_tolerance = 0.25
+benchmark_min_time_in_secs = 0.1
+
+# Trace properties
+trace_memory = False
+
+# Normalization properties
+normalize_trim = False
+normalize_case_fold = False
+normalize_blank_to_null = True
+normalize_round_decimals = None
+normalize_dates = False
+normalize_dates_dayfirst = False
+normalize_dates_sample_rows = 1000
+normalize_dates_min_ratio = 0.5
+
+# Duplicate key properties
+duplicate_key_policy = "occurrence" # -> "occurrence" or "deduplicate" or "allow" or "refuse"
+max_merge_rows_ratio = 10
+
+# Memory budget properties
+memory_budget_mb = 8192
+memory_wait_timeout_in_secs = 600
+memory_sample_rows = 10000
+
+# Out-of-core comparison properties
+use_out_of_core_comparison = False
+partition_memory_mb = 256
+partition_row_group_size = 100000
+partition_temp_path = os.path.join(tempfile.gettempdir(), "validata_partitions")
+
+# Background job properties
+job_workers_count = 2
+job_history_size = 100
+job_retention_in_secs = 86400
+job_poll_interval_in_secs = 1
+
+# Progressive result properties
+partial_result_sample_size = 20
+
+# Result store properties
+use_result_store = True
+result_store_path = os.path.join(artifacts_path, "results")
+result_store_max_disk_mb = 4096
+
+# Artifact catalog properties
+artifact_catalog_file_name = "catalog.sqlite3"
+catalog_page_size = 50
+catalog_admin_users = ["VEN00375@TJX.COM"]
+anonymous_user_name = "anonymous"
+
+# Baseline snapshot properties
+use_baseline_snapshot = False
+snapshot_path = os.path.join(artifacts_path, "snapshots")
+snapshot_row_group_size = 100000
+
+# Column profile properties
+use_column_profile = False
+profile_hll_precision = 14
+profile_quantile_sketch_size = 4096
+profile_quantiles = [0.05, 0.25, 0.5, 0.75, 0.95]
+profile_sum_significant_digits = 12
\ No newline at end of file
@@ -0,0 +1,387 @@
+# Import packages and modules | External
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.validation_ops import getExcelEngine, readDataFrameFromCSV, readDataFrameFromExcel, readDataFrameFromParquet, readDataFrameFromExcelViaParquet, alignCompactColumnTypes, getDataFrameMerkleTree, getDifferingBlocks, getDifferingColumns, selectRowBlocks, compareDataFrames, compareDataFramesByRowHash, getDataFrameRowHashes, getNonMatchedRowHashes, getDuplicateKeyStatistics, applyDuplicateKeyPolicy, hasUniqueMergeKeys, key_occurrence_column, getCurrentDayDateTimeAsString
+from validata_package.streaming_ops import readDataFrameChunks, readDataFrameSample, compareSortedFiles
+from validata_package.partition_ops import comparePartitionedFiles
+from validata_package.comparison_ops import analyzeValidationResultWithoutKeys, analyzeValidationResultWithKeys
+from validata_package.parallel_ops import compareDataFramesByKeysInParallel, getKeyPartitions
+from validata_package.report_ops import writeReportFile
+from validata_package.cache_ops import getFileDigest
+from validata_package.memory_ops import getPartitionsCount, estimateFileLoadMemory, reserveMemory
+from validata_package.profile_ops import profileDataFrameChunks, compareColumnProfiles
+from validata_package.normalization_ops import normalizeDataFrame, resolveDateColumns
+from validata_package.trace_ops import traceStage, getTraceHtml
+from validata_package.snapshot_ops import row_hash_column, getBaselineSnapshotId, hasBaselineSnapshot, saveBaselineSnapshot, readBaselineSnapshotMetadata, readBaselineSnapshot, readBaselineSnapshotIndex, readBaselineSnapshotRows, getSnapshotComparisonError
+
+# Report formats and the table format of their data
+report_table_formats = {"Standard": "html", "Virtual": "json", "Virtual (compressed)": "gzip-base64"}
+
+# Duplicate key options and their policies
+duplicate_key_policies = {"Match by occurrence": "occurrence", "Keep first record": "deduplicate", "Allow many-to-many": "allow", "Refuse": "refuse"}
+
+# Function returns the file name of an uploaded file, file object or file path
+def getDataFileName(file) -> str:
+    return os.path.basename(file.name if hasattr(file, "name") else str(file))
+
+# Function to read a "csv", "xlsx" or "parquet" data file into dataframe
+def readDataFile(file, sheet_name = 0, columns: list = [], drop_columns: list = [], engine: str = cfg.excel_engine, excel_to_parquet: bool = cfg.convert_excel_to_parquet, compact_types: bool = cfg.use_compact_types, file_digest: str = None) -> pd.DataFrame:
+    file_name = getDataFileName(file)
+    with traceStage(f"load {file_name}") as span:
+        if(file_name.endswith(".csv")):
+            dataframe = readDataFrameFromCSV(file, None, columns, drop_columns, compact_types)
+        elif(file_name.endswith(".xlsx") and excel_to_parquet):
+            dataframe = readDataFrameFromExcelViaParquet(file, file_digest if file_digest is not None else getFileDigest(file), sheet_name, engine, cfg.parquet_cache_path, columns, drop_columns, compact_types)
+        elif(file_name.endswith(".xlsx")):
+            dataframe = readDataFrameFromExcel(file, sheet_name, engine, columns, drop_columns, compact_types)
+        elif(file_name.endswith(".parquet")):
+            dataframe = readDataFrameFromParquet(file, columns, drop_columns, compact_types)
+        else:
+            raise ValueError(f"The file type of '{file_name}' is not supported, please use a csv, xlsx or parquet file.")
+        span['rows'] = len(dataframe)
+    return dataframe
+
+# Function to read a data file within the server memory budget, the read waits in queue for the memory of the loaded data
+def readDataFileInMemoryBudget(file, sheet_name = 0, columns: list = [], drop_columns: list = [], engine: str = cfg.excel_engine, excel_to_parquet: bool = cfg.convert_excel_to_parquet, compact_types: bool = cfg.use_compact_types, file_digest: str = None) -> pd.DataFrame:
+    with reserveMemory(estimateFileLoadMemory(file)):
+        return readDataFile(file, sheet_name, columns, drop_columns, engine, excel_to_parquet, compact_types, file_digest)
+
+# Function returns True when two key sorted "csv" files can be compared in chunks
+def isStreamingComparison(source_file, target_file, key_columns: list, is_key_sorted: bool) -> bool:
+    return is_key_sorted and key_columns != [] and getDataFileName(source_file).endswith(".csv") and getDataFileName(target_file).endswith(".csv")
+
+# Function returns True when two "csv" or "parquet" files can be compared out of core, partitioned on disk
+def isPartitionedComparison(source_file, target_file, is_out_of_core: bool = cfg.use_out_of_core_comparison) -> bool:
+    return is_out_of_core and all(getDataFileName(file).endswith((".csv", ".parquet")) for file in [source_file, target_file])
+
+# Function returns True when the columns of two "csv" or "parquet" files can be compared by their statistics, profiled in one pass over each file
+def isProfileComparison(source_file, target_file, is_profile_mode: bool = cfg.use_column_profile) -> bool:
+    return is_profile_mode and all(getDataFileName(file).endswith((".csv", ".parquet")) for file in [source_file, target_file])
+
+# Function to read the first records of a "csv" or "parquet" data file, without reading the whole file
+def readDataFilePreview(file, rows_count: int = 5, columns: list = [], drop_columns: list = []) -> pd.DataFrame:
+    if(getDataFileName(file).endswith(".parquet")):
+        dataframe = next(readDataFrameChunks(file, rows_count, drop_columns, columns), pd.DataFrame()).head(rows_count)
+    else:
+        dataframe = readDataFrameFromCSV(file, rows_count, columns, drop_columns)
+    if(hasattr(file, "seek")):
+        file.seek(0)
+    return dataframe
+
+# Function returns the column names of a "csv", "xlsx" or "parquet" data file, without reading its records
+def readDataFileColumns(file, sheet_name = 0, engine: str = cfg.excel_engine) -> list:
+    # An uploaded file may have been read up to its end
+    if(hasattr(file, "seek")):
+        file.seek(0)
+    if(getDataFileName(file).endswith(".xlsx")):
+        columns = list(pd.read_excel(file, sheet_name=sheet_name, engine=getExcelEngine(engine), nrows=0).columns)
+        if(hasattr(file, "seek")):
+            file.seek(0)
+        return columns
+    return list(readDataFilePreview(file, 1).columns)
+
+# Function returns the error and hint messages when columns to be dropped or compared are in neither data file, None when every column is found
+def getUnknownColumnsError(file_columns: list, drop_columns: list, columns: list) -> tuple:
+    unknown_columns = [column for column in dict.fromkeys(drop_columns + columns) if column not in file_columns]
+    if(unknown_columns != []):
+        return f"The column(s) {', '.join(unknown_columns)} are not found in the source or target data, please check and try again.", "Hint: The column names are case sensitive and separated by commas, without spaces around the commas."
+    return None, None
+
+# Function returns the error and hint messages when the source and target data cannot be compared, None when they can
+def getComparisonError(source_data: pd.DataFrame, target_data: pd.DataFrame, key_columns: list, is_streaming_mode: bool = False) -> tuple:
+    if(source_data.shape != target_data.shape and key_columns==[]):
+        return "The dimensionality of the source and target data are not matching, please check and try again.", "Hint: By giving key column(s) input, this error can be avoided."
+    elif(len(source_data.columns) != len(target_data.columns)):
+        return "The count of columns from the source and target data are not matching, please check and try again.", None
+    elif(not is_streaming_mode and (source_data.dtypes != target_data.dtypes).any()):
+        return "The data type of columns from the source and target data are not matching, please check and try again.", None
+    return None, None
+
+# Function to compare two key sorted "csv" files in chunks, returns the differences, records only in source/target, count of differences, total source/target records, duplicate key statistics and the comparison message
+def compareDataFiles(source_file, target_file, key_columns: list, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = [], normalization_options: dict = None, duplicate_key_policy: str = cfg.duplicate_key_policy) -> tuple:
+    with traceStage("stream merge") as span:
+        validation_result_df, total_source_records, total_target_records, total_matched_records, duplicate_key_statistics = compareSortedFiles(source_file, target_file, key_columns, chunk_size, drop_columns, columns, normalization_options, duplicate_key_policy)
+        span['rows'] = total_source_records + total_target_records
+    merge_key_columns = key_columns + [key_occurrence_column] if key_occurrence_column in validation_result_df.columns else key_columns
+    with traceStage("diff", len(validation_result_df)):
+        differences_df, source_only_records_df, target_only_records_df, difference_count, key_matched_count = analyzeValidationResultWithKeys(validation_result_df, merge_key_columns)
+    return differences_df, source_only_records_df, target_only_records_df, difference_count, total_source_records, total_target_records, duplicate_key_statistics, None
+
+# Function to compare two "csv" or "parquet" files of any order and size out of core, returns the comparison result as in "compareDataFiles"
+def compareDataFilesInPartitions(source_file, target_file, key_columns: list, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = [], normalization_options: dict = None, duplicate_key_policy: str = cfg.duplicate_key_policy, is_row_hash_mode: bool = cfg.use_row_hash_comparison, partitions_count: int = None) -> tuple:
+    partitions_count = getPartitionsCount(source_file, target_file, key_columns, is_row_hash_mode) if partitions_count is None else partitions_count
+    os.makedirs(cfg.partition_temp_path, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=cfg.partition_temp_path) as partition_directory:
+        validation_result_df, total_source_records, total_target_records, total_matched_records, duplicate_key_statistics = comparePartitionedFiles(source_file, target_file, key_columns, partition_directory, partitions_count, chunk_size, drop_columns, columns, normalization_options, is_row_hash_mode, duplicate_key_policy)
+
+    # Without key columns, the unmatched rows are paired in order, so both files must have the same count of records
+    if(key_columns == [] and total_source_records != total_target_records):
+        raise ValueError("The dimensionality of the source and target data are not matching, please check and try again. Hint: By giving key column(s) input, this error can be avoided.")
+
+    with traceStage("diff", len(validation_result_df)):
+        if(key_columns == []):
+            differences_df, difference_count = analyzeValidationResultWithoutKeys(validation_result_df)
+            source_only_records_df, target_only_records_df = None, None
+        else:
+            merge_key_columns = key_columns + [key_occurrence_column] if key_occurrence_column in validation_result_df.columns else key_columns
+            differences_df, source_only_records_df, target_only_records_df, difference_count, key_matched_count = analyzeValidationResultWithKeys(validation_result_df, merge_key_columns)
+    return differences_df, source_only_records_df, target_only_records_df, difference_count, total_source_records, total_target_records, duplicate_key_statistics, f"Compared out of core in {partitions_count} disk partition(s)"
+
+# Function to compare the column statistics of two "csv" or "parquet" files, profiled in chunks in one pass over each file, returns the comparison result as in "compareDataFiles" with the differing statistics as differences
+def compareFileProfiles(source_file, target_file, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = [], normalization_options: dict = None) -> tuple:
+    normalization_options = resolveDateColumns(normalization_options, [readDataFrameSample(file, cfg.normalize_dates_sample_rows, drop_columns, columns) for file in [source_file, target_file]])
+    profile_dfs, records_counts = [], []
+    for file, data_origin in [(source_file, "Source"), (target_file, "Target")]:
+        with traceStage(f"profile {data_origin.lower()}") as span:
+            profile_df, records_count = profileDataFrameChunks(readDataFrameChunks(file, chunk_size, drop_columns, columns), normalization_options)
+            span['rows'] = records_count
+        profile_dfs.append(profile_df)
+        records_counts.append(records_count)
+    with traceStage("compare profiles", len(profile_dfs[0]) + len(profile_dfs[1])):
+        differences_df, difference_count = compareColumnProfiles(*profile_dfs)
+    return differences_df, None, None, difference_count, records_counts[0], records_counts[1], None, f"Compared the statistics of {len(set(profile_dfs[0]['Column']) | set(profile_dfs[1]['Column']))} column(s), {difference_count // 2} with differences"
+
+# Function to compare two dataframes, returns the differences, records only in source/target, count of differences, total source/target records, duplicate key statistics and the comparison message
+def compareDataSets(source_data: pd.DataFrame, target_data: pd.DataFrame, key_columns: list, is_row_hash_mode: bool = cfg.use_row_hash_comparison, workers_count: int = cfg.parallel_workers_count, block_size: int = cfg.merkle_block_size, normalization_options: dict = None, duplicate_key_policy: str = cfg.duplicate_key_policy) -> tuple:
+    # Normalize both sides the same way before they are hashed and compared
+    with traceStage("normalize", len(source_data) + len(target_data)):
+        normalization_options = resolveDateColumns(normalization_options, [source_data, target_data])
+        source_data = normalizeDataFrame(source_data, normalization_options)
+        target_data = normalizeDataFrame(target_data, normalization_options)
+        if((source_data.dtypes != target_data.dtypes).any()):
+            source_data, target_data = alignCompactColumnTypes(source_data, target_data)
+
+    # Non unique keys would make the key merge a many-to-many product, they are counted and handled before any merge
+    total_source_records, total_target_records = len(source_data), len(target_data)
+    duplicate_key_statistics, merge_key_columns = None, key_columns
+    if(key_columns != []):
+        with traceStage("duplicate keys", total_source_records + total_target_records):
+            duplicate_key_statistics = getDuplicateKeyStatistics(source_data, target_data, key_columns)
+            source_data, target_data, merge_key_columns = applyDuplicateKeyPolicy(source_data, target_data, key_columns, duplicate_key_statistics, duplicate_key_policy)
+
+    # Fetch hash result
+    with traceStage("hash", len(source_data) + len(target_data)):
+        source_merkle_tree = getDataFrameMerkleTree(source_data, block_size)
+        target_merkle_tree = getDataFrameMerkleTree(target_data, block_size)
+        hash_result = source_merkle_tree['root'] == target_merkle_tree['root']
+
+    # Identical data skips the comparison, otherwise only the differing row blocks are compared; the rows of equal blocks are equal position by position, so they only match each other when the merge keys are unique
+    source_compare_data, target_compare_data = source_data, target_data
+    comparison_message = None
+    with traceStage("localize differences") as span:
+        differing_blocks = [] if hash_result else getDifferingBlocks(source_merkle_tree, target_merkle_tree)
+        is_localizable = hasUniqueMergeKeys(duplicate_key_statistics, duplicate_key_policy) if key_columns != [] else is_row_hash_mode
+        if(hash_result or (differing_blocks != [] and is_localizable)):
+            source_compare_data = selectRowBlocks(source_data, differing_blocks, block_size)
+            target_compare_data = selectRowBlocks(target_data, differing_blocks, block_size)
+            # The column digests of a row block only tell the differing columns when both sides hold the same keys at the same positions
+            if(differing_blocks != [] and key_columns != [] and source_compare_data[merge_key_columns].reset_index(drop=True).equals(target_compare_data[merge_key_columns].reset_index(drop=True))):
+                differing_columns = getDifferingColumns(getDataFrameMerkleTree(source_compare_data, block_size, by_column=True), getDataFrameMerkleTree(target_compare_data, block_size, by_column=True))
+                comparison_message = f"{len(differing_blocks)} of {len(source_merkle_tree['levels'][0])} row block(s) differ, in column(s): {', '.join(map(str, differing_columns))}"
+        span['rows'] = len(source_compare_data) + len(target_compare_data)
+
+    if(key_columns==[]):
+        with traceStage("merge", len(source_compare_data) + len(target_compare_data)):
+            if(is_row_hash_mode):
+                validation_result_df = compareDataFramesByRowHash(source_compare_data, target_compare_data)
+            else:
+                validation_result_df = compareDataFrames(source_compare_data, target_compare_data, list(source_data.columns))
+        with traceStage("diff", len(validation_result_df)):
+            differences_df, difference_count = analyzeValidationResultWithoutKeys(validation_result_df)
+        source_only_records_df, target_only_records_df = None, None
+    else:
+        with traceStage("compare by keys", len(source_compare_data) + len(target_compare_data)):
+            differences_df, source_only_records_df, target_only_records_df, difference_count, key_matched_count = compareDataFramesByKeysInParallel(source_compare_data, target_compare_data, merge_key_columns, workers_count)
+
+    # Return results
+    return differences_df, source_only_records_df, target_only_records_df, difference_count, total_source_records, total_target_records, duplicate_key_statistics, comparison_message
+
+# Function to compare the target data with a baseline snapshot of the source data, returns the comparison result as in "compareDataSets"
+def compareWithBaselineSnapshot(snapshot_id: str, target_data: pd.DataFrame, key_columns: list, is_row_hash_mode: bool = cfg.use_row_hash_comparison, workers_count: int = cfg.parallel_workers_count, normalization_options: dict = None, duplicate_key_policy: str = cfg.duplicate_key_policy, snapshot_path: str = cfg.snapshot_path) -> tuple:
+    snapshot_metadata = readBaselineSnapshotMetadata(snapshot_id, snapshot_path)
+    with traceStage("normalize", len(target_data)):
+        # The dates of the target data are canonicalized in the date columns of the snapshot
+        if('date_columns' in snapshot_metadata):
+            normalization_options = {**resolveDateColumns(normalization_options, []), 'date_columns': snapshot_metadata['date_columns']}
+        target_data = normalizeDataFrame(target_data, normalization_options).reset_index(drop=True)
+
+    # The row hashes are only comparable with the same column types, and the rows without key columns are only matched by hash in the row hash mode
+    if([str(dtype) for dtype in target_data.dtypes] != snapshot_metadata['column_types'] or (key_columns == [] and not is_row_hash_mode)):
+        with traceStage("load snapshot", snapshot_metadata['records']):
+            source_data = readBaselineSnapshot(snapshot_id, snapshot_path)
+        return compareDataSets(source_data, target_data, key_columns, is_row_hash_mode, workers_count, cfg.merkle_block_size, normalization_options, duplicate_key_policy)
+
+    # Only the target data is hashed, the source row hashes are read from the snapshot index
+    total_source_records, total_target_records = snapshot_metadata['records'], len(target_data)
+    with traceStage("snapshot index", total_source_records):
+        source_index_df = readBaselineSnapshotIndex(snapshot_id, snapshot_path)
+    with traceStage("hash", total_target_records):
+        target_index_df = target_data[key_columns].assign(**{row_hash_column: getDataFrameRowHashes(target_data).values})
+
+    duplicate_key_statistics, merge_key_columns, matched_row_numbers = None, key_columns, None
+    if(key_columns == []):
+        if(total_source_records != total_target_records):
+            raise ValueError("The dimensionality of the source and target data are not matching, please check and try again. Hint: By giving key column(s) input, this error can be avoided.")
+        with traceStage("localize differences") as span:
+            source_non_matched, target_non_matched = getNonMatchedRowHashes(source_index_df[row_hash_column], target_index_df[row_hash_column])
+            source_positions, target_positions = np.flatnonzero(source_non_matched), np.flatnonzero(target_non_matched)
+            span['rows'] = len(source_positions) + len(target_positions)
+    else:
+        # The duplicate keys are handled on the key columns of the whole data, before the rows with differences are selected
+        source_row_hashes, target_row_hashes = source_index_df[row_hash_column].values, target_index_df[row_hash_column].values
+        with traceStage("duplicate keys", total_source_records + total_target_records):
+            duplicate_key_statistics = getDuplicateKeyStatistics(source_index_df, target_index_df, key_columns)
+            source_index_df, target_index_df, merge_key_columns = applyDuplicateKeyPolicy(source_index_df.assign(_position=np.arange(total_source_records)), target_index_df.assign(_position=np.arange(total_target_records)), key_columns, duplicate_key_statistics, duplicate_key_policy)
+
+        # The records of a many-to-many key merge have no row numbers of their own, the whole data is compared
+        if(not hasUniqueMergeKeys(duplicate_key_statistics, duplicate_key_policy)):
+            with traceStage("load snapshot", total_source_records):
+                source_data = readBaselineSnapshot(snapshot_id, snapshot_path)
+            return compareDataSets(source_data, target_data, key_columns, is_row_hash_mode, workers_count, cfg.merkle_block_size, normalization_options, duplicate_key_policy)
+
+        # The key matched records with equal row hashes are equal, only the other records are read and compared
+        with traceStage("localize differences") as span:
+            index_result_df = pd.merge(source_index_df[merge_key_columns + ['_position']], target_index_df[merge_key_columns + ['_position']], how='outer', on=merge_key_columns, indicator=True, suffixes=('_source', '_target'))
+            is_key_matched = (index_result_df['_merge'] == 'both').values
+            key_matched_df = index_result_df[is_key_matched]
+            is_different = np.ones(len(index_result_df), dtype=bool)
+            is_different[is_key_matched] = source_row_hashes[key_matched_df['_position_source'].astype(np.int64).values] != target_row_hashes[key_matched_df['_position_target'].astype(np.int64).values]
+            index_result_df = index_result_df[is_different]
+            source_positions = np.unique(index_result_df['_position_source'].dropna().astype(np.int64).values)
+            target_positions = np.unique(index_result_df['_position_target'].dropna().astype(np.int64).values)
+            span['rows'] = len(source_positions) + len(target_positions)
+
+            # Row numbers of the differing key matched records in the comparison of the whole data, the parallel comparison numbers them partition by partition
+            key_matched_partitions = getKeyPartitions(key_matched_df, merge_key_columns, workers_count) if workers_count > 1 else np.zeros(len(key_matched_df), dtype=np.int64)
+            matched_row_numbers = np.flatnonzero(is_different[is_key_matched][np.argsort(key_matched_partitions, kind='stable')])
+
+    with traceStage("read snapshot records", len(source_positions)):
+        source_compare_data = readBaselineSnapshotRows(snapshot_id, source_positions, snapshot_path)
+        target_compare_data = target_data.iloc[target_positions].reset_index(drop=True)
+        if(key_occurrence_column in merge_key_columns):
+            source_compare_data[key_occurrence_column] = source_index_df.set_index('_position').loc[source_positions, key_occurrence_column].values
+            target_compare_data[key_occurrence_column] = target_index_df.set_index('_position').loc[target_positions, key_occurrence_column].values
+        if((source_compare_data.dtypes != target_compare_data.dtypes).any()):
+            source_compare_data, target_compare_data = alignCompactColumnTypes(source_compare_data, target_compare_data)
+    comparison_message = f"Compared with the baseline snapshot, {len(source_positions)} of {total_source_records} source record(s) read"
+
+    if(key_columns == []):
+        with traceStage("merge", len(source_compare_data) + len(target_compare_data)):
+            validation_result_df = pd.concat([source_compare_data.assign(_merge='left_only'), target_compare_data.assign(_merge='right_only')], ignore_index=True)
+        with traceStage("diff", len(validation_result_df)):
+            differences_df, difference_count = analyzeValidationResultWithoutKeys(validation_result_df)
+        source_only_records_df, target_only_records_df = None, None
+    else:
+        with traceStage("compare by keys", len(source_compare_data) + len(target_compare_data)):
+            differences_df, source_only_records_df, target_only_records_df, difference_count, key_matched_count = compareDataFramesByKeysInParallel(source_compare_data, target_compare_data, merge_key_columns, workers_count)
+            differences_df['Index'] = matched_row_numbers[differences_df['Index'].values - 1] + 1
+            differences_df.index = differences_df.index.set_levels(matched_row_numbers[differences_df.index.levels[0]], level=0)
+
+    # Return results
+    return differences_df, source_only_records_df, target_only_records_df, difference_count, total_source_records, total_target_records, duplicate_key_statistics, comparison_message
+
+# Function to read and compare the source and target data files, returns the comparison result as in "compareDataSets"
+def compareFiles(source_file, target_file, key_columns: list = [], drop_columns: list = [], columns: list = [], sheet_names: tuple = (0, 0), is_key_sorted: bool = False, is_row_hash_mode: bool = cfg.use_row_hash_comparison, workers_count: int = cfg.parallel_workers_count, engine: str = cfg.excel_engine, excel_to_parquet: bool = cfg.convert_excel_to_parquet, compact_types: bool = cfg.use_compact_types, normalization_options: dict = None, duplicate_key_policy: str = cfg.duplicate_key_policy, is_out_of_core: bool = cfg.use_out_of_core_comparison, use_baseline_snapshot: bool = cfg.use_baseline_snapshot, is_profile_mode: bool = cfg.use_column_profile) -> tuple:
+    if(columns != []): # Key columns are always read
+        columns = columns + [column for column in key_columns if column not in columns]
+    if(isProfileComparison(source_file, target_file, is_profile_mode)):
+        return compareFileProfiles(source_file, target_file, cfg.stream_chunk_size, drop_columns, columns, normalization_options)
+    if(isStreamingComparison(source_file, target_file, key_columns, is_key_sorted)):
+        return compareDataFiles(source_file, target_file, key_columns, cfg.stream_chunk_size, drop_columns, columns, normalization_options, duplicate_key_policy)
+    if(isPartitionedComparison(source_file, target_file, is_out_of_core)):
+        return compareDataFilesInPartitions(source_file, target_file, key_columns, cfg.stream_chunk_size, drop_columns, columns, normalization_options, duplicate_key_policy, is_row_hash_mode)
+
+    # The source data of a saved baseline snapshot is not read again
+    source_file_digest = getFileDigest(source_file) if use_baseline_snapshot else None
+    baseline_snapshot_id = getBaselineSnapshotId(source_file_digest, sheet_names[0], columns, drop_columns, key_columns, normalization_options, compact_types) if use_baseline_snapshot else None
+    if(baseline_snapshot_id is not None and hasBaselineSnapshot(baseline_snapshot_id)):
+        target_data = readDataFile(target_file, sheet_names[1], columns, drop_columns, engine, excel_to_parquet, compact_types)
+        comparison_error, comparison_hint = getSnapshotComparisonError(readBaselineSnapshotMetadata(baseline_snapshot_id), target_data, key_columns, compact_types)
+        if(comparison_error is not None):
+            raise ValueError(comparison_error if comparison_hint is None else f"{comparison_error} {comparison_hint}")
+        return compareWithBaselineSnapshot(baseline_snapshot_id, target_data, key_columns, is_row_hash_mode, workers_count, normalization_options, duplicate_key_policy)
+
+    source_data = readDataFile(source_file, sheet_names[0], columns, drop_columns, engine, excel_to_parquet, compact_types, source_file_digest)
+    target_data = readDataFile(target_file, sheet_names[1], columns, drop_columns, engine, excel_to_parquet, compact_types)
+    if(compact_types):
+        source_data, target_data = alignCompactColumnTypes(source_data, target_data)
+
+    comparison_error, comparison_hint = getComparisonError(source_data, target_data, key_columns)
+    if(comparison_error is not None):
+        raise ValueError(comparison_error if comparison_hint is None else f"{comparison_error} {comparison_hint}")
+    comparison_result = compareDataSets(source_data, target_data, key_columns, is_row_hash_mode, workers_count, cfg.merkle_block_size, normalization_options, duplicate_key_policy)
+    if(baseline_snapshot_id is not None):
+        saveBaselineSnapshot(baseline_snapshot_id, source_data, key_columns, normalization_options, {'source_file': getDataFileName(source_file), 'source_digest': source_file_digest})
+    return comparison_result
+
+# Function returns the duplicate key statistics as an html list for the report, empty when the keys are unique
+def getDuplicateKeysHtml(duplicate_key_statistics: dict) -> str:
+    if(duplicate_key_statistics is None or (duplicate_key_statistics['source_duplicate_keys'] == 0 and duplicate_key_statistics['target_duplicate_keys'] == 0)):
+        return ""
+    return (
+        "\n  <br><br>\n  <h2><u>Duplicate Keys</u></h2>\n  <ul>\n"
+        f"    <li>Duplicate keys in source : {duplicate_key_statistics['source_duplicate_keys']} ({duplicate_key_statistics['source_duplicate_rows']} records)</li>\n"
+        f"    <li>Duplicate keys in target : {duplicate_key_statistics['target_duplicate_keys']} ({duplicate_key_statistics['target_duplicate_rows']} records)</li>\n"
+        f"    <li>Estimated key merge records : {duplicate_key_statistics['estimated_merge_rows']}</li>\n"
+        "  </ul>"
+    )
+
+# Function returns the report values of the comparison result, to fill the report template
+def getReportValues(comparison_result: tuple, source_file_name: str, target_file_name: str, key_columns: list, time_taken_in_secs: float, report_format: str = "Standard", trace: list = None) -> dict:
+    differences_df, source_only_records_df, target_only_records_df, difference_count, total_source_records, total_target_records, duplicate_key_statistics, comparison_message = comparison_result
+
+    # Analyze result data
+    if(key_columns == []): # No key column process
+        # Fetch data statistics
+        total_errors = difference_count
+        total_differences = difference_count
+        total_records_only_in_source = 0
+        total_records_only_in_target = 0
+        source_only_report = "<p>No data found</p>" if report_format == "Standard" else pd.DataFrame()
+        target_only_report = "<p>No data found</p>" if report_format == "Standard" else pd.DataFrame()
+    else: # Has key column process
+        # Fetch data statistics
+        total_errors = difference_count + len(source_only_records_df) + len(target_only_records_df)
+        total_differences = difference_count
+        total_records_only_in_source = len(source_only_records_df)
+        total_records_only_in_target = len(target_only_records_df)
+        source_only_report = source_only_records_df
+        target_only_report = target_only_records_df
+
+    report_values = {
+        'current_date_and_time': getCurrentDayDateTimeAsString(),
+        'source_file_name': source_file_name,
+        'target_file_name': target_file_name,
+        'total_source_records': total_source_records,
+        'total_target_records': total_target_records,
+        'total_errors': total_errors,
+        'total_differences': total_differences,
+        'total_records_only_in_source': total_records_only_in_source,
+        'total_records_only_in_target': total_records_only_in_target,
+        'differences_df': differences_df,
+        'source_only_records_df': source_only_report,
+        'target_only_records_df': target_only_report,
+        'total_time_taken_in_mins': round(time_taken_in_secs/60, 4),
+        'status_class': "status-component-failed" if total_errors > 0 else "status-component-success",
+        'status': "Comparision Failed" if total_errors > 0 else "Comparision Successful",
+        'duplicate_keys_html': getDuplicateKeysHtml(duplicate_key_statistics),
+        'stage_trace_html': getTraceHtml(trace)
+    }
+    if(report_format != "Standard"):
+        report_values['report_data_encoding'] = report_table_formats[report_format]
+    return report_values
+
+# Function returns the record counts of the report values, stored with the report in the result store
+def getReportSummary(report_values: dict) -> dict:
+    return {report_value_name: int(report_values[report_value_name]) for report_value_name in ['total_source_records', 'total_target_records', 'total_errors', 'total_differences', 'total_records_only_in_source', 'total_records_only_in_target']}
+
+# Function to write the report of the report values into a temporary "html" file, returns the file path
+def writeComparisonReport(report_values: dict, report_format: str = "Standard", artifacts_path: str = cfg.artifacts_path) -> str:
+    template_file_name = cfg.raw_report_file_name if report_format == "Standard" else cfg.virtual_report_file_name
+    with traceStage("report"):
+        return writeReportFile(os.path.join(artifacts_path, template_file_name), report_values, cfg.report_chunk_rows, report_table_formats[report_format])
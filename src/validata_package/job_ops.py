@@ -0,0 +1,110 @@
+# Import packages and modules | External
+import os
+import time
+import uuid
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.trace_ops import startTrace, stopTrace, getTraceProgress, startPartialResult
+from validata_package.cache_ops import getObjectSize
+
+# Job state, shared across the sessions of the server process
+job_executor = ThreadPoolExecutor(max_workers=cfg.job_workers_count, thread_name_prefix="validata_job")
+job_lock = threading.Lock()
+jobs = OrderedDict()
+
+# Function to run the job function in a worker thread, recording its trace, result or error into the job
+def runJob(job: dict, job_function, args: tuple, kwargs: dict, trace_memory: bool) -> None:
+    with job_lock:
+        if(job['cancel_event'].is_set()):
+            job['status'], job['finished_at'] = "cancelled", time.time()
+            return
+        job['status'], job['started_at'] = "running", time.time()
+
+    job['trace'] = startTrace(trace_memory, job['cancel_event'])
+    job['partial_result'] = startPartialResult()
+    try:
+        result = job_function(*args, **kwargs)
+        with job_lock:
+            job['result'], job['status'] = result, "done"
+    except CancelledError:
+        with job_lock:
+            job['status'] = "cancelled"
+    except Exception as e:
+        with job_lock:
+            job['error'], job['error_type'], job['status'] = str(e), type(e).__name__, "error"
+    finally:
+        stopTrace()
+        with job_lock:
+            job['finished_at'] = time.time()
+
+# Function to delete the job and the temporary files of its result, called with the job lock held
+def deleteJob(job_id: str) -> None:
+    job = jobs.pop(job_id)
+    for temp_fpath in (job['result'] or {}).get('temp_fpaths', []):
+        if(os.path.exists(temp_fpath)):
+            os.remove(temp_fpath)
+
+# Function to evict the finished jobs past the retention time and the oldest finished jobs above the history size
+def evictJobs(history_size: int = cfg.job_history_size, retention_in_secs: int = cfg.job_retention_in_secs) -> None:
+    finished_job_ids = [job_id for job_id, job in jobs.items() if job['status'] in ["done", "error", "cancelled"]]
+    for job_id in finished_job_ids:
+        if(len(jobs) > history_size or time.time() - jobs[job_id]['finished_at'] > retention_in_secs):
+            deleteJob(job_id)
+
+# Function to submit the job function to the worker pool, returns the job id; a queued, running or done job of the same job key is reused
+def submitJob(job_function, *args, job_key: str = None, trace_memory: bool = cfg.trace_memory, **kwargs) -> str:
+    with job_lock:
+        evictJobs()
+        if(job_key is not None):
+            for job_id, job in jobs.items():
+                if(job['job_key'] == job_key and job['status'] in ["queued", "running", "done"]):
+                    return job_id
+
+        job_id = uuid.uuid4().hex
+        job = {'job_id': job_id, 'job_key': job_key, 'status': "queued", 'submitted_at': time.time(), 'started_at': None, 'finished_at': None,
+               'trace': [], 'partial_result': None, 'result': None, 'error': None, 'error_type': None, 'cancel_event': threading.Event()}
+        jobs[job_id] = job
+
+        # Every job runs in a context of its own, so its trace and cancel event are not shared with the submitting session
+        job['future'] = job_executor.submit(contextvars.Context().run, runJob, job, job_function, args, kwargs, trace_memory)
+    return job_id
+
+# Function returns the job of the job id, None when it does not exist or was evicted
+def getJob(job_id: str) -> dict:
+    with job_lock:
+        return jobs.get(job_id)
+
+# Function to cancel the job, a queued job never starts and a running job stops at its next stage or chunk, returns True when the job was not finished
+def cancelJob(job_id: str) -> bool:
+    with job_lock:
+        job = jobs.get(job_id)
+        if(job is None or job['status'] not in ["queued", "running"]):
+            return False
+        job['cancel_event'].set()
+        if(job['future'].cancel()):
+            job['status'], job['finished_at'] = "cancelled", time.time()
+    return True
+
+# Function to remove the finished job, so that the next job of the same job key runs again instead of reusing it
+def removeJob(job_id: str) -> None:
+    with job_lock:
+        if(job_id in jobs and jobs[job_id]['status'] in ["done", "error", "cancelled"]):
+            deleteJob(job_id)
+
+# Function returns the status, elapsed time, stage progress and partial result of the job
+def getJobProgress(job_id: str) -> dict:
+    job = getJob(job_id)
+    if(job is None):
+        return None
+    start_time = job['started_at'] or job['submitted_at']
+    return {'status': job['status'], 'elapsed_time_in_secs': round((job['finished_at'] or time.time()) - start_time, 1), 'stages': getTraceProgress(job['trace']), 'partial_result': dict(job['partial_result']) if job['partial_result'] is not None else None}
+
+# Function returns the approximate memory size of the results, partial results and traces kept by the jobs
+def getJobsMemorySize() -> int:
+    with job_lock:
+        return sum(getObjectSize(job['result']) + getObjectSize(job['partial_result']) + getObjectSize(job['trace']) for job in jobs.values())
@@ -0,0 +1,119 @@
+# Import packages and modules | External
+import os
+import math
+import time
+import threading
+import pandas as pd
+from contextlib import contextmanager
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.trace_ops import checkCancellation
+from validata_package.job_ops import getJobsMemorySize
+
+# Peak memory of a comparison, as multiples of the memory of both loaded data sets : the normalized copies, the merge result and the analyzed differences
+comparison_memory_factors = {"keys": 3.0, "row_hash": 1.5, "merge": 3.0}
+
+# Extra memory of the parallel key comparison, the data partitions are copied into the worker processes
+parallel_memory_factor = 1.0
+
+# Memory of the loaded data, as multiples of the data file size
+file_memory_factors = {".csv": 2.5, ".xlsx": 6.0, ".parquet": 4.0}
+
+# Memory budget state, shared across the sessions of the server process
+memory_condition = threading.Condition()
+reserved_memory_in_bytes = 0
+
+# Function returns the approximate memory size of the dataframe, the text columns are measured on a sample of the rows
+def getDataFrameMemorySize(dataframe: pd.DataFrame, sample_rows: int = cfg.memory_sample_rows) -> int:
+    if(len(dataframe) <= sample_rows):
+        return int(dataframe.memory_usage(index=True, deep=True).sum())
+    sample_df = dataframe.sample(n=sample_rows, random_state=0)
+    return int(sample_df.memory_usage(index=False, deep=True).sum() * len(dataframe) / sample_rows) + int(dataframe.index.memory_usage())
+
+# Function returns the estimated peak memory in bytes of comparing data sets of the given memory size in the chosen mode
+def getComparisonMemoryEstimate(data_size_in_bytes: int, key_columns: list, is_row_hash_mode: bool = cfg.use_row_hash_comparison, workers_count: int = cfg.parallel_workers_count) -> int:
+    comparison_mode = "keys" if key_columns != [] else ("row_hash" if is_row_hash_mode else "merge")
+    memory_estimate = data_size_in_bytes * comparison_memory_factors[comparison_mode]
+    if(key_columns != [] and workers_count > 1):
+        memory_estimate += data_size_in_bytes * parallel_memory_factor
+    return int(memory_estimate)
+
+# Function returns the estimated peak memory in bytes of comparing the loaded source and target data
+def estimateComparisonMemory(source_data: pd.DataFrame, target_data: pd.DataFrame, key_columns: list, is_row_hash_mode: bool = cfg.use_row_hash_comparison, workers_count: int = cfg.parallel_workers_count) -> int:
+    return getComparisonMemoryEstimate(getDataFrameMemorySize(source_data) + getDataFrameMemorySize(target_data), key_columns, is_row_hash_mode, workers_count)
+
+# Function returns the size in bytes of a data file (uploaded file, file object or file path), 0 when it does not exist
+def getFileSize(file) -> int:
+    if(hasattr(file, "size")):
+        return int(file.size)
+    if(hasattr(file, "seek")):
+        file_size = file.seek(0, os.SEEK_END)
+        file.seek(0)
+        return file_size
+    return os.path.getsize(file) if os.path.exists(file) else 0
+
+# Function returns the estimated memory in bytes of the data loaded from a data file, from the file size
+def estimateFileLoadMemory(file) -> int:
+    return int(getFileSize(file) * file_memory_factors.get(os.path.splitext(file.name if hasattr(file, "name") else str(file))[1].lower(), 1.0))
+
+# Function returns the estimated peak memory in bytes of reading and comparing two data files, from the file sizes
+def estimateFileComparisonMemory(source_file, target_file, key_columns: list, is_row_hash_mode: bool = cfg.use_row_hash_comparison, workers_count: int = cfg.parallel_workers_count) -> int:
+    data_size_in_bytes = estimateFileLoadMemory(source_file) + estimateFileLoadMemory(target_file)
+    return getComparisonMemoryEstimate(data_size_in_bytes, key_columns, is_row_hash_mode, workers_count) + data_size_in_bytes
+
+# Function returns the estimated peak memory in bytes of comparing two key sorted files in chunks, from sample records of both files
+def estimateStreamingComparisonMemory(source_file, target_file, source_sample_data: pd.DataFrame, target_sample_data: pd.DataFrame, chunk_size: int = cfg.stream_chunk_size) -> int:
+    # A chunk and the records carried over to the next chunk are held on each side, files smaller than the chunks are held whole
+    row_size_in_bytes = sum(getDataFrameMemorySize(sample_data) / max(len(sample_data), 1) for sample_data in [source_sample_data, target_sample_data])
+    return min(getComparisonMemoryEstimate(int(row_size_in_bytes * chunk_size * 2), ["key"], workers_count=1), estimateFileComparisonMemory(source_file, target_file, ["key"], workers_count=1))
+
+# Function returns the count of partitions to compare two data files out of core, so that each partition fits in the partition memory
+def getPartitionsCount(source_file, target_file, key_columns: list, is_row_hash_mode: bool = cfg.use_row_hash_comparison, partition_memory_mb: int = cfg.partition_memory_mb) -> int:
+    return max(1, math.ceil(estimateFileComparisonMemory(source_file, target_file, key_columns, is_row_hash_mode, 1) / (partition_memory_mb * 1024 * 1024)))
+
+# Function returns the estimated peak memory in bytes of comparing two data files out of core, one partition at a time
+def estimatePartitionedComparisonMemory(source_file, target_file, key_columns: list, is_row_hash_mode: bool = cfg.use_row_hash_comparison, partitions_count: int = None) -> int:
+    partitions_count = getPartitionsCount(source_file, target_file, key_columns, is_row_hash_mode) if partitions_count is None else partitions_count
+    return estimateFileComparisonMemory(source_file, target_file, key_columns, is_row_hash_mode, 1) // partitions_count
+
+# Function returns the comparison options of the low memory mode : single worker, and rows matched by hash without key columns
+def getLowMemoryComparisonOptions(key_columns: list, is_row_hash_mode: bool, workers_count: int) -> tuple:
+    return (True if key_columns == [] else is_row_hash_mode), 1
+
+# Function returns the memory in bytes of the server memory budget for the comparisons, the cache up to its memory cap and the results kept by the jobs take the rest
+def getComparisonBudget(budget_mb: int = cfg.memory_budget_mb, cache_max_memory_mb: int = cfg.cache_max_memory_mb) -> int:
+    return (budget_mb - cache_max_memory_mb) * 1024 * 1024 - getJobsMemorySize()
+
+# Function returns the error message of a comparison needing more memory than the server memory budget for the comparisons
+def getMemoryBudgetError(size_in_bytes: int, budget_in_bytes: int) -> str:
+    return f"The comparison needs about {size_in_bytes // (1024 * 1024)} MB of memory, over the server memory budget of {budget_in_bytes // (1024 * 1024)} MB for the comparisons. Please compare key sorted csv files in chunks, use the compact loading mode or compare fewer columns."
+
+# Function returns the memory in bytes left in the server memory budget
+def getAvailableMemory(budget_mb: int = cfg.memory_budget_mb) -> int:
+    with memory_condition:
+        return getComparisonBudget(budget_mb) - reserved_memory_in_bytes
+
+# Function to reserve memory of the server memory budget while a data file is read or a comparison runs, waiting in queue for the running comparisons to release it
+@contextmanager
+def reserveMemory(size_in_bytes: int, budget_mb: int = cfg.memory_budget_mb, timeout_in_secs: float = cfg.memory_wait_timeout_in_secs):
+    global reserved_memory_in_bytes
+    budget_in_bytes = getComparisonBudget(budget_mb)
+    if(size_in_bytes > budget_in_bytes):
+        raise MemoryError(getMemoryBudgetError(size_in_bytes, budget_in_bytes))
+
+    # The waiting comparison checks every second whether its job was cancelled, the budget shrinks and grows with the results kept by the jobs
+    deadline = time.time() + timeout_in_secs
+    with memory_condition:
+        while(reserved_memory_in_bytes + size_in_bytes > getComparisonBudget(budget_mb)):
+            checkCancellation()
+            if(time.time() >= deadline):
+                raise TimeoutError(f"The comparison waited {timeout_in_secs} seconds for {size_in_bytes // (1024 * 1024)} MB of the server memory budget, please try again later.")
+            memory_condition.wait(timeout=min(1, deadline - time.time()))
+        reserved_memory_in_bytes += size_in_bytes
+    try:
+        yield size_in_bytes
+    finally:
+        with memory_condition:
+            reserved_memory_in_bytes -= size_in_bytes
+            memory_condition.notify_all()
@@ -0,0 +1,101 @@
+# Import packages and modules | External
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+
+# Pattern of the text values recognized as dates, e.g. "2024-01-31", "31/01/2024" or "2024.01.31 10:30"
+date_value_pattern = r'\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}([ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?)?\s*'
+
+# Function returns the normalization options, the cache keys and the comparison functions take them as one dictionary
+def getNormalizationOptions(trim: bool = cfg.normalize_trim, case_fold: bool = cfg.normalize_case_fold, blank_to_null: bool = cfg.normalize_blank_to_null, round_decimals: int = cfg.normalize_round_decimals, canonicalize_dates: bool = cfg.normalize_dates, dates_dayfirst: bool = cfg.normalize_dates_dayfirst) -> dict:
+    return {'trim': trim, 'case_fold': case_fold, 'blank_to_null': blank_to_null, 'round_decimals': round_decimals, 'canonicalize_dates': canonicalize_dates, 'dates_dayfirst': dates_dayfirst}
+
+# Function returns True when the column holds text values only
+def isTextColumn(values: pd.Series) -> bool:
+    if(isinstance(values.dtype, pd.StringDtype)):
+        return True
+    return pd.api.types.is_object_dtype(values.dtype) and pd.api.types.infer_dtype(values, skipna=True) == "string"
+
+# Function returns True when most of the text values hold dates, the empty values are ignored and the other values do not prevent it
+def isDateColumn(values: pd.Series, min_ratio: float = cfg.normalize_dates_min_ratio) -> bool:
+    text_values = pd.Series([value.strip() for value in values.dropna() if isinstance(value, str)], dtype=object)
+    text_values = text_values[text_values != ""]
+    return len(text_values) > 0 and text_values.str.fullmatch(date_value_pattern).mean() >= min_ratio
+
+# Function returns the normalization options with the date columns found in the first records of the source and target data, so that the dates of a column are canonicalized alike on both sides and in every chunk
+def resolveDateColumns(normalization_options: dict, sample_dataframes: list, sample_rows: int = cfg.normalize_dates_sample_rows) -> dict:
+    normalization_options = getNormalizationOptions() if normalization_options is None else normalization_options
+    if(not normalization_options['canonicalize_dates'] or 'date_columns' in normalization_options):
+        return normalization_options
+    columns = list(dict.fromkeys(column for sample_dataframe in sample_dataframes for column in sample_dataframe.columns))
+    date_columns = [column for column in columns if isDateColumn(pd.concat([sample_dataframe[column].head(sample_rows).astype(object) for sample_dataframe in sample_dataframes if column in sample_dataframe.columns]))]
+    return {**normalization_options, 'date_columns': date_columns}
+
+# Function returns the dates of the text values in the canonical "YYYY-MM-DD[ HH:MM:SS]" form, the values not holding dates are left as is
+def canonicalizeDateValues(values: pd.Series, dayfirst: bool = cfg.normalize_dates_dayfirst) -> pd.Series:
+    date_positions = np.flatnonzero(values.notna().to_numpy() & values.astype(str).str.fullmatch(date_value_pattern).to_numpy(dtype=bool))
+    if(len(date_positions) == 0):
+        return values
+    date_values = pd.to_datetime(pd.Series(values.to_numpy(dtype=object)[date_positions]), errors='coerce', format='mixed', dayfirst=dayfirst)
+    canonical_values = date_values.dt.strftime('%Y-%m-%d %H:%M:%S').str.replace(" 00:00:00", "", regex=False).to_numpy(dtype=object)
+    is_parsed = date_values.notna().to_numpy()
+    normalized_values = values.to_numpy(dtype=object, copy=True)
+    normalized_values[date_positions[is_parsed]] = canonical_values[is_parsed]
+    return pd.Series(normalized_values, index=values.index, name=values.name).astype(values.dtype)
+
+# Function returns the text values trimmed, case-folded and with the blank values as null, with vectorized Arrow string kernels
+def normalizeTextValues(values: pd.Series, trim: bool, case_fold: bool, blank_to_null: bool) -> pd.Series:
+    text_array = pa.array(values.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    if(trim):
+        text_array = pc.utf8_trim_whitespace(text_array)
+    if(case_fold):
+        text_array = pc.utf8_lower(text_array)
+    if(trim or case_fold):
+        normalized_values = pd.Series(text_array.to_numpy(zero_copy_only=False), index=values.index, name=values.name)
+        values = normalized_values.astype(values.dtype) if isinstance(values.dtype, pd.StringDtype) else normalized_values.where(values.notna(), np.nan)
+
+    # Blank values are found on the Arrow array, so that unchanged columns are not converted back
+    if(blank_to_null):
+        is_blank = pc.fill_null(pc.equal(text_array if trim else pc.utf8_trim_whitespace(text_array), ""), False).to_numpy(zero_copy_only=False)
+        if(is_blank.any()):
+            values = values.mask(is_blank)
+    return values
+
+# Function returns the categorical values with normalized categories
+def normalizeCategoricalValues(values: pd.Series, normalization_options: dict) -> pd.Series:
+    categories = pd.Series(values.cat.categories, name=values.name)
+    normalized_categories = normalizeColumnValues(categories, normalization_options)
+    if(normalized_categories.equals(categories)):
+        return values
+    codes = values.cat.codes.to_numpy()
+    normalized_values = np.where(codes >= 0, normalized_categories.to_numpy(dtype=object)[codes], np.nan)
+    return pd.Series(normalized_values, index=values.index, name=values.name).astype('category')
+
+# Function returns the normalized values of a column, applying only the options relevant to its data type
+def normalizeColumnValues(values: pd.Series, normalization_options: dict) -> pd.Series:
+    if(isinstance(values.dtype, pd.CategoricalDtype)):
+        return normalizeCategoricalValues(values, normalization_options)
+    elif(pd.api.types.is_float_dtype(values.dtype) and normalization_options['round_decimals'] is not None):
+        return values.round(normalization_options['round_decimals'])
+    elif(isTextColumn(values)):
+        # The blank values are made null before the dates are found, the date columns of both sides are found once when they are resolved
+        if(normalization_options['trim'] or normalization_options['case_fold'] or normalization_options['blank_to_null']):
+            values = normalizeTextValues(values, normalization_options['trim'], normalization_options['case_fold'], normalization_options['blank_to_null'])
+        if(normalization_options['canonicalize_dates'] and (values.name in normalization_options['date_columns'] if 'date_columns' in normalization_options else isDateColumn(values.head(cfg.normalize_dates_sample_rows)))):
+            values = canonicalizeDateValues(values, normalization_options['dates_dayfirst'])
+    elif(pd.api.types.is_object_dtype(values.dtype)):
+        # Mixed type columns normalize their text values only
+        is_text = np.fromiter((isinstance(value, str) for value in values.to_numpy()), dtype=bool, count=len(values))
+        if(is_text.any()):
+            values = values.copy()
+            values[is_text] = normalizeColumnValues(values[is_text], normalization_options)
+    return values
+
+# Function returns the normalized dataframe, to be applied on the source and target data before they are compared
+def normalizeDataFrame(dataframe: pd.DataFrame, normalization_options: dict = None) -> pd.DataFrame:
+    normalization_options = getNormalizationOptions() if normalization_options is None else normalization_options
+    return pd.DataFrame({column: normalizeColumnValues(dataframe[column], normalization_options) for column in dataframe.columns}, index=dataframe.index)
@@ -0,0 +1,71 @@
+# Import packages and modules | External
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.comparison_ops import compareDataFramesByKeys
+from validata_package.trace_ops import setStageProgress, addPartialResult, merge_result_labels
+
+# Function returns the partition number of each row, from the hash of its key columns
+def getKeyPartitions(dataframe: pd.DataFrame, key_columns: list, partitions_count: int):
+    return pd.util.hash_pandas_object(dataframe[key_columns], index=False).values % partitions_count
+
+# Function to merge the per partition results into the totals and report tables of one comparison
+def combinePartitionResults(partition_results: list) -> tuple:
+    differences_dfs, source_only_records_dfs, target_only_records_dfs = [], [], []
+    total_difference_count, total_key_matched_count = 0, 0
+    for differences_df, source_only_records_df, target_only_records_df, difference_count, key_matched_count in partition_results:
+        # Continue the row numbers from the key matched rows of the previous partitions
+        differences_df = differences_df.copy()
+        differences_df['Index'] = differences_df['Index'] + total_key_matched_count
+        differences_df.index = differences_df.index.set_levels(differences_df.index.levels[0] + total_key_matched_count, level=0)
+
+        differences_dfs.append(differences_df)
+        source_only_records_dfs.append(source_only_records_df)
+        target_only_records_dfs.append(target_only_records_df)
+        total_difference_count += difference_count
+        total_key_matched_count += key_matched_count
+
+    return pd.concat(differences_dfs), pd.concat(source_only_records_dfs), pd.concat(target_only_records_dfs), total_difference_count, total_key_matched_count
+
+# Function to add the result of a finished partition to the partial result, its records with differences shown without the highlight of the mismatched values
+def updatePartitionPartialResult(partition_result: tuple, sample_size: int = cfg.partial_result_sample_size) -> None:
+    differences_df, source_only_records_df, target_only_records_df, difference_count, key_matched_count = partition_result
+    difference_records_dfs = [differences_df.head(sample_size).drop(columns=['Index']).replace(r"^:red", "", regex=True).assign(Result=merge_result_labels['both'])]
+    for records_df, data_origin, merge_result in [(source_only_records_df, "Source", 'left_only'), (target_only_records_df, "Target", 'right_only')]:
+        difference_records_dfs.append(records_df.head(sample_size).assign(**{'Data Origin': data_origin, 'Result': merge_result_labels[merge_result]}))
+    difference_records_df = pd.concat(difference_records_dfs, ignore_index=True)
+    difference_records_df = difference_records_df[['Result', 'Data Origin'] + [column for column in difference_records_df.columns if column not in ['Result', 'Data Origin']]]
+    addPartialResult(key_matched_count, difference_count // 2, len(source_only_records_df), len(target_only_records_df), difference_records_df)
+
+# Function to compare two dataframes by key columns, partitioned by the hash of the key columns and compared in a process pool
+def compareDataFramesByKeysInParallel(dataframe1: pd.DataFrame, dataframe2: pd.DataFrame, key_columns: list, workers_count: int = cfg.parallel_workers_count) -> tuple:
+    # Single worker runs the serial comparison
+    if(workers_count <= 1):
+        return compareDataFramesByKeys(dataframe1, dataframe2, key_columns)
+
+    # Hash partition both data sets, so that matching keys land in the same partition
+    source_partitions = getKeyPartitions(dataframe1, key_columns, workers_count)
+    target_partitions = getKeyPartitions(dataframe2, key_columns, workers_count)
+
+    # The comparisons run in background job threads, the worker processes are started fresh instead of forked from a threaded server process
+    executor = ProcessPoolExecutor(max_workers=workers_count, mp_context=multiprocessing.get_context(cfg.parallel_start_method))
+    partition_futures = []
+    try:
+        partition_futures = [executor.submit(compareDataFramesByKeys, dataframe1[source_partitions == partition], dataframe2[target_partitions == partition], key_columns) for partition in range(workers_count)]
+        # The cancellation is checked at every poll interval, and the result of every finished partition is shown before the other partitions finish
+        pending_futures = set(partition_futures)
+        while(pending_futures):
+            done_futures, pending_futures = wait(pending_futures, timeout=cfg.job_poll_interval_in_secs, return_when=FIRST_COMPLETED)
+            for partition_future in done_futures:
+                updatePartitionPartialResult(partition_future.result())
+            setStageProgress((workers_count - len(pending_futures)) / workers_count)
+        partition_results = [partition_future.result() for partition_future in partition_futures]
+    finally:
+        # A cancelled or failed comparison does not wait on the running partitions, and the queued partitions are dropped
+        executor.shutdown(wait=all(partition_future.done() for partition_future in partition_futures), cancel_futures=True)
+
+    # Return results
+    return combinePartitionResults(partition_results)
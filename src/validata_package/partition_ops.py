@@ -0,0 +1,112 @@
+# Import packages and modules | External
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.validation_ops import getDataFrameRowHashes, compareDataFrames, compareDataFramesByRowHash, getDuplicateKeyStatistics, applyDuplicateKeyPolicy
+from validata_package.streaming_ops import isParquetFile, readDataFrameChunks, readDataFrameSample, getCommonColumnType, combineChunkValidationResults
+from validata_package.parallel_ops import getKeyPartitions
+from validata_package.normalization_ops import normalizeDataFrame, resolveDateColumns
+from validata_package.trace_ops import traceStage, checkCancellation, setStageProgress
+
+# Function returns the column data types of both files, the same for the columns in both so that equal values hash to the same partition
+def getPartitionColumnTypes(source_file, target_file, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = []) -> tuple:
+    files_column_types = []
+    for file in [source_file, target_file]:
+        # The type of a "csv" column is only known after every chunk is read, "parquet" files store it
+        column_types = {}
+        file_chunks = [next(readDataFrameChunks(file, 1, drop_columns, columns)).iloc[0:0]] if isParquetFile(file) else readDataFrameChunks(file, chunk_size, drop_columns, columns)
+        for chunk in file_chunks:
+            for column, dtype in chunk.dtypes.items():
+                column_types[column] = dtype if column not in column_types else getCommonColumnType(column_types[column], dtype)
+        files_column_types.append(column_types)
+
+    source_column_types, target_column_types = files_column_types
+    for column in set(source_column_types).intersection(target_column_types):
+        source_column_types[column] = target_column_types[column] = getCommonColumnType(source_column_types[column], target_column_types[column])
+    return source_column_types, target_column_types
+
+# Function returns the "parquet" schema of the partition files of the column data types, text columns are stored as strings
+def getPartitionSchema(column_types: dict) -> pa.Schema:
+    schema = pa.Schema.from_pandas(pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in column_types.items()}), preserve_index=False)
+    return pa.schema([pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field for field in schema])
+
+# Function returns the partition number of each row, from the hash of its key columns or of the whole row without key columns
+def getRowPartitions(dataframe: pd.DataFrame, key_columns: list, partitions_count: int) -> np.ndarray:
+    if(key_columns != []):
+        return getKeyPartitions(dataframe, key_columns, partitions_count)
+    return getDataFrameRowHashes(dataframe).values % partitions_count
+
+# Function returns the directory of the "parquet" files of a partition of the source or target data
+def getPartitionFilesDirectory(partition_directory: str, data_origin: str, partition: int) -> str:
+    return os.path.join(partition_directory, f"{data_origin.lower()}_{partition:05d}")
+
+# Function to write the buffered records of a partition into the next "parquet" file of the partition, returns the size of the written records
+def flushPartitionBuffer(partition_buffers: dict, partition_directory: str, data_origin: str, partition: int) -> int:
+    partition_table = pa.concat_tables(partition_buffers.pop(partition))
+    partition_files_directory = getPartitionFilesDirectory(partition_directory, data_origin, partition)
+    os.makedirs(partition_files_directory, exist_ok=True)
+    pq.write_table(partition_table, os.path.join(partition_files_directory, f"{len(os.listdir(partition_files_directory)):05d}.parquet"), row_group_size=cfg.partition_row_group_size)
+    return partition_table.nbytes
+
+# Function to write the normalized file contents into "parquet" partition files, returns the count of records
+def writeDataFramePartitions(file, partition_directory: str, data_origin: str, key_columns: list, partitions_count: int, column_types: dict, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = [], normalization_options: dict = None) -> int:
+    schema = getPartitionSchema(column_types)
+    # The records are buffered per partition instead of keeping a file open per partition, a partition is written once it fills a row group or when it is the largest buffer over the memory budget
+    partition_buffers, buffered_bytes = {}, 0
+    records_count = 0
+    for chunk in readDataFrameChunks(file, chunk_size, drop_columns, columns, column_types):
+        checkCancellation()
+        chunk = normalizeDataFrame(chunk, normalization_options)
+        records_count += len(chunk)
+        for partition, partition_df in chunk.groupby(getRowPartitions(chunk, key_columns, partitions_count), sort=False):
+            partition_table = pa.Table.from_pandas(partition_df, schema=schema, preserve_index=False)
+            partition_buffers.setdefault(partition, []).append(partition_table)
+            buffered_bytes += partition_table.nbytes
+            if(sum(buffered_table.num_rows for buffered_table in partition_buffers[partition]) >= cfg.partition_row_group_size):
+                buffered_bytes -= flushPartitionBuffer(partition_buffers, partition_directory, data_origin, partition)
+        while(buffered_bytes > cfg.partition_memory_mb * 1024 * 1024):
+            largest_partition = max(partition_buffers, key=lambda partition: sum(buffered_table.nbytes for buffered_table in partition_buffers[partition]))
+            buffered_bytes -= flushPartitionBuffer(partition_buffers, partition_directory, data_origin, largest_partition)
+    for partition in list(partition_buffers):
+        flushPartitionBuffer(partition_buffers, partition_directory, data_origin, partition)
+    return records_count
+
+# Function to read the partition files memory-mapped into dataframe, in the order they were written, an empty dataframe when the partition has no records
+def readDataFramePartition(partition_directory: str, data_origin: str, partition: int, column_types: dict) -> pd.DataFrame:
+    partition_files_directory = getPartitionFilesDirectory(partition_directory, data_origin, partition)
+    if(not os.path.exists(partition_files_directory)):
+        return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in column_types.items()})
+    return pa.concat_tables([pq.read_table(os.path.join(partition_files_directory, partition_file_name), memory_map=True) for partition_file_name in sorted(os.listdir(partition_files_directory))]).to_pandas().astype(column_types)
+
+# Function yields the merge results and duplicate key statistics of the partitions, compared one partition at a time
+def compareDataFramePartitions(partition_directory: str, partitions_count: int, key_columns: list, source_column_types: dict, target_column_types: dict, is_row_hash_mode: bool = cfg.use_row_hash_comparison, duplicate_key_policy: str = cfg.duplicate_key_policy):
+    for partition in range(partitions_count):
+        setStageProgress(partition / partitions_count)
+        source_partition_df = readDataFramePartition(partition_directory, "Source", partition, source_column_types)
+        target_partition_df = readDataFramePartition(partition_directory, "Target", partition, target_column_types)
+        if(key_columns == []):
+            # Equal rows have equal hashes, so they are in the same partition
+            validation_result_df = compareDataFramesByRowHash(source_partition_df, target_partition_df) if is_row_hash_mode else compareDataFrames(source_partition_df, target_partition_df, list(source_partition_df.columns))
+            yield validation_result_df, len(source_partition_df), len(target_partition_df), None
+        else:
+            # Every record of a key is in the same partition, so the duplicate keys are handled partition by partition
+            source_records_count, target_records_count = len(source_partition_df), len(target_partition_df)
+            duplicate_key_statistics = getDuplicateKeyStatistics(source_partition_df, target_partition_df, key_columns)
+            source_partition_df, target_partition_df, merge_key_columns = applyDuplicateKeyPolicy(source_partition_df, target_partition_df, key_columns, duplicate_key_statistics, duplicate_key_policy)
+            yield compareDataFrames(source_partition_df, target_partition_df, merge_key_columns), source_records_count, target_records_count, duplicate_key_statistics
+
+# Function to compare two "csv" or "parquet" files of any order and size, hash partitioned on disk and compared one partition at a time, keeping only the rows with differences
+def comparePartitionedFiles(source_file, target_file, key_columns: list, partition_directory: str, partitions_count: int, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = [], normalization_options: dict = None, is_row_hash_mode: bool = cfg.use_row_hash_comparison, duplicate_key_policy: str = cfg.duplicate_key_policy) -> tuple:
+    with traceStage("infer types"):
+        source_column_types, target_column_types = getPartitionColumnTypes(source_file, target_file, chunk_size, drop_columns, columns)
+    normalization_options = resolveDateColumns(normalization_options, [readDataFrameSample(source_file, cfg.normalize_dates_sample_rows, drop_columns, columns, source_column_types), readDataFrameSample(target_file, cfg.normalize_dates_sample_rows, drop_columns, columns, target_column_types)])
+    for file, data_origin, column_types in [(source_file, "Source", source_column_types), (target_file, "Target", target_column_types)]:
+        with traceStage(f"partition {data_origin.lower()}") as span:
+            span['rows'] = writeDataFramePartitions(file, partition_directory, data_origin, key_columns, partitions_count, column_types, chunk_size, drop_columns, columns, normalization_options)
+    with traceStage("compare partitions", partitions_count):
+        return combineChunkValidationResults(compareDataFramePartitions(partition_directory, partitions_count, key_columns, source_column_types, target_column_types, is_row_hash_mode, duplicate_key_policy), key_columns)
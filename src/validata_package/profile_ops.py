@@ -0,0 +1,139 @@
+# Import packages and modules | External
+import numpy as np
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.comparison_ops import addOriginAndIndexColumns, compareAlignedRecords
+from validata_package.normalization_ops import normalizeDataFrame
+from validata_package.trace_ops import checkCancellation
+
+# Function returns the bit length of each 64-bit value, 0 for the zero values
+def getBitLengths(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    bit_lengths = np.zeros(len(values), dtype=np.int64)
+    for shift in [32, 16, 8, 4, 2, 1]:
+        is_high = values >= np.uint64(1 << shift)
+        bit_lengths[is_high] += shift
+        values[is_high] >>= np.uint64(shift)
+    return bit_lengths + (values > 0)
+
+# Function to update the HyperLogLog registers of the approximate distinct count, the first bits of a value hash pick its register and the leading zeros of the other bits give its rank
+def updateHyperLogLogRegisters(registers: np.ndarray, value_hashes: np.ndarray) -> np.ndarray:
+    precision = int(np.log2(len(registers)))
+    register_positions = (value_hashes >> np.uint64(64 - precision)).astype(np.int64)
+    ranks = (64 - precision) - getBitLengths(value_hashes & np.uint64((1 << (64 - precision)) - 1)) + 1
+    np.maximum.at(registers, register_positions, ranks.astype(np.uint8))
+    return registers
+
+# Function returns the approximate distinct count of the HyperLogLog registers, small counts are estimated from the count of empty registers
+def getHyperLogLogEstimate(registers: np.ndarray) -> int:
+    registers_count = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / registers_count) * registers_count ** 2 / np.sum(np.power(2.0, -registers.astype(np.float64)))
+    empty_registers_count = int((registers == 0).sum())
+    if(estimate <= 2.5 * registers_count and empty_registers_count > 0):
+        estimate = registers_count * np.log(registers_count / empty_registers_count)
+    return int(round(estimate))
+
+# Function to update the quantile sketch, the distinct values of the smallest hashes are kept with their exact counts so that equal data gives equal sketches in any order
+def updateQuantileSketch(sketch_df: pd.DataFrame, values: pd.Series, value_hashes: np.ndarray, sketch_size: int = cfg.profile_quantile_sketch_size) -> pd.DataFrame:
+    chunk_sketch_df = pd.DataFrame({'value': values.values, 'count': 1}, index=pd.Index(value_hashes, name='hash'))
+    if(sketch_df is not None and len(sketch_df) >= sketch_size):
+        chunk_sketch_df = chunk_sketch_df[chunk_sketch_df.index <= sketch_df.index[-1]]
+    sketch_df = chunk_sketch_df if sketch_df is None else pd.concat([sketch_df, chunk_sketch_df])
+    return sketch_df.groupby(level='hash', sort=True).agg({'value': 'first', 'count': 'sum'}).iloc[:sketch_size]
+
+# Function returns the quantiles of the values in the quantile sketch, weighted by their counts, exact when the column has fewer distinct values than the sketch size
+def getSketchQuantiles(sketch_df: pd.DataFrame, quantiles: list = cfg.profile_quantiles) -> list:
+    if(sketch_df is None or len(sketch_df) == 0):
+        return [None] * len(quantiles)
+    sketch_df = sketch_df.sort_values('value')
+    cumulative_counts = sketch_df['count'].cumsum().values
+    positions = np.searchsorted(cumulative_counts, np.maximum(np.ceil(np.array(quantiles) * cumulative_counts[-1]), 1), side='left')
+    return sketch_df['value'].values[positions].tolist()
+
+# Function returns the non-null values of a column chunk with their kind : floats for the numeric columns, text for the other columns, no kind without values
+def getProfileValues(values: pd.Series) -> tuple:
+    values = values.dropna()
+    if(len(values) == 0):
+        return values, None
+    if(pd.api.types.is_numeric_dtype(values.dtype)):
+        return values.astype(np.float64), "numeric"
+    return values.astype(str), "text"
+
+# Function returns the empty profile of a column, the statistics are updated chunk by chunk
+def getEmptyColumnProfile(hll_precision: int = cfg.profile_hll_precision) -> dict:
+    return {'kind': None, 'rows': 0, 'nulls': 0, 'registers': np.zeros(1 << hll_precision, dtype=np.uint8), 'min': None, 'max': None, 'sum': 0.0, 'sketch': None}
+
+# Function to update the profile of a column with the values of a chunk, a column with numeric and text chunks is "mixed" and only counted
+def updateColumnProfile(column_profile: dict, values: pd.Series, sketch_size: int = cfg.profile_quantile_sketch_size) -> None:
+    column_profile['rows'] += len(values)
+    column_profile['nulls'] += int(values.isna().sum())
+    values, kind = getProfileValues(values)
+    if(kind is None):
+        return
+    column_profile['kind'] = kind if column_profile['kind'] in [None, kind] else "mixed"
+
+    value_hashes = pd.util.hash_pandas_object(values, index=False).values
+    updateHyperLogLogRegisters(column_profile['registers'], value_hashes)
+    if(column_profile['kind'] == "mixed"):
+        return
+
+    chunk_min, chunk_max = values.min(), values.max()
+    column_profile['min'] = chunk_min if column_profile['min'] is None else min(column_profile['min'], chunk_min)
+    column_profile['max'] = chunk_max if column_profile['max'] is None else max(column_profile['max'], chunk_max)
+    if(kind == "numeric"):
+        column_profile['sum'] += float(values.sum())
+        column_profile['sketch'] = updateQuantileSketch(column_profile['sketch'], values, value_hashes, sketch_size)
+
+# Function returns the value rounded to the significant digits, the sums of the chunks differ in the last digits by the order of the additions
+def roundSignificantDigits(value: float, significant_digits: int = cfg.profile_sum_significant_digits) -> float:
+    return float(f"{value:.{significant_digits}g}")
+
+# Function returns the column names of the quantile statistics, e.g. "P50" for the median
+def getQuantileColumnNames(quantiles: list = cfg.profile_quantiles) -> list:
+    return [f"P{round(quantile * 100):02d}" for quantile in quantiles]
+
+# Function returns the statistics of the column profiles as a dataframe, one row per column
+def getColumnProfileFrame(column_profiles: dict, quantiles: list = cfg.profile_quantiles) -> pd.DataFrame:
+    profile_records = []
+    for column, column_profile in column_profiles.items():
+        is_numeric, is_mixed = column_profile['kind'] == "numeric", column_profile['kind'] == "mixed"
+        profile_record = {
+            'Column': column,
+            'Type': column_profile['kind'] or "empty",
+            'Rows': column_profile['rows'],
+            'Nulls': column_profile['nulls'],
+            'Distinct': getHyperLogLogEstimate(column_profile['registers']),
+            'Min': None if is_mixed else column_profile['min'],
+            'Max': None if is_mixed else column_profile['max'],
+            'Sum': roundSignificantDigits(column_profile['sum']) if is_numeric else None
+        }
+        profile_record.update(zip(getQuantileColumnNames(quantiles), getSketchQuantiles(column_profile['sketch'], quantiles) if is_numeric else [None] * len(quantiles)))
+        profile_records.append(profile_record)
+    return pd.DataFrame(profile_records, columns=['Column', 'Type', 'Rows', 'Nulls', 'Distinct', 'Min', 'Max', 'Sum'] + getQuantileColumnNames(quantiles))
+
+# Function to profile the columns of the dataframe chunks in one pass, returns the column statistics and the count of records
+def profileDataFrameChunks(chunks, normalization_options: dict = None, hll_precision: int = cfg.profile_hll_precision, sketch_size: int = cfg.profile_quantile_sketch_size, quantiles: list = cfg.profile_quantiles) -> tuple:
+    column_profiles = {}
+    records_count = 0
+    for chunk in chunks:
+        checkCancellation()
+        chunk = normalizeDataFrame(chunk, normalization_options)
+        records_count += len(chunk)
+        for column in chunk.columns:
+            if(column not in column_profiles):
+                column_profiles[column] = getEmptyColumnProfile(hll_precision)
+            updateColumnProfile(column_profiles[column], chunk[column], sketch_size)
+    return getColumnProfileFrame(column_profiles, quantiles), records_count
+
+# Function to compare the column statistics of the source and target data, returns the source and target statistics with the differing values highlighted, and the count of source/target rows with differences
+def compareColumnProfiles(source_profile_df: pd.DataFrame, target_profile_df: pd.DataFrame) -> tuple:
+    # The columns of one side only are "missing" on the other side
+    columns = list(source_profile_df['Column']) + [column for column in target_profile_df['Column'] if column not in set(source_profile_df['Column'])]
+    aligned_profile_dfs = []
+    for profile_df, data_origin in [(source_profile_df, "Source"), (target_profile_df, "Target")]:
+        aligned_profile_df = profile_df.set_index('Column').reindex(columns)
+        aligned_profile_df['Type'] = aligned_profile_df['Type'].fillna("missing")
+        aligned_profile_dfs.append(addOriginAndIndexColumns(aligned_profile_df.reset_index(), data_origin))
+    return compareAlignedRecords(*aligned_profile_dfs, drop_equal_rows=True)
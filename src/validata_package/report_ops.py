@@ -0,0 +1,85 @@
+# Import packages and modules | External
+import re
+import json
+import math
+import zlib
+import base64
+import tempfile
+import pandas as pd
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.validation_ops import readFile
+
+# Report table properties
+table_classes = ['table', 'table-striped', 'table-hover']
+mismatch_cell_html = '<td style="background-color: #FF0000; color: white;">'
+
+# Function splits the report template into literal text and "#placeholder#" names
+def parseReportTemplate(template: str) -> list:
+    return re.split(r'#([a-z_]+)#', template)
+
+# Function yields the html table of dataframe in chunks of rows, with the mismatch cells highlighted
+def iterateDataFrameHtml(dataframe: pd.DataFrame, chunk_rows: int = cfg.report_chunk_rows):
+    table_html = ""
+    for start in range(0, max(len(dataframe), 1), chunk_rows):
+        table_html = dataframe.iloc[start:start + chunk_rows].to_html(index=False, classes=table_classes)
+        rows_start = table_html.index("<tbody>\n") + len("<tbody>\n")
+        rows_end = table_html.rindex("  </tbody>")
+        if(start == 0):
+            yield table_html[:rows_start]
+        yield table_html[rows_start:rows_end].replace('<td>:red', mismatch_cell_html)
+    yield table_html[rows_end:]
+
+# Function returns the json value of a cell, the infinite numbers are written as "inf" or "-inf" text like in the html tables, as json has no infinity
+def getJsonValue(value):
+    return str(value) if isinstance(value, float) and math.isinf(value) else value
+
+# Function yields the dataframe as compact columnar json, one column at a time, the missing values as null
+def iterateDataFrameJson(dataframe: pd.DataFrame):
+    yield '{"columns":' + json.dumps([str(column) for column in dataframe.columns]) + ',"values":['
+    for position in range(len(dataframe.columns)):
+        values = dataframe.iloc[:, position]
+        values_json = json.dumps([getJsonValue(value) for value in values.astype(object).where(values.notna(), None).tolist()], default=str, allow_nan=False)
+        yield ("," if position > 0 else "") + values_json.replace("</", "<\\/")
+    yield ']}'
+
+# Function yields the base64 text of the gzip compressed text chunks
+def iterateCompressedBase64(text_chunks):
+    compressor = zlib.compressobj(wbits=31)
+    pending_bytes = b""
+    for text_chunk in text_chunks:
+        pending_bytes += compressor.compress(text_chunk.encode('utf-8'))
+        encodable_length = len(pending_bytes) - len(pending_bytes) % 3
+        yield base64.b64encode(pending_bytes[:encodable_length]).decode('ascii')
+        pending_bytes = pending_bytes[encodable_length:]
+    yield base64.b64encode(pending_bytes + compressor.flush()).decode('ascii')
+
+# Function yields the dataframe table in the report table format : "html", "json" or "gzip-base64"
+def iterateDataFrameTable(dataframe: pd.DataFrame, table_format: str = "html", chunk_rows: int = cfg.report_chunk_rows):
+    if(table_format == "html"):
+        return iterateDataFrameHtml(dataframe, chunk_rows)
+    elif(table_format == "json"):
+        return iterateDataFrameJson(dataframe)
+    elif(table_format == "gzip-base64"):
+        return iterateCompressedBase64(iterateDataFrameJson(dataframe))
+    raise ValueError(f"Unknown report table format '{table_format}'.")
+
+# Function yields the report in chunks, filling the template placeholders with text or dataframe tables
+def iterateReport(template: str, report_values: dict, chunk_rows: int = cfg.report_chunk_rows, table_format: str = "html"):
+    for position, segment in enumerate(parseReportTemplate(template)):
+        if(position % 2 == 0):
+            yield segment
+        elif(segment not in report_values):
+            yield f"#{segment}#"
+        elif(isinstance(report_values[segment], pd.DataFrame)):
+            yield from iterateDataFrameTable(report_values[segment], table_format, chunk_rows)
+        else:
+            yield str(report_values[segment])
+
+# Function to write the report into a temporary "html" file, returns the file path
+def writeReportFile(template_fpath: str, report_values: dict, chunk_rows: int = cfg.report_chunk_rows, table_format: str = "html") -> str:
+    with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', suffix=".html", delete=False) as report_file:
+        for report_chunk in iterateReport(readFile(template_fpath), report_values, chunk_rows, table_format):
+            report_file.write(report_chunk)
+    return report_file.name
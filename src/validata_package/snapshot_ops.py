@@ -0,0 +1,116 @@
+# Import packages and modules | External
+import os
+import json
+import time
+import uuid
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.cache_ops import getCacheKey
+from validata_package.validation_ops import getDataFrameRowHashes
+from validata_package.normalization_ops import normalizeDataFrame, resolveDateColumns
+from validata_package.trace_ops import traceStage
+
+# File names of a baseline snapshot : the normalized data, the key to row hash index and the metadata
+snapshot_data_file_name = "data.parquet"
+snapshot_index_file_name = "index.parquet"
+snapshot_metadata_file_name = "snapshot.json"
+
+# Column of the row hash in the snapshot index
+row_hash_column = "_row_hash"
+
+# Function returns the baseline snapshot id of a source data file, from its digest and the options changing the snapshot contents
+def getBaselineSnapshotId(file_digest: str, sheet_name, columns: list, drop_columns: list, key_columns: list, normalization_options: dict, compact_types: bool) -> str:
+    return getCacheKey("snapshot", file_digest, sheet_name, columns, drop_columns, key_columns, normalization_options, compact_types)
+
+# Function returns the directory of the baseline snapshot
+def getBaselineSnapshotPath(snapshot_id: str, snapshot_path: str = cfg.snapshot_path) -> str:
+    return os.path.join(snapshot_path, snapshot_id)
+
+# Function returns True when the baseline snapshot is saved
+def hasBaselineSnapshot(snapshot_id: str, snapshot_path: str = cfg.snapshot_path) -> bool:
+    return os.path.exists(os.path.join(getBaselineSnapshotPath(snapshot_id, snapshot_path), snapshot_metadata_file_name))
+
+# Function returns the metadata of the baseline snapshot : source file, key columns, column names and types, count of records and date columns
+def readBaselineSnapshotMetadata(snapshot_id: str, snapshot_path: str = cfg.snapshot_path) -> dict:
+    with open(os.path.join(getBaselineSnapshotPath(snapshot_id, snapshot_path), snapshot_metadata_file_name), 'r', encoding='utf-8') as metadata_file:
+        return json.load(metadata_file)
+
+# Function to save the normalized source data as a baseline snapshot, a "parquet" copy in row groups with the row hash of every key, returns False when the data cannot be stored as "parquet" with the same column types
+def saveBaselineSnapshot(snapshot_id: str, source_data: pd.DataFrame, key_columns: list, normalization_options: dict = None, snapshot_metadata: dict = {}, snapshot_path: str = cfg.snapshot_path, row_group_size: int = cfg.snapshot_row_group_size) -> bool:
+    snapshot_directory = getBaselineSnapshotPath(snapshot_id, snapshot_path)
+    temp_snapshot_directory = f"{snapshot_directory}.{uuid.uuid4().hex}.tmp"
+    with traceStage("save snapshot", len(source_data)):
+        loaded_column_types = [str(dtype) for dtype in source_data.dtypes]
+        normalization_options = resolveDateColumns(normalization_options, [source_data])
+        source_data = normalizeDataFrame(source_data, normalization_options)
+        os.makedirs(temp_snapshot_directory)
+        try:
+            pq.write_table(pa.Table.from_pandas(source_data, preserve_index=False), os.path.join(temp_snapshot_directory, snapshot_data_file_name), compression="zstd", row_group_size=row_group_size)
+
+            # The row hashes of the snapshot are only comparable when its data is read back with the same column types
+            column_types = [str(dtype) for dtype in source_data.dtypes]
+            if([str(dtype) for dtype in pq.read_schema(os.path.join(temp_snapshot_directory, snapshot_data_file_name)).empty_table().to_pandas().dtypes] != column_types):
+                raise ValueError("The column types of the snapshot data are not preserved.")
+
+            index_df = source_data[key_columns].assign(**{row_hash_column: getDataFrameRowHashes(source_data).values})
+            pq.write_table(pa.Table.from_pandas(index_df, preserve_index=False), os.path.join(temp_snapshot_directory, snapshot_index_file_name), compression="zstd")
+            with open(os.path.join(temp_snapshot_directory, snapshot_metadata_file_name), 'w', encoding='utf-8') as metadata_file:
+                json.dump({**snapshot_metadata, 'snapshot_id': snapshot_id, 'key_columns': key_columns, 'columns': [str(column) for column in source_data.columns], 'loaded_column_types': loaded_column_types, 'column_types': column_types, 'records': len(source_data), 'date_columns': normalization_options.get('date_columns', []), 'created_at': time.time()}, metadata_file, default=str)
+            os.rename(temp_snapshot_directory, snapshot_directory)
+        except (pa.ArrowException, ValueError, TypeError, OSError):
+            # Data not stored as "parquet" is compared from the source file, a snapshot saved first by another session is kept
+            shutil.rmtree(temp_snapshot_directory, ignore_errors=True)
+            return False
+    return True
+
+# Function returns the snapshot table as dataframe, the missing text values are read back as NaN like the normalized data
+def getSnapshotDataFrame(table: pa.Table) -> pd.DataFrame:
+    dataframe = table.to_pandas()
+    for column in dataframe.columns:
+        if(dataframe[column].dtype == object):
+            dataframe[column] = dataframe[column].where(dataframe[column].notna(), np.nan)
+    return dataframe
+
+# Function returns the whole data of the baseline snapshot
+def readBaselineSnapshot(snapshot_id: str, snapshot_path: str = cfg.snapshot_path) -> pd.DataFrame:
+    return getSnapshotDataFrame(pq.read_table(os.path.join(getBaselineSnapshotPath(snapshot_id, snapshot_path), snapshot_data_file_name), memory_map=True))
+
+# Function returns the first records of the baseline snapshot, reading only the first row group
+def readBaselineSnapshotPreview(snapshot_id: str, rows_count: int = 5, snapshot_path: str = cfg.snapshot_path) -> pd.DataFrame:
+    parquet_file = pq.ParquetFile(os.path.join(getBaselineSnapshotPath(snapshot_id, snapshot_path), snapshot_data_file_name))
+    if(parquet_file.metadata.num_row_groups == 0):
+        return getSnapshotDataFrame(parquet_file.schema_arrow.empty_table())
+    return getSnapshotDataFrame(parquet_file.read_row_group(0).slice(0, rows_count))
+
+# Function returns the key columns and row hash of every record of the baseline snapshot, in the record order
+def readBaselineSnapshotIndex(snapshot_id: str, snapshot_path: str = cfg.snapshot_path) -> pd.DataFrame:
+    return pq.read_table(os.path.join(getBaselineSnapshotPath(snapshot_id, snapshot_path), snapshot_index_file_name), memory_map=True).to_pandas()
+
+# Function returns the records of the baseline snapshot at the given positions, reading only the row groups holding them
+def readBaselineSnapshotRows(snapshot_id: str, positions: np.ndarray, snapshot_path: str = cfg.snapshot_path) -> pd.DataFrame:
+    parquet_file = pq.ParquetFile(os.path.join(getBaselineSnapshotPath(snapshot_id, snapshot_path), snapshot_data_file_name))
+    row_group_starts = np.cumsum([0] + [parquet_file.metadata.row_group(row_group).num_rows for row_group in range(parquet_file.metadata.num_row_groups)])
+    position_row_groups = np.searchsorted(row_group_starts, positions, side='right') - 1
+    row_groups = np.unique(position_row_groups)
+
+    # Positions in the table of the read row groups
+    read_row_group_starts = np.cumsum([0] + [row_group_starts[row_group + 1] - row_group_starts[row_group] for row_group in row_groups])
+    table_positions = positions - row_group_starts[position_row_groups] + read_row_group_starts[np.searchsorted(row_groups, position_row_groups)]
+    table = parquet_file.read_row_groups(row_groups.tolist()) if len(row_groups) > 0 else parquet_file.schema_arrow.empty_table()
+    return getSnapshotDataFrame(table.take(pa.array(table_positions, type=pa.int64())))
+
+# Function returns the error and hint messages when the target data cannot be compared with the baseline snapshot, None when it can; the column types are checked as loaded, before the normalization
+def getSnapshotComparisonError(snapshot_metadata: dict, target_data: pd.DataFrame, key_columns: list, compact_types: bool = False) -> tuple:
+    if(snapshot_metadata['records'] != len(target_data) and key_columns == []):
+        return "The dimensionality of the source and target data are not matching, please check and try again.", "Hint: By giving key column(s) input, this error can be avoided."
+    elif(len(snapshot_metadata['columns']) != len(target_data.columns)):
+        return "The count of columns from the source and target data are not matching, please check and try again.", None
+    elif(not compact_types and snapshot_metadata['loaded_column_types'] != [str(dtype) for dtype in target_data.dtypes]):
+        return "The data type of columns from the source and target data are not matching, please check and try again.", None
+    return None, None
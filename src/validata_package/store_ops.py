@@ -0,0 +1,104 @@
+# Import packages and modules | External
+import os
+import json
+import uuid
+import shutil
+import threading
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.catalog_ops import getCatalogFilePath, getArtifactRecord, addArtifacts, touchArtifact, removeArtifact, getArtifactsSize, getLeastRecentlyUsedArtifacts
+
+# File names of a stored result
+stored_report_file_name = "report.html"
+stored_summary_file_name = "summary.json"
+
+# Result store state, the eviction is serialized across the sessions of the server process
+store_lock = threading.Lock()
+
+# Function returns the directory of the stored result of the result key, grouped by the first characters of the key
+def getStoredResultPath(result_key: str, store_path: str = cfg.result_store_path) -> str:
+    return os.path.join(store_path, result_key[:2], result_key)
+
+# Function returns the report file path and summary of the stored result of the key, None when not stored; reading the result marks it as recently used
+def getStoredResult(result_key: str, store_path: str = cfg.result_store_path) -> tuple:
+    result_path = getStoredResultPath(result_key, store_path)
+    try:
+        with open(os.path.join(result_path, stored_summary_file_name), 'r', encoding='utf-8') as summary_file:
+            summary = json.load(summary_file)
+    except (OSError, ValueError):
+        return None
+    indexStoredResults(store_path)
+    touchArtifact(result_key, store_path)
+    return os.path.join(result_path, stored_report_file_name), summary
+
+# Function returns the last used time, size in bytes and directory of every stored result
+def getStoredResults(store_path: str = cfg.result_store_path) -> list:
+    stored_results = []
+    if(not os.path.isdir(store_path)):
+        return stored_results
+    for group_entry in os.scandir(store_path):
+        if(not group_entry.is_dir()):
+            continue
+        for result_entry in os.scandir(group_entry.path):
+            # Results still being written are skipped
+            if(not result_entry.is_dir() or result_entry.name.endswith(".tmp")):
+                continue
+            try:
+                last_used_time = os.path.getmtime(os.path.join(result_entry.path, stored_summary_file_name))
+                result_size = sum(file_entry.stat().st_size for file_entry in os.scandir(result_entry.path))
+            except OSError:
+                continue
+            stored_results.append((last_used_time, result_size, result_entry.path))
+    return stored_results
+
+# Function to add the stored results to a new artifact catalog, the results stored before the catalog existed are only found by scanning the store once
+def indexStoredResults(store_path: str = cfg.result_store_path) -> None:
+    if(os.path.exists(getCatalogFilePath(store_path))):
+        return
+    artifact_records = []
+    for last_used_time, result_size, result_path in getStoredResults(store_path):
+        with open(os.path.join(result_path, stored_summary_file_name), 'r', encoding='utf-8') as summary_file:
+            summary = json.load(summary_file)
+        artifact_records.append(getArtifactRecord(os.path.basename(result_path), os.path.relpath(os.path.join(result_path, stored_report_file_name), store_path), result_size, summary, last_used_time))
+    addArtifacts(artifact_records, store_path)
+
+# Function to evict the least recently used stored results above the disk quota, found in the artifact catalog without scanning the store
+def evictStoredResults(store_path: str = cfg.result_store_path, max_disk_mb: int = cfg.result_store_max_disk_mb) -> None:
+    max_size_in_bytes = max_disk_mb * 1024 * 1024
+    with store_lock:
+        store_size_in_bytes = getArtifactsSize(store_path)
+        while(store_size_in_bytes > max_size_in_bytes):
+            evicted_artifacts = getLeastRecentlyUsedArtifacts(cfg.catalog_page_size, store_path)
+            if(evicted_artifacts == []):
+                break
+            for result_key, result_size, report_path in evicted_artifacts:
+                if(store_size_in_bytes <= max_size_in_bytes):
+                    break
+                shutil.rmtree(os.path.dirname(os.path.join(store_path, report_path)), ignore_errors=True)
+                removeArtifact(result_key, store_path)
+                store_size_in_bytes -= result_size
+
+# Function to store a copy of the report file and the summary under the result key, evicting the least recently used results above the disk quota
+def putStoredResult(result_key: str, report_fpath: str, summary: dict, store_path: str = cfg.result_store_path, max_disk_mb: int = cfg.result_store_max_disk_mb) -> bool:
+    if(os.path.getsize(report_fpath) > max_disk_mb * 1024 * 1024):
+        return False
+
+    # The result is written into a temporary directory and renamed, so that a reader never sees a partial result
+    indexStoredResults(store_path)
+    result_path = getStoredResultPath(result_key, store_path)
+    temp_result_path = f"{result_path}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(temp_result_path)
+    try:
+        shutil.copyfile(report_fpath, os.path.join(temp_result_path, stored_report_file_name))
+        with open(os.path.join(temp_result_path, stored_summary_file_name), 'w', encoding='utf-8') as summary_file:
+            json.dump(summary, summary_file, default=str)
+        result_size = sum(file_entry.stat().st_size for file_entry in os.scandir(temp_result_path))
+        os.rename(temp_result_path, result_path)
+    except OSError:
+        # The same result was stored first by another session or process, or the store is not writable
+        shutil.rmtree(temp_result_path, ignore_errors=True)
+        return False
+    addArtifacts([getArtifactRecord(result_key, os.path.relpath(os.path.join(result_path, stored_report_file_name), store_path), result_size, summary)], store_path)
+    evictStoredResults(store_path, max_disk_mb)
+    return True
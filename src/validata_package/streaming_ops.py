@@ -0,0 +1,225 @@
+# Import packages and modules | External
+import bisect
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+from validata_package.validation_ops import compareDataFrames, getColumnsFilter, getDuplicateKeyStatistics, applyDuplicateKeyPolicy, key_occurrence_column
+from validata_package.normalization_ops import normalizeDataFrame, resolveDateColumns
+from validata_package.trace_ops import traceStage, checkCancellation, updatePartialResult
+
+# Function returns True when the file is a "parquet" file (uploaded file, file object or file path)
+def isParquetFile(file) -> bool:
+    return str(file.name if hasattr(file, "name") else file).endswith(".parquet")
+
+# Function returns the "csv" or "parquet" file contents as an iterator of dataframe chunks, with the given column data types
+def readDataFrameChunks(file, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = [], column_types: dict = None):
+    if(hasattr(file, "seek")):
+        file.seek(0)
+    columns_filter = getColumnsFilter(columns, drop_columns)
+    if(isParquetFile(file)):
+        parquet_file = pq.ParquetFile(file)
+        column_names = [column for column in parquet_file.schema_arrow.names if columns_filter is None or columns_filter(column)]
+        for record_batch in parquet_file.iter_batches(batch_size=chunk_size, columns=column_names):
+            chunk = record_batch.to_pandas()
+            yield chunk if column_types is None else chunk.astype({column: column_types[column] for column in chunk.columns if column in column_types})
+    else:
+        yield from pd.read_csv(file, chunksize=chunk_size, usecols=columns_filter, dtype=column_types)
+
+# Function returns the first records of a data file, an empty dataframe when the file has no records
+def readDataFrameSample(file, sample_rows: int, drop_columns: list = [], columns: list = [], column_types: dict = None) -> pd.DataFrame:
+    chunks = readDataFrameChunks(file, sample_rows, drop_columns, columns, column_types)
+    try:
+        return next(chunks, pd.DataFrame())
+    finally:
+        chunks.close()
+
+# Function returns the common data type of two column data types, as "csv" type inference would give for the values of both
+def getCommonColumnType(dtype1, dtype2):
+    if(dtype1 == dtype2):
+        return dtype1
+    if(pd.api.types.is_numeric_dtype(dtype1) and pd.api.types.is_numeric_dtype(dtype2) and not pd.api.types.is_bool_dtype(dtype1) and not pd.api.types.is_bool_dtype(dtype2)):
+        return np.result_type(dtype1, dtype2)
+    return np.dtype(object)
+
+# Function returns the key columns of a dataframe as an index of tuples in the key order : the text keys are compared as text, the numeric key columns as numbers, and the empty keys after every other key
+def getKeyIndex(dataframe: pd.DataFrame, key_columns: list, numeric_key_columns: list = []) -> pd.MultiIndex:
+    order_values = {}
+    for position, column in enumerate(key_columns):
+        values = dataframe[column]
+        order_values[f"is_null_{position}"] = values.isna().values
+        order_values[f"key_{position}"] = pd.to_numeric(values).fillna(0).values if column in numeric_key_columns else values.fillna("").astype(str).values
+    return pd.MultiIndex.from_frame(pd.DataFrame(order_values))
+
+# Function returns True when the keys of the chunk are sorted and continue from the last key of the previous chunk
+def isSortedKeyIndex(key_index: pd.MultiIndex, last_key) -> bool:
+    return key_index.is_monotonic_increasing and (last_key is None or len(key_index) == 0 or not key_index[0] < last_key)
+
+# Function returns the column data types of a key sorted "csv" file, the key columns holding numbers only, and whether the file is sorted with these columns compared as numbers or with every key compared as text
+def getSortedFileColumnTypes(file, key_columns: list, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = []) -> tuple:
+    column_types, numeric_key_columns = {}, list(key_columns)
+    key_orders = {"numeric": (True, None), "text": (True, None)}
+    for chunk in readDataFrameChunks(file, chunk_size, drop_columns, columns, {column: str for column in key_columns}):
+        checkCancellation()
+        # The type of a column is only known after every chunk is read
+        for column, dtype in chunk.dtypes.items():
+            if(column not in key_columns):
+                column_types[column] = dtype if column not in column_types else getCommonColumnType(column_types[column], dtype)
+
+        # A key column with text values is compared as text, the numeric order checked on the previous chunks does not hold any more
+        chunk_numeric_key_columns = [column for column in numeric_key_columns if pd.to_numeric(chunk[column], errors='coerce').notna().sum() == chunk[column].notna().sum()]
+        if(chunk_numeric_key_columns != numeric_key_columns):
+            if(key_orders["numeric"][1] is not None):
+                key_orders["numeric"] = (False, None)
+            numeric_key_columns = chunk_numeric_key_columns
+        for key_order, order_numeric_key_columns in [("numeric", numeric_key_columns), ("text", [])]:
+            is_sorted, last_key = key_orders[key_order]
+            if(is_sorted):
+                key_index = getKeyIndex(chunk, key_columns, order_numeric_key_columns)
+                key_orders[key_order] = (isSortedKeyIndex(key_index, last_key), key_index[-1] if len(key_index) > 0 else last_key)
+    return column_types, numeric_key_columns, {key_order: is_sorted for key_order, (is_sorted, last_key) in key_orders.items()}
+
+# Function returns the column data types of both key sorted "csv" files and the key columns compared as numbers, from one pass over both files : the key columns are read as text, the other columns with the same type in every chunk of both files
+def getSortedFilesColumnTypes(source_file, target_file, key_columns: list, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = []) -> tuple:
+    source_column_types, source_numeric_key_columns, source_key_orders = getSortedFileColumnTypes(source_file, key_columns, chunk_size, drop_columns, columns)
+    target_column_types, target_numeric_key_columns, target_key_orders = getSortedFileColumnTypes(target_file, key_columns, chunk_size, drop_columns, columns)
+    for column in set(source_column_types).intersection(target_column_types):
+        source_column_types[column] = target_column_types[column] = getCommonColumnType(source_column_types[column], target_column_types[column])
+    for column_types in [source_column_types, target_column_types]:
+        column_types.update({column: str for column in key_columns})
+
+    # The numeric key order is used when both files hold numbers in the same key columns and are sorted by their values, the text order otherwise
+    if(source_key_orders["numeric"] and target_key_orders["numeric"] and source_numeric_key_columns == target_numeric_key_columns):
+        return source_column_types, target_column_types, source_numeric_key_columns
+    if(source_key_orders["text"] and target_key_orders["text"]):
+        return source_column_types, target_column_types, []
+    for key_orders, data_origin in [(source_key_orders, "Source"), (target_key_orders, "Target")]:
+        if(not any(key_orders.values())):
+            raise ValueError(f"The {data_origin.lower()} data is not sorted by the key columns {key_columns}.")
+    raise ValueError(f"The source and target data are not sorted in the same order by the key columns {key_columns}, please sort both by the key values as text or both as numbers.")
+
+# Function appends the next chunk of a key sorted iterator to the buffered records
+def fetchNextSortedChunk(chunks, buffer_df: pd.DataFrame, key_columns: list, data_origin: str, numeric_key_columns: list = []) -> tuple:
+    chunk = next(chunks, None)
+    if(chunk is None):
+        return buffer_df, 0, True
+
+    # Check the chunk is sorted and continues from the buffered records
+    chunk_key_index = getKeyIndex(chunk, key_columns, numeric_key_columns)
+    last_key = getKeyIndex(buffer_df.tail(1), key_columns, numeric_key_columns)[0] if buffer_df is not None and len(buffer_df) > 0 else None
+    if(not isSortedKeyIndex(chunk_key_index, last_key)):
+        raise ValueError(f"The {data_origin.lower()} data is not sorted by the key columns {key_columns}.")
+
+    if(buffer_df is None or len(buffer_df) == 0):
+        return chunk.reset_index(drop=True), len(chunk), False
+    return pd.concat([buffer_df, chunk], ignore_index=True), len(chunk), False
+
+# Function splits the buffered records into the rows below the key boundary and the remaining rows
+def splitAtKeyBoundary(buffer_df: pd.DataFrame, key_columns: list, key_boundary, numeric_key_columns: list = []) -> tuple:
+    if(key_boundary is None):
+        return buffer_df, buffer_df.iloc[0:0]
+    boundary_position = bisect.bisect_left(getKeyIndex(buffer_df, key_columns, numeric_key_columns), key_boundary)
+    return buffer_df.iloc[:boundary_position], buffer_df.iloc[boundary_position:].reset_index(drop=True)
+
+# Function drops the key matched rows having equal values in source and target
+def dropEqualMatchedRecords(validation_result_df: pd.DataFrame, key_columns: list) -> pd.DataFrame:
+    has_difference = validation_result_df['_merge'] != 'both'
+    for column in validation_result_df.columns:
+        if(column in key_columns or not str(column).endswith("_source")):
+            continue
+        source_values = validation_result_df[column]
+        target_values = validation_result_df[str(column)[:-7] + "_target"]
+        has_difference = has_difference | ~((source_values == target_values) | (source_values.isna() & target_values.isna()))
+    return validation_result_df[has_difference]
+
+# Function yields the merge results and duplicate key statistics of two key sorted chunk iterators, walking both in lock-step like a merge join
+def compareSortedDataFrameChunks(source_chunks, target_chunks, key_columns: list, duplicate_key_policy: str = cfg.duplicate_key_policy, numeric_key_columns: list = []):
+    source_chunks, target_chunks = iter(source_chunks), iter(target_chunks)
+    source_buffer_df, target_buffer_df = None, None
+    source_exhausted, target_exhausted = False, False
+    source_records_count, target_records_count = 0, 0
+
+    while(True):
+        checkCancellation()
+
+        # Read the next chunk for every side with no buffered records
+        if(not source_exhausted and (source_buffer_df is None or len(source_buffer_df) == 0)):
+            source_buffer_df, records_count, source_exhausted = fetchNextSortedChunk(source_chunks, source_buffer_df, key_columns, "Source", numeric_key_columns)
+            source_records_count += records_count
+        if(not target_exhausted and (target_buffer_df is None or len(target_buffer_df) == 0)):
+            target_buffer_df, records_count, target_exhausted = fetchNextSortedChunk(target_chunks, target_buffer_df, key_columns, "Target", numeric_key_columns)
+            target_records_count += records_count
+        if(source_buffer_df is None and target_buffer_df is None):
+            break
+
+        # An empty side has the columns of the other side
+        if(source_buffer_df is None):
+            source_buffer_df = target_buffer_df.iloc[0:0]
+        if(target_buffer_df is None):
+            target_buffer_df = source_buffer_df.iloc[0:0]
+
+        # Rows below the smallest last buffered key cannot have a match in the unread chunks
+        last_keys = []
+        if(not source_exhausted and len(source_buffer_df) > 0):
+            last_keys.append(getKeyIndex(source_buffer_df.tail(1), key_columns, numeric_key_columns)[0])
+        if(not target_exhausted and len(target_buffer_df) > 0):
+            last_keys.append(getKeyIndex(target_buffer_df.tail(1), key_columns, numeric_key_columns)[0])
+        key_boundary = min(last_keys) if last_keys != [] else None
+
+        source_ready_df, source_buffer_df = splitAtKeyBoundary(source_buffer_df, key_columns, key_boundary, numeric_key_columns)
+        target_ready_df, target_buffer_df = splitAtKeyBoundary(target_buffer_df, key_columns, key_boundary, numeric_key_columns)
+
+        if(len(source_ready_df) > 0 or len(target_ready_df) > 0):
+            # Every record of a key is in the ready rows, so the duplicate keys are handled chunk by chunk
+            duplicate_key_statistics = getDuplicateKeyStatistics(source_ready_df, target_ready_df, key_columns)
+            source_ready_df, target_ready_df, merge_key_columns = applyDuplicateKeyPolicy(source_ready_df, target_ready_df, key_columns, duplicate_key_statistics, duplicate_key_policy)
+            yield compareDataFrames(source_ready_df, target_ready_df, merge_key_columns), source_records_count, target_records_count, duplicate_key_statistics
+            source_records_count, target_records_count = 0, 0
+
+        if(source_exhausted and target_exhausted):
+            break
+
+        # Every buffered row shares the boundary key, so read further on the lagging side(s)
+        if(len(source_ready_df) == 0 and len(target_ready_df) == 0):
+            if(not source_exhausted and getKeyIndex(source_buffer_df.tail(1), key_columns, numeric_key_columns)[0] == key_boundary):
+                source_buffer_df, records_count, source_exhausted = fetchNextSortedChunk(source_chunks, source_buffer_df, key_columns, "Source", numeric_key_columns)
+                source_records_count += records_count
+            if(not target_exhausted and getKeyIndex(target_buffer_df.tail(1), key_columns, numeric_key_columns)[0] == key_boundary):
+                target_buffer_df, records_count, target_exhausted = fetchNextSortedChunk(target_chunks, target_buffer_df, key_columns, "Target", numeric_key_columns)
+                target_records_count += records_count
+
+# Function to combine the merge results of the compared chunks, keeping only the rows with differences, returns the differences with the total source/target/matched records and duplicate key statistics
+def combineChunkValidationResults(chunk_results, key_columns: list) -> tuple:
+    validation_result_dfs = []
+    total_source_records, total_target_records, total_matched_records = 0, 0, 0
+    total_duplicate_key_statistics = None
+    for validation_result_df, source_records_count, target_records_count, duplicate_key_statistics in chunk_results:
+        total_source_records += source_records_count
+        total_target_records += target_records_count
+        total_matched_records += int((validation_result_df['_merge'] == 'both').sum())
+        if(duplicate_key_statistics is not None):
+            total_duplicate_key_statistics = {name: (total_duplicate_key_statistics or {}).get(name, 0) + count for name, count in duplicate_key_statistics.items()}
+        difference_records_df = dropEqualMatchedRecords(validation_result_df, key_columns + [key_occurrence_column])
+        updatePartialResult(validation_result_df, difference_records_df)
+        validation_result_dfs.append(difference_records_df)
+
+    validation_result_df = pd.concat(validation_result_dfs, ignore_index=True) if validation_result_dfs != [] else pd.DataFrame(columns=['_merge'])
+
+    # Chunks without duplicate keys have no occurrence numbers, their records are the first occurrences
+    if(key_occurrence_column in validation_result_df.columns):
+        validation_result_df[key_occurrence_column] = validation_result_df[key_occurrence_column].fillna(0).astype(int)
+
+    # Return results
+    return validation_result_df, total_source_records, total_target_records, total_matched_records, total_duplicate_key_statistics
+
+# Function to compare two key sorted "csv" files in chunks, keeping only the rows with differences
+def compareSortedFiles(source_file, target_file, key_columns: list, chunk_size: int = cfg.stream_chunk_size, drop_columns: list = [], columns: list = [], normalization_options: dict = None, duplicate_key_policy: str = cfg.duplicate_key_policy) -> tuple:
+    # Every chunk is read with the column types of the whole files, so that the keys and values of the chunks compare alike
+    with traceStage("infer types"):
+        source_column_types, target_column_types, numeric_key_columns = getSortedFilesColumnTypes(source_file, target_file, key_columns, chunk_size, drop_columns, columns)
+    normalization_options = resolveDateColumns(normalization_options, [readDataFrameSample(source_file, cfg.normalize_dates_sample_rows, drop_columns, columns, source_column_types), readDataFrameSample(target_file, cfg.normalize_dates_sample_rows, drop_columns, columns, target_column_types)])
+    source_chunks = (normalizeDataFrame(chunk, normalization_options) for chunk in readDataFrameChunks(source_file, chunk_size, drop_columns, columns, source_column_types))
+    target_chunks = (normalizeDataFrame(chunk, normalization_options) for chunk in readDataFrameChunks(target_file, chunk_size, drop_columns, columns, target_column_types))
+    return combineChunkValidationResults(compareSortedDataFrameChunks(source_chunks, target_chunks, key_columns, duplicate_key_policy, numeric_key_columns), key_columns)
@@ -0,0 +1,165 @@
+# Import packages and modules | External
+import json
+import time
+import threading
+import tracemalloc
+import contextvars
+import pandas as pd
+from contextlib import contextmanager
+from concurrent.futures import CancelledError
+
+# Import packages and modules | Internal
+from validata_package import config as cfg
+
+# Trace state, every session thread records into its own trace
+current_trace = contextvars.ContextVar("current_trace", default=None)
+current_spans = contextvars.ContextVar("current_spans", default=())
+current_memory_tracing = contextvars.ContextVar("current_memory_tracing", default=False)
+current_cancel_event = contextvars.ContextVar("current_cancel_event", default=None)
+current_partial_result = contextvars.ContextVar("current_partial_result", default=None)
+
+# Memory tracing state, tracemalloc is process wide so only one trace at a time traces the memory
+memory_tracing_lock = threading.Lock()
+
+# Result labels of the merge indicator values in the sample of the first differences
+merge_result_labels = {'both': "Mismatch", 'left_only': "Source only", 'right_only': "Target only"}
+
+# Function to start recording the stage spans of a new trace, returns the trace
+def startTrace(trace_memory: bool = cfg.trace_memory, cancel_event = None) -> list:
+    # Memory tracing slows down the Python-heavy stages, the traces started while another trace traces the memory record no peak memory
+    if(current_memory_tracing.get()):
+        stopMemoryTracing()
+    current_memory_tracing.set(trace_memory and memory_tracing_lock.acquire(blocking=False))
+    if(current_memory_tracing.get()):
+        tracemalloc.start()
+    trace = []
+    current_trace.set(trace)
+    current_spans.set(())
+    current_cancel_event.set(cancel_event)
+    return trace
+
+# Function to stop the memory tracing of the current trace, so that the next trace can trace the memory
+def stopMemoryTracing() -> None:
+    tracemalloc.stop()
+    current_memory_tracing.set(False)
+    memory_tracing_lock.release()
+
+# Function to stop recording the stage spans, returns the recorded trace
+def stopTrace() -> list:
+    trace = current_trace.get()
+    current_trace.set(None)
+    if(current_memory_tracing.get()):
+        stopMemoryTracing()
+    return trace if trace is not None else []
+
+# Function returns a copy of the stage spans recorded so far in the current trace
+def getCurrentTrace() -> list:
+    trace = current_trace.get()
+    return list(trace) if trace is not None else []
+
+# Function to stop the stages of a cancelled job, checked when a stage starts and when its progress is recorded
+def checkCancellation() -> None:
+    cancel_event = current_cancel_event.get()
+    if(cancel_event is not None and cancel_event.is_set()):
+        raise CancelledError("The validation was cancelled.")
+
+# Function to record the progress of the innermost running stage, as the fraction of its chunks or partitions done
+def setStageProgress(progress: float) -> None:
+    checkCancellation()
+    running_spans = current_spans.get()
+    if(running_spans != ()):
+        running_spans[-1]['progress'] = round(min(progress, 1.0), 4)
+
+# Function returns the progress of every stage of the trace, the finished stages are done
+def getTraceProgress(trace: list) -> list:
+    return [{'stage': span['stage'], 'progress': 1.0 if 'wall_time_in_secs' in span else span.get('progress', 0.0)} for span in list(trace)]
+
+# Function to start recording the running counts and first differences of the comparison, returns the partial result
+def startPartialResult(sample_size: int = cfg.partial_result_sample_size) -> dict:
+    partial_result = {'compared_chunks': 0, 'matched_records': 0, 'mismatched_records': 0, 'source_only_records': 0, 'target_only_records': 0, 'sample_size': sample_size, 'difference_sample': None}
+    current_partial_result.set(partial_result)
+    return partial_result
+
+# Function to add the record counts and the records with differences of a compared chunk or partition to the partial result, the records with differences start with their "Result" column
+def addPartialResult(matched_records: int, mismatched_records: int, source_only_records: int, target_only_records: int, difference_records_df: pd.DataFrame) -> None:
+    partial_result = current_partial_result.get()
+    if(partial_result is None):
+        return
+    partial_result['compared_chunks'] += 1
+    partial_result['matched_records'] += matched_records
+    partial_result['mismatched_records'] += mismatched_records
+    partial_result['source_only_records'] += source_only_records
+    partial_result['target_only_records'] += target_only_records
+
+    # Keep the first differences up to the sample size
+    difference_sample_df = partial_result['difference_sample']
+    missing_rows = partial_result['sample_size'] - (0 if difference_sample_df is None else len(difference_sample_df))
+    if(missing_rows > 0 and len(difference_records_df) > 0):
+        new_sample_df = difference_records_df.head(missing_rows)
+        partial_result['difference_sample'] = new_sample_df.reset_index(drop=True) if difference_sample_df is None else pd.concat([difference_sample_df, new_sample_df], ignore_index=True)
+
+# Function to add the merge result of a compared chunk or partition to the partial result, with the rows having differences
+def updatePartialResult(validation_result_df: pd.DataFrame, difference_records_df: pd.DataFrame) -> None:
+    partial_result = current_partial_result.get()
+    if(partial_result is None):
+        return
+    merge_counts = validation_result_df['_merge'].value_counts()
+    mismatched_records = int((difference_records_df['_merge'] == 'both').sum())
+    difference_records_df = difference_records_df.head(partial_result['sample_size'])
+    difference_records_df = pd.concat([difference_records_df['_merge'].astype(str).map(merge_result_labels).rename("Result"), difference_records_df.drop(columns=['_merge'])], axis=1)
+    addPartialResult(int(merge_counts.get('both', 0)), mismatched_records, int(merge_counts.get('left_only', 0)), int(merge_counts.get('right_only', 0)), difference_records_df)
+
+# Function to record the wall time, CPU time, peak traced memory and row count of a stage into the current trace
+@contextmanager
+def traceStage(stage: str, rows: int = None):
+    checkCancellation()
+    trace = current_trace.get()
+    span = {'stage': stage, 'rows': rows}
+    if(trace is None):
+        yield span
+        return
+    trace.append(span)
+    is_memory_tracing = current_memory_tracing.get()
+
+    # Nested stages are recorded under the name of their parent stages
+    parent_spans = current_spans.get()
+    if(parent_spans != ()):
+        span['stage'] = f"{parent_spans[-1]['stage']} > {stage}"
+        if(is_memory_tracing):
+            parent_spans[-1]['peak_memory_in_bytes'] = max(parent_spans[-1]['peak_memory_in_bytes'], tracemalloc.get_traced_memory()[1])
+    spans_token = current_spans.set(parent_spans + (span,))
+    if(is_memory_tracing):
+        tracemalloc.reset_peak()
+    span['peak_memory_in_bytes'] = 0
+    start_time, start_cpu_time = time.perf_counter(), time.thread_time()
+    try:
+        yield span
+    finally:
+        span['wall_time_in_secs'] = round(time.perf_counter() - start_time, 4)
+        span['cpu_time_in_secs'] = round(time.thread_time() - start_cpu_time, 4)
+        current_spans.reset(spans_token)
+        span.pop('progress', None)
+        peak_memory_in_bytes = span.pop('peak_memory_in_bytes')
+        if(is_memory_tracing):
+            peak_memory_in_bytes = max(peak_memory_in_bytes, tracemalloc.get_traced_memory()[1])
+            span['peak_memory_in_mb'] = round(peak_memory_in_bytes / 1024 / 1024, 2)
+            if(parent_spans != ()):
+                parent_spans[-1]['peak_memory_in_bytes'] = max(parent_spans[-1]['peak_memory_in_bytes'], peak_memory_in_bytes)
+        else:
+            span['peak_memory_in_mb'] = None
+
+# Function returns the trace as a dataframe, one row per stage in the order the stages started
+def getTraceDataFrame(trace: list) -> pd.DataFrame:
+    trace_df = pd.DataFrame(trace, columns=['stage', 'wall_time_in_secs', 'cpu_time_in_secs', 'peak_memory_in_mb', 'rows'])
+    trace_df.columns = ["Stage", "Wall Time (secs)", "CPU Time (secs)", "Peak Memory (MB)", "Rows"]
+    return trace_df
+
+# Function returns the trace as a "json" text, for profiling tools
+def getTraceJson(trace: list) -> str:
+    return json.dumps({'stages': trace}, indent=4, default=str)
+
+# Function returns the trace as an html table for the report
+def getTraceHtml(trace: list) -> str:
+    if(trace is None or trace == []):
+        return "<p>No stage timings recorded</p>"
+    return getTraceDataFrame(trace).to_html(index=False, na_rep="", classes=['table', 'table-striped', 'table-hover'])
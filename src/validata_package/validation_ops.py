@@ -2,11 +2,18 @@
 import os
 import hashlib
 import datetime
+import importlib.util
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import streamlit as st
 
 # Import packages and modules | Internal
 from validata_package import config as cfg
+from validata_package.catalog_ops import getArtifacts
+
+# Column numbering the records of a duplicate key, added to the key columns by the "occurrence" duplicate key policy
+key_occurrence_column = "Key Occurrence"
 
 # Function returns current datetime as string data type
 def getCurrentDateTimeAsString() -> str:
@@ -25,14 +32,66 @@ def writeDataFrameToCSV(dataframe, fpath) -> bool:
         st.write(error)
         return False
 
-# Function to write data into a "csv" from dataframe
-def readDataFrameFromCSV(fpath) -> pd.DataFrame:
-    try:
-        dataframe = pd.read_csv(fpath)
-        return dataframe
-    except Exception as error:
-        st.write(error)
-        return pd.DataFrame()
+# Function returns the filter of the columns to read, None to read all columns
+def getColumnsFilter(columns: list = [], drop_columns: list = []):
+    if(columns == [] and drop_columns == []):
+        return None
+    return lambda column: (columns == [] or column in columns) and column not in drop_columns
+
+# Function to read data from a "csv" into dataframe, the read errors are raised to the caller
+def readDataFrameFromCSV(fpath, nrows: int = None, columns: list = [], drop_columns: list = [], compact_types: bool = False) -> pd.DataFrame:
+    if(compact_types):
+        # Compact every chunk while reading, so that the peak memory stays near the compact size
+        chunks = pd.read_csv(fpath, nrows=nrows, usecols=getColumnsFilter(columns, drop_columns), chunksize=cfg.stream_chunk_size)
+        return compactDataFrameTypes(pd.concat([compactDataFrameTypes(chunk, categorical_ratio=0) for chunk in chunks], ignore_index=True))
+    dataframe = pd.read_csv(fpath, nrows=nrows, usecols=getColumnsFilter(columns, drop_columns))
+    return dataframe
+
+# Function returns the dataframe with compact column types : categorical low-cardinality strings, Arrow-backed strings and downcast numbers
+def compactDataFrameTypes(dataframe: pd.DataFrame, categorical_ratio: float = cfg.compact_categorical_ratio) -> pd.DataFrame:
+    compact_columns = {}
+    for column in dataframe.columns:
+        values = dataframe[column]
+        if(pd.api.types.is_bool_dtype(values.dtype) or isinstance(values.dtype, pd.CategoricalDtype)):
+            compact_columns[column] = values
+        elif(pd.api.types.is_integer_dtype(values.dtype)):
+            compact_columns[column] = pd.to_numeric(values, downcast='unsigned' if len(values) > 0 and values.min() >= 0 else 'integer')
+        elif(pd.api.types.is_float_dtype(values.dtype)):
+            # Floats are downcast only when no precision is lost
+            float32_values = values.astype('float32')
+            compact_columns[column] = float32_values if ((float32_values.astype(values.dtype) == values) | values.isna()).all() else values
+        elif(pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype)):
+            if(len(values) > 0 and values.nunique(dropna=True) <= categorical_ratio * len(values)):
+                compact_columns[column] = values.astype('category')
+            elif(pd.api.types.infer_dtype(values, skipna=True) in ["string", "empty"]):
+                compact_columns[column] = values.astype('string[pyarrow]')
+            else:
+                compact_columns[column] = values
+        else:
+            compact_columns[column] = values
+    return pd.DataFrame(compact_columns, index=dataframe.index)
+
+# Function to align the compact column types of two dataframes, so that they can be merged and compared
+def alignCompactColumnTypes(dataframe1: pd.DataFrame, dataframe2: pd.DataFrame) -> tuple:
+    dataframe1, dataframe2 = dataframe1.copy(deep=False), dataframe2.copy(deep=False)
+    for column in dataframe1.columns.intersection(dataframe2.columns):
+        dtype1, dtype2 = dataframe1[column].dtype, dataframe2[column].dtype
+        if(dtype1 == dtype2 and not isinstance(dtype1, pd.CategoricalDtype)):
+            continue
+        if(isinstance(dtype1, pd.CategoricalDtype) or isinstance(dtype2, pd.CategoricalDtype)):
+            # Categorical columns share the union of the categories of both sides
+            categories = pd.Index(pd.concat([pd.Series(dataframe1[column].dropna().unique()), pd.Series(dataframe2[column].dropna().unique())]).astype(object).unique()).sort_values()
+            categorical_dtype = pd.CategoricalDtype(categories)
+            dataframe1[column] = dataframe1[column].astype(object).astype(categorical_dtype)
+            dataframe2[column] = dataframe2[column].astype(object).astype(categorical_dtype)
+        elif(pd.api.types.is_numeric_dtype(dtype1) and pd.api.types.is_numeric_dtype(dtype2)):
+            common_dtype = np.result_type(dtype1, dtype2)
+            dataframe1[column] = dataframe1[column].astype(common_dtype)
+            dataframe2[column] = dataframe2[column].astype(common_dtype)
+        elif(pd.api.types.is_string_dtype(dtype1) and pd.api.types.is_string_dtype(dtype2)):
+            dataframe1[column] = dataframe1[column].astype('string[pyarrow]')
+            dataframe2[column] = dataframe2[column].astype('string[pyarrow]')
+    return dataframe1, dataframe2
 
 # Function to write data into a "xlsx" from dataframe
 def writeDataFrameToExcel(dataframe, fpath) -> bool:
@@ -43,30 +102,190 @@ def writeDataFrameToExcel(dataframe, fpath) -> bool:
         st.write(error)
         return False
 
-# Function to write data into a "xlsx" from dataframe
-def readDataFrameFromExcel(fpath) -> pd.DataFrame:
+# Function returns the engine to read "xlsx" files with, "auto" prefers the Rust-backed calamine engine when installed
+def getExcelEngine(engine: str = cfg.excel_engine) -> str:
+    if(engine == "auto"):
+        return "calamine" if importlib.util.find_spec("python_calamine") is not None else "openpyxl"
+    return engine
+
+# Function returns the sheet names of a "xlsx" file
+def getExcelSheetNames(fpath, engine: str = cfg.excel_engine) -> list:
     try:
-        dataframe = pd.read_excel(fpath)
-        return dataframe
+        return pd.ExcelFile(fpath, engine=getExcelEngine(engine)).sheet_names
     except Exception as error:
         st.write(error)
-        return pd.DataFrame()
+        return []
+
+# Function to read data from a "xlsx" into dataframe, the read errors are raised to the caller
+def readDataFrameFromExcel(fpath, sheet_name = 0, engine: str = cfg.excel_engine, columns: list = [], drop_columns: list = [], compact_types: bool = False) -> pd.DataFrame:
+    dataframe = pd.read_excel(fpath, sheet_name=sheet_name, engine=getExcelEngine(engine), usecols=getColumnsFilter(columns, drop_columns))
+    return compactDataFrameTypes(dataframe) if compact_types else dataframe
+
+# Function to read data from a "parquet" into dataframe, the read errors are raised to the caller
+def readDataFrameFromParquet(fpath, columns: list = [], drop_columns: list = [], compact_types: bool = False) -> pd.DataFrame:
+    columns_filter = getColumnsFilter(columns, drop_columns)
+    if(columns_filter is None):
+        dataframe = pd.read_parquet(fpath)
+    else:
+        column_names = pq.ParquetFile(fpath).schema_arrow.names
+        if(hasattr(fpath, "seek")):
+            fpath.seek(0)
+        dataframe = pd.read_parquet(fpath, columns=[column for column in column_names if columns_filter(column)])
+    return compactDataFrameTypes(dataframe) if compact_types else dataframe
+
+# Function returns the file path of the "parquet" copy of a "xlsx" sheet, the engines may read the same sheet with different column types
+def getExcelParquetFilePath(file_digest: str, sheet_name = 0, engine: str = cfg.excel_engine, parquet_directory: str = cfg.parquet_cache_path) -> str:
+    sheet_digest = hashlib.sha256(f"{sheet_name}|{getExcelEngine(engine)}".encode()).hexdigest()[:16]
+    return os.path.join(parquet_directory, f"{file_digest}_{sheet_digest}.parquet")
+
+# Function to read data from a "xlsx" sheet, converting it once into a "parquet" file reused by the later runs
+def readDataFrameFromExcelViaParquet(fpath, file_digest: str, sheet_name = 0, engine: str = cfg.excel_engine, parquet_directory: str = cfg.parquet_cache_path, columns: list = [], drop_columns: list = [], compact_types: bool = False) -> pd.DataFrame:
+    parquet_fpath = getExcelParquetFilePath(file_digest, sheet_name, engine, parquet_directory)
+    if(os.path.exists(parquet_fpath)):
+        return readDataFrameFromParquet(parquet_fpath, columns, drop_columns, compact_types)
+
+    # An empty sheet is not stored, so that a sheet read empty is read from "xlsx" again next time
+    dataframe = readDataFrameFromExcel(fpath, sheet_name, engine)
+    if(not dataframe.empty):
+        try:
+            os.makedirs(parquet_directory, exist_ok=True)
+            dataframe.to_parquet(parquet_fpath + ".tmp", index=False)
+            os.replace(parquet_fpath + ".tmp", parquet_fpath)
+        except Exception:
+            # Mixed type columns cannot be stored in "parquet", the sheet is read from "xlsx" again next time
+            if(os.path.exists(parquet_fpath + ".tmp")):
+                os.remove(parquet_fpath + ".tmp")
+
+    # The "parquet" file keeps every column, so that it can be reused with other column selections
+    columns_filter = getColumnsFilter(columns, drop_columns)
+    if(columns_filter is not None):
+        dataframe = dataframe[[column for column in dataframe.columns if columns_filter(column)]]
+    return compactDataFrameTypes(dataframe) if compact_types else dataframe
+
+# Function returns a page of the report file names of the user, relative to the result store directory; the administrators see every report
+def getFileNamesList(username: str, directory: str = cfg.result_store_path, page: int = 0, page_size: int = cfg.catalog_page_size) -> list:
+    return [artifact['report_path'] for artifact in getArtifacts(username, page=page, page_size=page_size, store_path=directory)]
 
-# Function returns the file names list
-def getFileNamesList(username: str, directory: str) -> list:
-    # Fetch all file names
-    all_files = os.listdir(directory)
+# Function returns the 64-bit hash value of each row of dataframe
+def getDataFrameRowHashes(dataframe: pd.DataFrame) -> pd.Series:
+    return pd.util.hash_pandas_object(dataframe, index=False).reset_index(drop=True)
 
-    # Filter out the files list based on the username
-    if(username == "VEN00375@TJX.COM"):
-        return all_files
-    filtered_files_list = [file for file in all_files if file.startswith(username)]
+# Function returns the SHA-256 digest of each block of row hashes
+def getBlockDigests(row_hashes: np.ndarray, block_size: int) -> list:
+    return [hashlib.sha256(row_hashes[start:start + block_size].tobytes()).hexdigest() for start in range(0, len(row_hashes), block_size)]
 
-    return filtered_files_list
+# Function returns the levels of a merkle tree, from the leaf digests up to the root digest
+def getMerkleLevels(leaf_digests: list) -> list:
+    levels = [leaf_digests if leaf_digests != [] else [hashlib.sha256(b"").hexdigest()]]
+    while(len(levels[-1]) > 1):
+        level = levels[-1]
+        levels.append([hashlib.sha256("".join(level[position:position + 2]).encode()).hexdigest() for position in range(0, len(level), 2)])
+    return levels
+
+# Function returns the hierarchical digest of dataframe, row block hashes rolled up into a merkle tree (optionally per column)
+def getDataFrameMerkleTree(dataframe: pd.DataFrame, block_size: int = cfg.merkle_block_size, by_column: bool = False) -> dict:
+    merkle_levels = getMerkleLevels(getBlockDigests(getDataFrameRowHashes(dataframe).values, block_size))
+    schema = "|".join(f"{column}:{dtype}" for column, dtype in dataframe.dtypes.items())
+    merkle_tree = {
+        'root': hashlib.sha256((schema + merkle_levels[-1][0]).encode()).hexdigest(),
+        'block_size': block_size,
+        'levels': merkle_levels,
+        'columns': {}
+    }
+    if(by_column):
+        for column in dataframe.columns:
+            column_row_hashes = pd.util.hash_pandas_object(dataframe[column], index=False).values
+            merkle_tree['columns'][column] = getMerkleLevels(getBlockDigests(column_row_hashes, block_size))[-1][0]
+    return merkle_tree
 
 # Function returns the hash value of dataframe
 def getDataFrameHash(dataframe: pd.DataFrame):
-    return hashlib.sha256(pd.util.hash_pandas_object(dataframe, index=True).values).hexdigest()
+    return getDataFrameMerkleTree(dataframe)['root']
+
+# Function returns the row block numbers having different digests in the two merkle trees
+def getDifferingBlocks(merkle_tree1: dict, merkle_tree2: dict) -> list:
+    leaf_digests1, leaf_digests2 = merkle_tree1['levels'][0], merkle_tree2['levels'][0]
+
+    # Trees of different shapes only line up at the leaves
+    if(len(leaf_digests1) != len(leaf_digests2)):
+        return [block for block in range(max(len(leaf_digests1), len(leaf_digests2))) if block >= min(len(leaf_digests1), len(leaf_digests2)) or leaf_digests1[block] != leaf_digests2[block]]
+
+    # Descend from the root into the differing children only
+    differing_nodes = [0]
+    for level in reversed(range(len(merkle_tree1['levels']))):
+        differing_nodes = [node for node in differing_nodes if merkle_tree1['levels'][level][node] != merkle_tree2['levels'][level][node]]
+        if(level > 0):
+            differing_nodes = [child for node in differing_nodes for child in (2 * node, 2 * node + 1) if child < len(merkle_tree1['levels'][level - 1])]
+    return differing_nodes
+
+# Function returns the columns having different digests in the two merkle trees
+def getDifferingColumns(merkle_tree1: dict, merkle_tree2: dict) -> list:
+    return [column for column, digest in merkle_tree1['columns'].items() if merkle_tree2['columns'].get(column) != digest]
+
+# Function returns the rows of dataframe in the given row blocks
+def selectRowBlocks(dataframe: pd.DataFrame, blocks: list, block_size: int) -> pd.DataFrame:
+    return dataframe[np.isin(np.arange(len(dataframe)) // block_size, blocks)]
+
+# Function returns the masks of the source and target rows without a match, comparing the row hash multisets: the n-th occurrence of a row is matched only if the other side has the row at least n times
+def getNonMatchedRowHashes(source_row_hashes: pd.Series, target_row_hashes: pd.Series) -> tuple:
+    source_non_matched = source_row_hashes.groupby(source_row_hashes).cumcount().values >= source_row_hashes.map(target_row_hashes.value_counts()).fillna(0).values
+    target_non_matched = target_row_hashes.groupby(target_row_hashes).cumcount().values >= target_row_hashes.map(source_row_hashes.value_counts()).fillna(0).values
+    return source_non_matched, target_non_matched
+
+# Function to compare the rows of two dataframes by their hash values, returns only the non matched rows
+def compareDataFramesByRowHash(dataframe1: pd.DataFrame, dataframe2: pd.DataFrame) -> pd.DataFrame:
+    source_non_matched, target_non_matched = getNonMatchedRowHashes(getDataFrameRowHashes(dataframe1), getDataFrameRowHashes(dataframe2))
+
+    # Build full rows for the non matched rows only
+    source_non_matched_records_df = dataframe1[source_non_matched].assign(_merge='left_only')
+    target_non_matched_records_df = dataframe2[target_non_matched].assign(_merge='right_only')
+    validation_result_df = pd.concat([source_non_matched_records_df, target_non_matched_records_df], ignore_index=True)
+
+    # Return results
+    return validation_result_df
+
+# Function returns the duplicate key counts of both dataframes and the estimated row count of their key merge
+def getDuplicateKeyStatistics(dataframe1: pd.DataFrame, dataframe2: pd.DataFrame, key_columns: list) -> dict:
+    source_key_counts = pd.util.hash_pandas_object(dataframe1[key_columns], index=False).value_counts()
+    target_key_counts = pd.util.hash_pandas_object(dataframe2[key_columns], index=False).value_counts()
+
+    # Every key in both sides produces the product of its counts, the other keys one row per record
+    common_keys = source_key_counts.index.intersection(target_key_counts.index)
+    source_common_counts, target_common_counts = source_key_counts[common_keys], target_key_counts[common_keys]
+    estimated_merge_rows = int((source_common_counts * target_common_counts).sum()) + (len(dataframe1) - int(source_common_counts.sum())) + (len(dataframe2) - int(target_common_counts.sum()))
+
+    return {
+        'source_duplicate_keys': int((source_key_counts > 1).sum()),
+        'source_duplicate_rows': int(source_key_counts[source_key_counts > 1].sum()),
+        'target_duplicate_keys': int((target_key_counts > 1).sum()),
+        'target_duplicate_rows': int(target_key_counts[target_key_counts > 1].sum()),
+        'estimated_merge_rows': estimated_merge_rows
+    }
+
+# Function to apply the duplicate key policy before the key merge, returns both dataframes and the key columns to merge on
+def applyDuplicateKeyPolicy(dataframe1: pd.DataFrame, dataframe2: pd.DataFrame, key_columns: list, duplicate_key_statistics: dict, policy: str = cfg.duplicate_key_policy) -> tuple:
+    if(duplicate_key_statistics['source_duplicate_keys'] == 0 and duplicate_key_statistics['target_duplicate_keys'] == 0):
+        return dataframe1, dataframe2, key_columns
+
+    duplicate_keys_message = f"The key columns {key_columns} are not unique ({duplicate_key_statistics['source_duplicate_keys']} duplicate key(s) in source, {duplicate_key_statistics['target_duplicate_keys']} in target), the key merge would produce {duplicate_key_statistics['estimated_merge_rows']} rows."
+    if(policy == "occurrence"):
+        # The n-th record of a key is matched with the n-th record of the same key on the other side
+        dataframe1 = dataframe1.assign(**{key_occurrence_column: dataframe1.groupby(key_columns, sort=False, dropna=False).cumcount()})
+        dataframe2 = dataframe2.assign(**{key_occurrence_column: dataframe2.groupby(key_columns, sort=False, dropna=False).cumcount()})
+        return dataframe1, dataframe2, key_columns + [key_occurrence_column]
+    elif(policy == "deduplicate"):
+        return dataframe1.drop_duplicates(subset=key_columns, keep='first'), dataframe2.drop_duplicates(subset=key_columns, keep='first'), key_columns
+    elif(policy == "allow"):
+        if(duplicate_key_statistics['estimated_merge_rows'] > cfg.max_merge_rows_ratio * (len(dataframe1) + len(dataframe2))):
+            raise ValueError(f"{duplicate_keys_message} This is over {cfg.max_merge_rows_ratio} times the input rows.")
+        return dataframe1, dataframe2, key_columns
+    elif(policy == "refuse"):
+        raise ValueError(duplicate_keys_message)
+    raise ValueError(f"Unknown duplicate key policy '{policy}'.")
+
+# Function returns True when the key columns to merge on are unique on both sides, only the "allow" policy keeps the duplicate keys
+def hasUniqueMergeKeys(duplicate_key_statistics: dict, policy: str = cfg.duplicate_key_policy) -> bool:
+    return policy != "allow" or (duplicate_key_statistics['source_duplicate_keys'] == 0 and duplicate_key_statistics['target_duplicate_keys'] == 0)
 
 # Function to compare data between two dataframes
 def compareDataFrames(dataframe1: pd.DataFrame, dataframe2: pd.DataFrame, key_columns: list = []) -> pd.DataFrame: